@@ -0,0 +1,218 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  aggregates.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Keeps running sales totals that are updated as every order
+#               is purchased, so reports never re-scan the receipts.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import argparse
+import collections
+import datetime
+import json
+import os
+
+# Third party
+import icontract
+
+# Local application/library specific imports
+from file_lock import FileLock
+
+
+# ------------------------------- Named Constant ------------------------------
+AGGREGATES_FILE = 'database/aggregates.json'
+
+# The sections stored in the aggregates file.
+SECTIONS = (
+    'part_units', 'part_revenue',
+    'type_units', 'type_revenue',
+    'daily_units', 'daily_revenue',
+    'customer_spend',
+)
+
+
+# ------------------------------ Class Definition -----------------------------
+class SalesAggregates:
+    """Materialised sales totals.
+
+    Every section is a dictionary, so each total is read in O(1).
+    The file is only read the first time a total is needed, and rewritten
+    once per purchased order.
+
+    Several processes may share the file: an order is added under the lock
+    of <filename>.lock to the totals read again from the file, so no
+    process writes over the orders of another.
+    """
+
+    @icontract.require(
+        lambda filename: isinstance(filename, str) & (filename != ''))
+    def __init__(self, filename=AGGREGATES_FILE):
+        """Initialise SalesAggregates object. Nothing is read yet."""
+        self.__filename = filename
+        self.__sections = None
+
+    @property
+    def filename(self):
+        """Return the filename attribute."""
+        return self.__filename
+
+    @property
+    def sections(self):
+        """Return the sections, loading them from file on first access."""
+        if self.__sections is None:
+            self.__load()
+        return self.__sections
+
+    @icontract.ensure(lambda result: result is None)
+    def __load(self):
+        """Read the aggregates file, or start from zero if there is none."""
+        self.__sections = {
+            section: collections.Counter() for section in SECTIONS
+        }
+        try:
+            with open(self.__filename, mode='r', encoding='UTF8') as infile:
+                stored = json.load(infile)
+        except FileNotFoundError:
+            return
+        for section in SECTIONS:
+            self.__sections[section].update(stored.get(section, {}))
+
+    def __locked(self):
+        """Return the lock of the aggregates file."""
+        return FileLock(self.__filename + '.lock')
+
+    @icontract.ensure(lambda result: result is None)
+    def save(self):
+        """Write every section to file, replacing the old file atomically."""
+        with self.__locked():
+            self.__write()
+
+    def __write(self):
+        """Write every section to file; the caller holds the lock."""
+        temporary = self.__filename + '.tmp'
+        with open(temporary, mode='w', encoding='UTF8') as outfile:
+            json.dump(self.sections, outfile, separators=(',', ':'))
+        os.replace(temporary, self.__filename)
+
+    @icontract.require(lambda username: isinstance(username, str))
+    @icontract.ensure(lambda result: result is None)
+    def record_order(self, username, lines, day=None):
+        """Add one purchased order to every total and save the file.
+
+        lines is an iterable of (part name, part type, price, quantity).
+        day defaults to today, as 'YYYY-MM-DD'.
+        """
+        day = day or datetime.date.today().isoformat()
+        lines = list(lines)
+        with self.__locked():
+            # Other processes may have added orders since the last read.
+            self.__load()
+            self.__add(username, lines, day)
+            self.__write()
+
+    def __add(self, username, lines, day):
+        """Add the lines of one order to every total."""
+        sections = self.__sections
+        for name, part_type, price, quantity in lines:
+            line_total = round(price * quantity, 2)
+            sections['part_units'][name] += quantity
+            sections['part_revenue'][name] += line_total
+            sections['type_units'][part_type] += quantity
+            sections['type_revenue'][part_type] += line_total
+            sections['daily_units'][day] += quantity
+            sections['daily_revenue'][day] += line_total
+            sections['customer_spend'][username] += line_total
+
+    def part_units(self, name):
+        """Return the number of units sold of a part."""
+        return self.sections['part_units'][name]
+
+    def part_revenue(self, name):
+        """Return the revenue made from a part."""
+        return self.sections['part_revenue'][name]
+
+    def type_units(self, part_type):
+        """Return the number of units sold of a part type."""
+        return self.sections['type_units'][part_type]
+
+    def type_revenue(self, part_type):
+        """Return the revenue made from a part type."""
+        return self.sections['type_revenue'][part_type]
+
+    def daily_total(self, day):
+        """Return the (units, revenue) sold on a day ('YYYY-MM-DD')."""
+        return (self.sections['daily_units'][day],
+                self.sections['daily_revenue'][day])
+
+    def customer_spend(self, username):
+        """Return the lifetime spend of a customer."""
+        return self.sections['customer_spend'][username]
+
+    @icontract.require(lambda receipts_dir: isinstance(receipts_dir, str))
+    @icontract.ensure(lambda result: isinstance(result, dict))
+    def check(self, receipts_dir='database/receipts', tolerance=0.005):
+        """Return the totals that differ from a full recompute.
+
+        The receipts archive is re-scanned with the sales analytics and each
+        total is compared. The result maps (section, key) to the pair
+        (materialised value, recomputed value); it is empty when both agree.
+        A receipt only holds a customer's latest order, so totals of
+        customers who purchased several times are expected to differ.
+        """
+        # Imported here: the analytics need main.py, which imports us.
+        import analytics
+
+        summary = analytics.analyse(receipts_dir)
+        recomputed = {
+            'part_units': summary.units,
+            'part_revenue': summary.revenue,
+            'type_revenue': summary.type_revenue,
+            'daily_revenue': summary.daily_revenue,
+            'customer_spend': summary.customer_spend,
+        }
+        type_units = collections.Counter()
+        for name, units in summary.units.items():
+            type_units[summary.part_types[name]] += units
+        recomputed['type_units'] = type_units
+
+        differences = {}
+        for section, expected in recomputed.items():
+            stored = self.sections[section]
+            for key in set(stored) | set(expected):
+                if abs(stored[key] - expected[key]) > tolerance:
+                    differences[(section, key)] = (stored[key], expected[key])
+        return differences
+
+
+# ---------------------------------- Program ----------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Show the materialised sales totals.')
+    parser.add_argument('--file', default=AGGREGATES_FILE,
+                        help='aggregates file')
+    parser.add_argument('--check', action='store_true',
+                        help='compare the totals with a full recompute')
+    args = parser.parse_args()
+
+    aggregates = SalesAggregates(args.file)
+    for section in SECTIONS:
+        print(f'---- {section} ----')
+        for key, value in sorted(aggregates.sections[section].items()):
+            print(f'{key}: {value:g}')
+    if args.check:
+        differences = aggregates.check()
+        print('---- check ----')
+        for (section, key), values in sorted(differences.items()):
+            print(f'{section}[{key}]: stored {values[0]:g}, '
+                  f'recomputed {values[1]:g}')
+        print('Consistent' if not differences else
+              f'{len(differences)} totals differ')
@@ -0,0 +1,217 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  analytics.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Reports the sales recorded in the receipts archive: revenue
+#               per part type, top sellers and units sold per part.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import argparse
+import collections
+import concurrent.futures
+import csv
+import datetime
+import functools
+import glob
+import os
+
+# Third party
+import icontract
+
+# Local application/library specific imports
+import main
+
+
+# ------------------------------- Named Constant ------------------------------
+RECEIPTS_DIR = 'database/receipts'
+
+
+# ------------------------------ Class Definition -----------------------------
+class SalesSummary:
+    """A partial (or complete) aggregate of the sales in some receipts.
+
+    Summaries of separate receipt files are merged together to obtain the
+    summary of the whole archive.
+    """
+
+    def __init__(self):
+        """Initialise SalesSummary object."""
+        # Units sold and revenue, keyed by part name.
+        self.__units = collections.Counter()
+        self.__revenue = collections.Counter()
+        # Revenue keyed by part type (CPU/GraphicsCard/Memory/Storage).
+        self.__type_revenue = collections.Counter()
+        # Part type of every part name seen so far.
+        self.__part_types = {}
+        # Revenue keyed by customer (receipt file name) and by day of sale
+        # (modification date of the receipt file, 'YYYY-MM-DD').
+        self.__customer_spend = collections.Counter()
+        self.__daily_revenue = collections.Counter()
+
+    @property
+    def units(self):
+        """Return the units attribute."""
+        return self.__units
+
+    @property
+    def revenue(self):
+        """Return the revenue attribute."""
+        return self.__revenue
+
+    @property
+    def type_revenue(self):
+        """Return the type_revenue attribute."""
+        return self.__type_revenue
+
+    @property
+    def part_types(self):
+        """Return the part_types attribute."""
+        return self.__part_types
+
+    @property
+    def customer_spend(self):
+        """Return the customer_spend attribute."""
+        return self.__customer_spend
+
+    @property
+    def daily_revenue(self):
+        """Return the daily_revenue attribute."""
+        return self.__daily_revenue
+
+    @icontract.require(
+        lambda part: isinstance(part, main.ComputerPart))
+    @icontract.ensure(lambda result: result is None)
+    def add(self, part, username=None, day=None):
+        """Count one receipt line, the quantity being the part's stock."""
+        part_type = type(part).__name__
+        line_total = part.price * part.stock
+        self.__units[part.name] += part.stock
+        self.__revenue[part.name] += line_total
+        self.__type_revenue[part_type] += line_total
+        self.__part_types[part.name] = part_type
+        if username is not None:
+            self.__customer_spend[username] += line_total
+        if day is not None:
+            self.__daily_revenue[day] += line_total
+
+    @icontract.ensure(lambda self, result: result is self)
+    def merge(self, other):
+        """Add the counts of another SalesSummary into this one."""
+        self.__units.update(other.units)
+        self.__revenue.update(other.revenue)
+        self.__type_revenue.update(other.type_revenue)
+        self.__part_types.update(other.part_types)
+        self.__customer_spend.update(other.customer_spend)
+        self.__daily_revenue.update(other.daily_revenue)
+        return self
+
+    @icontract.require(lambda n: isinstance(n, int) & (n > 0))
+    def top_sellers(self, n=5):
+        """Return a list of the n best selling (part name, units) pairs."""
+        return self.__units.most_common(n)
+
+
+# ---------------------------- Function Definitions ---------------------------
+@icontract.require(lambda path: isinstance(path, str))
+def iter_receipt(path):
+    """Yield the ComputerPart objects stored in a receipt file, one by one.
+
+    The stock of every yielded part is the quantity that was purchased.
+    """
+    with open(file=path, mode='r', encoding='UTF8', newline='') as infile:
+        for csv_list in csv.reader(infile, delimiter=',', quotechar='|'):
+            part = main.ComputerPart.from_csv_list(csv_list)
+            if part is not None:
+                yield part
+
+
+@icontract.require(lambda path: isinstance(path, str))
+@icontract.ensure(lambda result: isinstance(result, SalesSummary))
+def summarise_file(path):
+    """The map step: stream one receipt file into a SalesSummary.
+
+    The receipt file is named after the customer and was last written on
+    the day of the purchase.
+    """
+    username = os.path.splitext(os.path.basename(path))[0]
+    day = datetime.date.fromtimestamp(os.path.getmtime(path)).isoformat()
+    summary = SalesSummary()
+    for part in iter_receipt(path):
+        summary.add(part, username, day)
+    return summary
+
+
+@icontract.ensure(lambda result: isinstance(result, SalesSummary))
+def merge_summaries(summaries):
+    """The reduce step: merge any iterable of SalesSummary objects."""
+    return functools.reduce(SalesSummary.merge, summaries, SalesSummary())
+
+
+@icontract.require(lambda receipts_dir: isinstance(receipts_dir, str))
+def receipt_files(receipts_dir=RECEIPTS_DIR):
+    """Return a sorted list of all receipt files in the archive."""
+    return sorted(glob.glob(os.path.join(receipts_dir, '*.csv')))
+
+
+@icontract.require(
+    lambda workers: (workers is None) | (isinstance(workers, int)))
+@icontract.ensure(lambda result: isinstance(result, SalesSummary))
+def analyse(receipts_dir=RECEIPTS_DIR, workers=None, chunksize=16):
+    """Return the SalesSummary of every receipt in receipts_dir.
+
+    Receipt files are split across a pool of worker processes (one per
+    core by default). Each worker streams its files and sends back only
+    the partial aggregates, which are merged here.
+    With a single worker, everything runs in the current process.
+    """
+    paths = receipt_files(receipts_dir)
+    if workers == 1 or len(paths) <= 1:
+        return merge_summaries(map(summarise_file, paths))
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        return merge_summaries(
+            executor.map(summarise_file, paths, chunksize=chunksize)
+        )
+
+
+@icontract.require(lambda summary: isinstance(summary, SalesSummary))
+@icontract.ensure(lambda result: isinstance(result, str))
+def format_report(summary, top=5):
+    """Return the sales report of a SalesSummary as a string."""
+    result = '---- Revenue per part type ----\n'
+    for part_type, revenue in sorted(summary.type_revenue.items()):
+        result += f'{part_type}: ${revenue:.2f}\n'
+
+    result += f'---- Top {top} sellers ----\n'
+    for position, (name, units) in enumerate(summary.top_sellers(top)):
+        result += f'{position+1}. {name} (x{units})\n'
+
+    result += '---- Units sold per part ----\n'
+    for name, units in sorted(summary.units.items()):
+        result += (f'{name}: x{units} '
+                   f'for ${summary.revenue[name]:.2f}\n')
+    result += '--------------------'
+    return result
+
+
+# ---------------------------------- Program ----------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Report the sales recorded in the receipts archive.')
+    parser.add_argument('--receipts', default=RECEIPTS_DIR,
+                        help='directory of receipt files')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes (default: cores)')
+    parser.add_argument('--top', type=int, default=5,
+                        help='number of top sellers to list')
+    args = parser.parse_args()
+
+    print(format_report(analyse(args.receipts, args.workers), args.top))
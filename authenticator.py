@@ -17,15 +17,21 @@
 
 # ------------------------------- Module Import -------------------------------
 # Stdlib
+import concurrent.futures
 import hashlib
+import hmac
+import os
 import random
 import re
+import threading
 
 # Third party
 import icontract
 from exceptions import (EmailAlreadyExists, InappropriateEmail,
                         InvalidPassword, InvalidUsername,
                         PasswordTooShort, UsernameAlreadyExists)
+from throttle import LoginThrottle
+from users_writer import GroupCommitAppender
 
 
 # ------------------------------- Named Constant ------------------------------
@@ -39,6 +45,40 @@ COUNTRY_CODEs = {
     '.au', '.ca', '.cn', '.jp', '.uk', '.vn',
 }
 
+USERS_FILE = 'database/users.csv'
+
+# Emails of any other form are replaced by add_user().
+VALID_EMAIL = re.compile(r'([A-Za-z0-9]+[.-_])*[A-Za-z0-9]+@[A-Za-z0-9-]+(\.[A-Z|a-z]{2,})+')  # noqa: E501
+
+# Users files with these suffixes are SQLite databases, not csv files.
+SQLITE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+
+# Password hashing functions, by name: the names of their cost parameters
+# and a function of (password bytes, salt, *costs) returning the hash.
+KDFS = {
+    'pbkdf2_sha256': (
+        ('iterations',),
+        lambda password, salt, iterations:
+            hashlib.pbkdf2_hmac('sha256', password, salt, iterations),
+    ),
+    'scrypt': (
+        ('n', 'r', 'p'),
+        lambda password, salt, n, r, p:
+            hashlib.scrypt(password, salt=salt, n=n, r=r, p=p,
+                           maxmem=256 * n * r + (1 << 20)),
+    ),
+}
+
+# Bytes of random salt per password.
+SALT_SIZE = 16
+
+# The KDF and costs of new records (see set_kdf()).
+KDF = ('pbkdf2_sha256', (100000,))
+
+# Threads verifying and hashing passwords, shared by every Authenticator.
+# Both hashlib functions release the GIL, so logins run in parallel.
+VERIFY_WORKERS = min(4, os.cpu_count() or 1)
+
 
 # ------------------------------ Class Definitions ----------------------------
 class User:
@@ -48,13 +88,14 @@ class User:
         & isinstance(email, str) & isinstance(password, str)
     )
     @icontract.ensure(lambda result: result is None)
-    def __init__(self, username, email, password):
+    def __init__(self, username, email, password, encrypted=False):
         # Create a new user object.
-        # The password will be encrypted before storing.
+        # The password will be encrypted before storing, unless it is
+        # already encrypted (e.g. read back from users.csv).
         self.__is_logged_in = False
         self.__username = username
         self.__email = email
-        self.__password = Password(username, password)
+        self.__password = Password(username, password, encrypted)
 
     @icontract.ensure(lambda result: isinstance(result, str))
     def __repr__(self):
@@ -70,6 +111,12 @@ class User:
     def password(self):
         return self.__password
 
+    @password.setter
+    @icontract.require(lambda password: isinstance(password, Password))
+    @icontract.ensure(lambda result: result is None)
+    def password(self, password):
+        self.__password = password
+
     @property
     @icontract.ensure(lambda self, result: result == self.__email)
     def email(self):
@@ -89,9 +136,13 @@ class User:
 
 class Password:
 
-    def __init__(self, username, password):
+    def __init__(self, username, password, encrypted=False):
+        # password is a hash record (see encrypt_password()) if encrypted.
         self.__username = username
-        self.__password = self.__encrypt_pw(password)
+        if encrypted:
+            self.__password = password
+        else:
+            self.__password = encrypt_password(username, password)
 
     @property
     def username(self):
@@ -104,37 +155,232 @@ class Password:
     @icontract.require(lambda password: isinstance(password, str))
     def check_pw(self, password):
         # Return True if the password is valid for this user, False otherwise.
-        encrypted = self.__encrypt_pw(password)
-        return encrypted == self.__password
+        return verify_password(self.__username, password, self.__password)
 
-    @icontract.require(lambda password: isinstance(password, str))
-    def __encrypt_pw(self, password):
-        # Encrypt the password with the username and return the sha digest.
-        hash_string = self.__username + password
-        hash_string = hash_string.encode('utf8')
-        return hashlib.sha256(hash_string).hexdigest()
+    @icontract.ensure(lambda result: isinstance(result, bool))
+    def needs_rehash(self):
+        # Return True if the record was not made with the current KDF.
+        return needs_rehash(self.__password)
 
 
-class Authenticator:
+class CSVUserStore:
+    """The users of users.csv, all kept in memory."""
 
-    @icontract.ensure(lambda result: result is None)
-    def __init__(self):
-        """
-        The initialization method creates an empty dictionary and assigns it
-        to the attribute users.
+    @icontract.require(
+        lambda filename: isinstance(filename, str) & (filename != ''))
+    def __init__(self, filename=USERS_FILE):
+        """Initialise CSVUserStore object with every user of filename.
+
+        New users are appended in groups (see users_writer.py), so a burst
+        of signups costs one write and one fsync per group.
         """
+        self.__filename = filename
+        self.__appender = GroupCommitAppender(filename)
         self.__read_from_csv()
 
     @property
-    @icontract.ensure(lambda self, result: result == self.__users)
+    def appender(self):
+        """Return the appender attribute."""
+        return self.__appender
+
+    @property
     def users(self):
+        """Return the users attribute (User objects, by username)."""
         return self.__users
 
     @property
-    @icontract.ensure(lambda self, result: result == self.__user_email)
     def user_email(self):
+        """Return the user_email attribute (emails, by username)."""
         return self.__user_email
 
+    @icontract.require(lambda username: isinstance(username, str))
+    def get(self, username):
+        """Return the User object of username, or None."""
+        return self.__users.get(username)
+
+    @icontract.require(lambda email: isinstance(email, str))
+    def get_by_email(self, email):
+        """Return the User object whose email is email, or None."""
+        username = self.__email_user.get(email)
+        return None if username is None else self.__users[username]
+
+    @icontract.require(lambda user: isinstance(user, User))
+    @icontract.ensure(lambda result: result is None)
+    def add(self, user):
+        """Keep a new user in memory until save() writes it."""
+        self.__users[user.username] = user
+        self.__user_email[user.username] = user.email
+        self.__email_user[user.email] = user.username
+
+    @icontract.require(lambda username: isinstance(username, str))
+    @icontract.ensure(lambda result: result is None)
+    def save(self, username):
+        """Append the record of a user to the CSV file named "users.csv".
+
+        The record is written with the next group; flush() writes it now.
+        """
+        user = self.__users[username]
+        self.__appender.append(
+            [user.username, user.email, user.password.password])
+
+    @icontract.require(lambda username: isinstance(username, str))
+    @icontract.ensure(lambda result: result is None)
+    def update_password(self, username):
+        """Append the new password record of a user to the CSV file; its
+        last line is the one loaded, and compaction drops the others.
+        """
+        self.save(username)
+
+    @icontract.ensure(lambda result: result >= 0)
+    def add_many(self, records):
+        """Add (username, email, password digest) records, append them to
+        the CSV file at once and return how many were added.
+        """
+        rows = []
+        for username, email, digest in records:
+            self.__users[username] = User(username, email, digest,
+                                          encrypted=True)
+            self.__user_email[username] = email
+            self.__email_user[email] = username
+            rows.append([username, email, digest])
+        self.__appender.extend(rows)
+        self.flush()
+        return len(rows)
+
+    @icontract.ensure(lambda result: result is None)
+    def flush(self):
+        """Write every saved user to the CSV file now."""
+        self.__appender.flush()
+
+    @icontract.ensure(lambda result: result is None)
+    def __read_from_csv(self):
+        """Automatically invoked when a CSVUserStore object is constructed.
+
+        By invoking this method, the store should automatically construct a
+        users and a user_email dictionaries and fill them with items that
+        it reads from the CSV file named "users.csv".
+        """
+        self.__users = {}       # A dictionary of users coming to the store.
+        self.__user_email = {}  # Each user is associated with only one email.
+        self.__email_user = {}  # The other way round, for O(1) lookups.
+        with open(self.__filename) as infile:
+            line = None
+            while line is None or line != '':
+                line = infile.readline().rstrip('\n')
+                if line != '' and len(line.split(',')) == 3:
+                    csv_list = line.split(',')
+                    self.__users[csv_list[0]] = User(csv_list[0],
+                                                     csv_list[1],
+                                                     csv_list[2],
+                                                     encrypted=True)
+                    self.__user_email[csv_list[0]] = csv_list[1]
+                    self.__email_user[csv_list[1]] = csv_list[0]
+
+
+class Authenticator:
+
+    # Verifies and hashes passwords off the calling thread; created by the
+    # first Authenticator that needs it.
+    __verifier = None
+
+    @icontract.require(
+        lambda filename: isinstance(filename, str) & (filename != ''))
+    @icontract.ensure(lambda result: result is None)
+    def __init__(self, filename=USERS_FILE, throttle=None):
+        """
+        The initialization method opens the store of the users.
+        Default to the users stored in database/users.csv; a file name
+        ending with .db (or .sqlite) opens an SQLite database instead
+        (see user_store.py). Failed logins are counted by throttle, a
+        LoginThrottle with the default limits if it is None.
+        """
+        self.__throttle = LoginThrottle() if throttle is None else throttle
+        # The usernames and emails of the signups still being hashed, so
+        # that no second signup takes them meanwhile.
+        self.__signing_up = {}
+        self.__signing_up_emails = set()
+        self.__signup_lock = threading.Lock()
+        if filename.endswith(SQLITE_SUFFIXES):
+            # Imported here: user_store imports this module.
+            from user_store import SQLiteUserStore
+            self.__store = SQLiteUserStore(filename)
+        else:
+            self.__store = CSVUserStore(filename)
+
+    @property
+    def store(self):
+        """Return the store attribute."""
+        return self.__store
+
+    @property
+    def throttle(self):
+        """Return the throttle attribute."""
+        return self.__throttle
+
+    @classmethod
+    def verifier(cls):
+        """Return the thread pool of VERIFY_WORKERS threads that runs the
+        password hashing of every Authenticator.
+
+        At most VERIFY_WORKERS hashes run at once however many customers
+        log in together; the others wait in its queue.
+        """
+        if cls.__verifier is None:
+            cls.__verifier = concurrent.futures.ThreadPoolExecutor(
+                VERIFY_WORKERS, thread_name_prefix='verifier')
+        return cls.__verifier
+
+    @property
+    def users(self):
+        """Return the users of the store, by username."""
+        return self.__store.users
+
+    @property
+    def user_email(self):
+        """Return the emails of the users of the store, by username."""
+        return self.__store.user_email
+
+    @icontract.require(
+        lambda username, email, password: isinstance(username, str)
+        & isinstance(email, str) & isinstance(password, str)
+    )
+    @icontract.ensure(
+        lambda result: isinstance(result, concurrent.futures.Future))
+    def add_user_async(self, username, email, password):
+        """Start add_user() and return a concurrent.futures.Future of its
+        end: None once the user is in the store, or the exception add_user()
+        raises. The details are checked at once, and the username and
+        email are reserved until the user is in the store; only the hashing
+        of the password waits for the verifier() pool.
+        """
+        with self.__signup_lock:
+            try:
+                email = self.__new_email(username, email, password)
+            except Exception as error:
+                return failed_future(error)
+            self.__signing_up[username] = email
+            self.__signing_up_emails.add(email)
+
+        def hashed(record):
+            try:
+                self.__store.add(User(username, email, record,
+                                      encrypted=True))
+            finally:
+                with self.__signup_lock:
+                    del self.__signing_up[username]
+                    self.__signing_up_emails.discard(email)
+
+        def failed(future):
+            # The hashing failed: hashed() never ran.
+            if future.exception() is not None:
+                with self.__signup_lock:
+                    self.__signing_up.pop(username, None)
+                    self.__signing_up_emails.discard(email)
+
+        future = self.verifier().submit(encrypt_password, username, password)
+        future.add_done_callback(failed)
+        return then(future, hashed)
+
     @icontract.require(
         lambda username, email, password: isinstance(username, str)
         & isinstance(email, str) & isinstance(password, str)
@@ -145,19 +391,29 @@ class Authenticator:
         Check two conditions for adding a user:
         1. Password length: If the password is smaller than 6 characters,
         then it should raise the PasswordTooShort exception.
-        2. Username already exists: If the username already exists in the users
-        dictionary, then an UsernameAlreadyExists exception should be raised.
+        2. Username already exists: If the username already exists in the
+        store, then an UsernameAlreadyExists exception should be raised.
         If both conditions hold, create a new instance of User with the new
-        username and password and add it to the dictionary users with the key
-        username.
+        username and password and add it to the store.
+        It waits for add_user_async().
+        """
+        self.add_user_async(username, email, password).result()
+
+    def __new_email(self, username, email, password):
+        """Raise the exception of add_user() if the details of a new user
+        are not accepted, and return the email the user gets. The caller
+        holds the signup lock.
         """
         if len(password) < 6:
             raise PasswordTooShort(password)
-        elif username in self.__users:
-            raise UsernameAlreadyExists(username, self.__users)
+        existing = self.__store.get(username)
+        if existing is not None:
+            raise UsernameAlreadyExists(username, {username: existing})
+        elif username in self.__signing_up:
+            raise UsernameAlreadyExists(
+                username, {username: self.__signing_up[username]})
         else:
-            valid_form = re.compile(r'([A-Za-z0-9]+[.-_])*[A-Za-z0-9]+@[A-Za-z0-9-]+(\.[A-Z|a-z]{2,})+')  # noqa: E501
-            if not re.fullmatch(valid_form, email):
+            if not VALID_EMAIL.fullmatch(email):
                 try:
                     raise InappropriateEmail(email)
                 except InappropriateEmail as e:
@@ -165,70 +421,202 @@ class Authenticator:
                     email = (username + str(random.randint(100, 999)) + '@gmail' + random.choice(tuple(TLDs)) + random.choice(tuple(COUNTRY_CODEs)))  # noqa: E501
                     print(f'    {repr(email)}')
             else:
-                for stored_email in self.__user_email.values():
-                    if email == stored_email:
-                        raise EmailAlreadyExists(
-                                email, self.__users
-                        )
-            self.__users[username] = User(username, email, password)
-            self.__user_email[username] = email
+                owner = self.__store.get_by_email(email)
+                if owner is not None:
+                    raise EmailAlreadyExists(email, {owner.username: owner})
+                elif email in self.__signing_up_emails:
+                    raise EmailAlreadyExists(email, {
+                        name: address for name, address
+                        in self.__signing_up.items() if address == email})
+        return email
+
+    @icontract.require(
+        lambda username, password:
+            isinstance(username, str) & isinstance(password, str))
+    @icontract.ensure(
+        lambda result: isinstance(result, concurrent.futures.Future))
+    def verify_async(self, username, password):
+        """Return a concurrent.futures.Future of whether password is the
+        one of username (False if there is no such user), checked by the
+        verifier() pool. Nothing else is changed.
+        """
+        user = self.__store.get(username)
+        if user is None:
+            future = concurrent.futures.Future()
+            future.set_result(False)
+            return future
+        return self.verifier().submit(user.password.check_pw, password)
+
+    @icontract.require(
+        lambda username, password:
+            isinstance(username, str) & isinstance(password, str))
+    @icontract.ensure(
+        lambda result: isinstance(result, concurrent.futures.Future))
+    def login_async(self, username, password, source=None):
+        """Start login() and return a concurrent.futures.Future of its end:
+        None once the user is logged in, or the exception login() raises.
+        The lockout and the username are checked at once; only the hashing
+        of the password waits for the verifier() pool.
+        """
+        try:
+            self.__throttle.check(username, source)
+            user = self.__store.get(username)
+            if user is None:
+                self.__throttle.failure(username, source)
+                raise InvalidUsername(username)
+        except Exception as error:
+            return failed_future(error)
+
+        def rehashed(record):
+            user.password = Password(username, record, encrypted=True)
+            self.__store.update_password(username)
+            user.is_logged_in = True
+
+        def verified(matches):
+            if not matches:
+                self.__throttle.failure(username, source)
+                raise InvalidPassword(password)
+            self.__throttle.success(username, source)
+            if user.password.needs_rehash():
+                return then(self.verifier().submit(
+                    encrypt_password, username, password), rehashed)
+            user.is_logged_in = True
+
+        return then(self.verify_async(username, password), verified)
 
     @icontract.require(
         lambda username, password:
             isinstance(username, str) & isinstance(password, str))
     @icontract.ensure(lambda result: result is None)
-    def login(self, username, password):
+    def login(self, username, password, source=None):
         """
-        • Check if the username is included in the users dictionary. If it is
+        • Check if the username is included in the store. If it is
         not, then raise an InvalidUsername exception.
         • Check the password matches that user's password by calling that
         user's check_pw() method. If it does not, then raise an
         InvalidPassword exception.
         • If both conditions hold then assign True to the attribute
         is_logged_in of the User object.
+        The password is checked by the verifier() thread pool. A record of
+        an older KDF or cost is replaced by one of the current KDF.
+        Too many failures for username or source (e.g. an IP address)
+        raise TooManyAttempts before the password is hashed.
+        It waits for login_async().
         """
-        if username not in self.__users:
-            raise InvalidUsername(username)
-        elif not self.__users[username].password.check_pw(password):
-            raise InvalidPassword(password)
-        else:
-            self.__users[username].is_logged_in = True
+        self.login_async(username, password, source).result()
 
     @icontract.require(
         lambda username, password:
             isinstance(username, str) & isinstance(password, str))
     @icontract.ensure(lambda result: result is None)
-    def logout(self, username, password):
+    def logout(self, username, password=''):
         """Log user out of the system."""
-        self.__users[username].is_logged_in = False
+        self.__store.get(username).is_logged_in = False
 
     @icontract.require(lambda username: isinstance(username, str))
     @icontract.ensure(lambda result: isinstance(result, bool))
     def is_logged_in(self, username):
-        if username in self.__users:
-            return self.__users[username].is_logged_in
+        user = self.__store.get(username)
+        if user is not None:
+            return user.is_logged_in
         return False
 
+    @icontract.require(lambda username: isinstance(username, str))
     @icontract.ensure(lambda result: result is None)
-    def __read_from_csv(self):
-        """Automatically invoked when an Authenticator object is constructed.
-
-        By invoking this method, the Authenticator class should automatically
-        construct a users and a user_email dictionaries and fill them with
-        items that it reads from the CSV file named "users.csv".
-        """
-        self.__users = {}       # A dictionary of users coming to the store.
-        self.__user_email = {}  # Each user is associated with only one email.
-        with open('database/users.csv') as infile:
-            line = None
-            while line is None or line != '':
-                line = infile.readline().rstrip('\n')
-                if line != '' and len(line.split(',')) == 3:
-                    csv_list = line.split(',')
-                    self.__users[csv_list[0]] = User(csv_list[0],
-                                                     csv_list[1],
-                                                     csv_list[2])
-                    self.__user_email[csv_list[0]] = csv_list[1]
+    def save_user(self, username):
+        """Write the record of a new user to the store."""
+        self.__store.save(username)
+
+
+# ---------------------------- Function Definitions ---------------------------
+def failed_future(error):
+    """Return a concurrent.futures.Future that ended with error."""
+    future = concurrent.futures.Future()
+    future.set_exception(error)
+    return future
+
+
+def then(future, function):
+    """Return a concurrent.futures.Future of function(result of future),
+    called once future is done, or of the exception of either.
+
+    If function returns a Future, that one is waited for in turn.
+    """
+    chained = concurrent.futures.Future()
+
+    def copy(done):
+        try:
+            chained.set_result(done.result())
+        except BaseException as error:
+            chained.set_exception(error)
+
+    def call(done):
+        try:
+            result = function(done.result())
+        except BaseException as error:
+            chained.set_exception(error)
+            return
+        if isinstance(result, concurrent.futures.Future):
+            result.add_done_callback(copy)
+        else:
+            chained.set_result(result)
+
+    future.add_done_callback(call)
+    return chained
+
+
+def legacy_digest(username, password):
+    """Return the unsalted sha256 of username + password, the record of
+    every password hashed before the KDF records.
+    """
+    hash_string = username + password
+    hash_string = hash_string.encode('utf8')
+    return hashlib.sha256(hash_string).hexdigest()
+
+
+def encrypt_password(username, password):
+    """Return a new record of the password hashed by the current KDF with a
+    random salt: 'name$cost$...$salt$hash', salt and hash in hex.
+
+    A plain function, so that bulk imports can run it in other processes.
+    """
+    name, costs = KDF
+    salt = os.urandom(SALT_SIZE)
+    derived = KDFS[name][1](password.encode('utf8'), salt, *costs)
+    return '$'.join([name, *map(str, costs), salt.hex(), derived.hex()])
+
+
+def verify_password(username, password, record):
+    """Return True if password is the one hashed in record.
+
+    Records of any KDF and cost are accepted, as well as legacy digests.
+    """
+    if '$' not in record:
+        return hmac.compare_digest(legacy_digest(username, password), record)
+    name, *fields = record.split('$')
+    costs = [int(field) for field in fields[:-2]]
+    derived = KDFS[name][1](password.encode('utf8'),
+                            bytes.fromhex(fields[-2]), *costs)
+    return hmac.compare_digest(derived.hex(), fields[-1])
+
+
+def needs_rehash(record):
+    """Return True if record was not made with the current KDF and costs."""
+    name, costs = KDF
+    return not record.startswith('$'.join([name, *map(str, costs)]) + '$')
+
+
+def set_kdf(name, *costs):
+    """Hash new passwords with the KDF named name and costs from now on,
+    e.g. set_kdf('pbkdf2_sha256', 600000) or set_kdf('scrypt', 2**14, 8, 1).
+    Records of other settings are upgraded on the next login.
+    """
+    global KDF
+    if name not in KDFS:
+        raise ValueError(f'Unknown KDF {name}!')
+    elif len(costs) != len(KDFS[name][0]):
+        raise ValueError(f'{name} takes the costs {KDFS[name][0]}!')
+    KDF = (name, tuple(costs))
 
 
 # ---------------------------------- Program ----------------------------------
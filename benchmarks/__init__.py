@@ -0,0 +1,6 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+"""Performance benchmarks. Run each one from the repository root with
+python -m benchmarks.<name> --help
+"""
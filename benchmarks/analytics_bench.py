@@ -0,0 +1,92 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  benchmarks/analytics_bench.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Measures how the sales analytics scale with the number of
+#               worker processes on a synthetic receipts archive.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import argparse
+import concurrent.futures
+import os
+import random
+import resource
+import tempfile
+import time
+
+# Local application/library specific imports
+import analytics
+from benchmarks import datagen
+
+
+# ---------------------------- Function Definitions ---------------------------
+def write_archive(directory, receipts, files, seed=0):
+    """Write a synthetic archive of receipt lines spread over files."""
+    rng = random.Random(seed)
+    sample = []
+    for _ in datagen.iter_catalog(rng, datagen.SAMPLE_SIZE, sample=sample):
+        pass
+    datagen.write_receipts(directory, rng, sample, receipts, files)
+
+
+def summarise_and_measure(path):
+    """Map step that also reports the peak memory (KiB) of its worker."""
+    summary = analytics.summarise_file(path)
+    return summary, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run(directory, workers):
+    """Return (seconds, peak KiB per worker, units sold) for one run."""
+    paths = analytics.receipt_files(directory)
+    start = time.perf_counter()
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        results = list(executor.map(summarise_and_measure, paths,
+                                    chunksize=16))
+    summary = analytics.merge_summaries(result[0] for result in results)
+    elapsed = time.perf_counter() - start
+    peak = max(result[1] for result in results)
+    return elapsed, peak, sum(summary.units.values())
+
+
+# ---------------------------------- Program ----------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark the sales analytics against worker count.')
+    parser.add_argument('--receipts', type=int, default=1_000_000,
+                        help='number of receipt lines in the archive')
+    parser.add_argument('--files', type=int, default=1000,
+                        help='number of receipt files in the archive')
+    parser.add_argument('--workers', default=None,
+                        help='comma separated worker counts '
+                             '(default: 1, 2, 4, ... up to the cores)')
+    args = parser.parse_args()
+
+    if args.workers:
+        worker_counts = [int(count) for count in args.workers.split(',')]
+    else:
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= os.cpu_count():
+            worker_counts.append(worker_counts[-1] * 2)
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f'Writing {args.receipts} receipt lines '
+              f'into {args.files} files...')
+        write_archive(directory, args.receipts, args.files)
+
+        baseline = None
+        print(f'{"workers":>8} {"seconds":>9} {"speedup":>8} '
+              f'{"KiB/worker":>11} {"units":>10}')
+        for workers in worker_counts:
+            elapsed, peak, units = run(directory, workers)
+            baseline = baseline or elapsed
+            print(f'{workers:>8} {elapsed:>9.2f} {baseline/elapsed:>8.2f} '
+                  f'{peak:>11} {units:>10}')
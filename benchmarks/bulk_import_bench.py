@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  benchmarks/bulk_import_bench.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Measures the customers imported per second by bulk_import.py
+#               against the number of hashing workers.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import argparse
+import os
+import tempfile
+import time
+
+# Local application/library specific imports
+from authenticator import Authenticator
+from bulk_import import CHUNK_SIZE, import_users
+
+
+# ---------------------------- Function Definitions ---------------------------
+def bench_import(customers, workers, chunksize, threads, suffix='.csv'):
+    """Return the seconds taken to import customers new customers."""
+    records = [(f'partner{number}', f'partner{number}@gmail.com',
+                f'password{number}') for number in range(customers)]
+    with tempfile.TemporaryDirectory() as directory:
+        users_file = os.path.join(directory, 'users' + suffix)
+        if suffix == '.csv':
+            with open(users_file, mode='w', encoding='UTF8') as outfile:
+                outfile.write('Username,Email,Password (encoded)\n')
+        authenticator = Authenticator(users_file)
+        start = time.perf_counter()
+        imported, _ = import_users(authenticator, records, workers,
+                                   chunksize, threads)
+        seconds = time.perf_counter() - start
+    assert imported == customers
+    return seconds
+
+
+# ---------------------------------- Program ----------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Measure bulk import throughput against workers.')
+    parser.add_argument('--customers', type=int, default=50000,
+                        help='number of customers imported')
+    parser.add_argument('--workers', default='1,2,4',
+                        help='comma separated numbers of workers')
+    parser.add_argument('--chunksize', type=int, default=CHUNK_SIZE,
+                        help='customers per chunk')
+    parser.add_argument('--store', choices=['.csv', '.db'], default='.csv',
+                        help='user store imported into')
+    args = parser.parse_args()
+
+    print(f'{os.cpu_count()} CPU(s)')
+    print(f'{"workers":>8} {"processes":>12} {"threads":>12}')
+    for workers in [int(number) for number in args.workers.split(',')]:
+        rates = [args.customers / bench_import(args.customers, workers,
+                                               args.chunksize, threads,
+                                               args.store)
+                 for threads in (False, True)]
+        print(f'{workers:>8} {rates[0]:>10.0f}/s {rates[1]:>10.0f}/s',
+              flush=True)
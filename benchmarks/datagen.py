@@ -0,0 +1,205 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  benchmarks/datagen.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Writes a synthetic database.csv, users.csv and receipts of
+#               any size, for scale and regression benchmarks.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import argparse
+import hashlib
+import os
+import random
+
+
+# ------------------------------- Named Constant ------------------------------
+BRANDS = {
+    'CPU': ('AMD Ryzen', 'AMD Threadripper', 'Intel Core', 'Intel Xeon'),
+    'GraphicsCard': ('NVIDIA GeForce', 'NVIDIA Quadro', 'AMD Radeon',
+                     'Intel Arc'),
+    'Memory': ('Corsair Vengeance', 'G-Skill TridentZ', 'Kingston Fury',
+               'Crucial Ballistix'),
+    'Storage': ('Seagate Barracuda', 'WD Blue', 'Samsung EVO', 'Toshiba P'),
+}
+
+PART_TYPES = tuple(BRANDS)
+
+TLDS = ('.com', '.net', '.org', '.biz', '.edu')
+COUNTRY_CODES = ('', '.au', '.ca', '.jp', '.uk', '.vn')
+
+# Number of catalog rows remembered for duplicates and receipts.
+SAMPLE_SIZE = 4096
+
+
+# ---------------------------- Function Definitions ---------------------------
+def part_fields(rng, part_type, number):
+    """Return the fields (without stock) of a new part of part_type."""
+    name = f'{rng.choice(BRANDS[part_type])} {number}'
+    price = round(rng.uniform(20, 3000), 2)
+    if part_type == 'CPU':
+        extra = [rng.choice((2, 4, 6, 8, 12, 16, 24, 32)),
+                 round(rng.uniform(1.8, 5.8), 1)]
+    elif part_type == 'GraphicsCard':
+        extra = [rng.randrange(900, 2600), rng.choice((2, 4, 6, 8, 12, 24))]
+    elif part_type == 'Memory':
+        extra = [rng.choice((4, 8, 16, 32, 64)),
+                 rng.choice((2133, 2666, 3000, 3200, 3600, 4266)),
+                 rng.choice(('DDR3', 'DDR4', 'DDR5'))]
+    else:
+        extra = [rng.choice((250, 500, 1000, 2000, 4000, 8000)),
+                 rng.choice(('HDD', 'SSD', 'SSHD'))]
+    return [part_type, name, price] + extra
+
+
+def stock_field(rng, out_of_stock_rate):
+    """Return 'OUT OF STOCK' or 'xN', N being small more often than not."""
+    if rng.random() < out_of_stock_rate:
+        return 'OUT OF STOCK'
+    return f'x{min(999, int(rng.expovariate(1 / 15)) + 1)}'
+
+
+def malformed_row(rng, fields):
+    """Return a broken version of a catalog row."""
+    kind = rng.randrange(4)
+    if kind == 0:
+        # Missing fields.
+        return ','.join(map(str, fields[:3]))
+    elif kind == 1:
+        # A price that is not a number.
+        return ','.join(map(str, fields[:2] + ['free'] + fields[3:])) + ',x1'
+    elif kind == 2:
+        # An unknown part type.
+        return ','.join(map(str, ['Monitor'] + fields[1:])) + ',x1'
+    return ''
+
+
+def iter_catalog(rng, count, out_of_stock_rate=0.05, duplicate_rate=0.01,
+                 malformed_rate=0.0, sample=None):
+    """Yield count database.csv lines covering all four part types.
+
+    A duplicate repeats the fields of a recent row with a stock of its
+    own, which loading ignores: add_to_partlist() raises the stock of a
+    duplicate by 1. A malformed row cannot be loaded as a part. Up to
+    SAMPLE_SIZE rows are kept in sample (a list), for the receipts.
+    """
+    recent = []
+    for number in range(count):
+        if recent and rng.random() < duplicate_rate:
+            fields = rng.choice(recent)
+        else:
+            fields = part_fields(rng, PART_TYPES[number % 4], number)
+            if len(recent) < SAMPLE_SIZE:
+                recent.append(fields)
+            else:
+                recent[rng.randrange(SAMPLE_SIZE)] = fields
+        if rng.random() < malformed_rate:
+            yield malformed_row(rng, fields) + '\n'
+        else:
+            yield (','.join(map(str, fields)) + ','
+                   + stock_field(rng, out_of_stock_rate) + '\n')
+    if sample is not None:
+        sample.extend(recent)
+
+
+def user_password(number):
+    """Return the password of the generated user number."""
+    return f'password{number}'
+
+
+def iter_users(rng, count, duplicate_rate=0.0, malformed_rate=0.0):
+    """Yield the users.csv header and count user lines.
+
+    The password of user number i is user_password(i).
+    """
+    yield 'Username,Email,Password (encoded)\n'
+    for number in range(count):
+        if number and rng.random() < duplicate_rate:
+            number = rng.randrange(number)
+        username = f'user{number}'
+        email = (f'{username}@gmail{rng.choice(TLDS)}'
+                 f'{rng.choice(COUNTRY_CODES)}')
+        digest = hashlib.sha256(
+            (username + user_password(number)).encode('utf8')).hexdigest()
+        if rng.random() < malformed_rate:
+            yield f'{username},{digest}\n'
+        else:
+            yield f'{username},{email},{digest}\n'
+
+
+def write_lines(path, lines):
+    """Write an iterable of lines to a file, without holding them all."""
+    with open(path, mode='w', encoding='UTF8', newline='') as outfile:
+        outfile.writelines(lines)
+
+
+def write_receipts(directory, rng, sample, lines, files, usernames=None):
+    """Write lines receipt lines, spread over files receipt files.
+
+    Each line is a part of sample (a list of catalog fields) with a
+    quantity. Files are named after usernames[i], or customer<i>.
+    """
+    os.makedirs(directory, exist_ok=True)
+    for number in range(files):
+        count = lines // files + (number < lines % files)
+        username = usernames[number] if usernames else f'customer{number}'
+        write_lines(
+            os.path.join(directory, f'{username}.csv'),
+            (','.join(map(str, rng.choice(sample)))
+             + f',x{rng.randint(1, 3)}\n' for _ in range(count)),
+        )
+
+
+def generate(directory, parts=1000, users=1000, receipts=10000,
+             receipt_files=100, seed=0, out_of_stock_rate=0.05,
+             duplicate_rate=0.01, malformed_rate=0.0):
+    """Write database.csv, users.csv and receipts/ into directory."""
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    sample = []
+    write_lines(os.path.join(directory, 'database.csv'),
+                iter_catalog(rng, parts, out_of_stock_rate, duplicate_rate,
+                             malformed_rate, sample))
+    write_lines(os.path.join(directory, 'users.csv'),
+                iter_users(rng, users, duplicate_rate, malformed_rate))
+    if receipts and sample:
+        receipt_files = max(1, min(receipt_files, receipts))
+        usernames = None
+        if users >= receipt_files:
+            usernames = [f'user{number}' for number in range(receipt_files)]
+        write_receipts(os.path.join(directory, 'receipts'), rng, sample,
+                       receipts, receipt_files, usernames)
+
+
+# ---------------------------------- Program ----------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Write a synthetic shop database.')
+    parser.add_argument('directory',
+                        help='output directory (e.g. a copy of database/)')
+    parser.add_argument('--parts', type=int, default=1000,
+                        help='number of database.csv rows')
+    parser.add_argument('--users', type=int, default=1000,
+                        help='number of users.csv rows')
+    parser.add_argument('--receipts', type=int, default=10000,
+                        help='number of receipt lines')
+    parser.add_argument('--receipt-files', type=int, default=100,
+                        help='number of receipt files')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out-of-stock-rate', type=float, default=0.05)
+    parser.add_argument('--duplicate-rate', type=float, default=0.01)
+    parser.add_argument('--malformed-rate', type=float, default=0.0,
+                        help='fraction of rows that cannot be loaded')
+    args = parser.parse_args()
+
+    generate(args.directory, args.parts, args.users, args.receipts,
+             args.receipt_files, args.seed, args.out_of_stock_rate,
+             args.duplicate_rate, args.malformed_rate)
@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  benchmarks/import_bench.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Measures the import time of main.py with -X importtime and
+#               fails when it is over budget or imports a lazy dependency.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import argparse
+import subprocess
+import sys
+
+
+# ------------------------------- Named Constant ------------------------------
+# Microseconds allowed for "import main", the best of several runs.
+BUDGET_US = 150_000
+
+# Modules that must only be imported when first needed.
+LAZY_MODULES = ('rich',)
+
+
+# ---------------------------- Function Definitions ---------------------------
+def import_times(module='main'):
+    """Return a dictionary of cumulative microseconds, keyed by module, of
+    importing module in a fresh interpreter.
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def best_import_times(module='main', repeat=5):
+    """Return the import_times() of the fastest of repeat imports."""
+    runs = [import_times(module) for _ in range(repeat)]
+    return min(runs, key=lambda times: times[module])
+
+
+# ---------------------------------- Program ----------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Check the import time of main.py against a budget.')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='imports measured, the fastest one is kept')
+    parser.add_argument('--budget', type=int, default=BUDGET_US,
+                        help=f'microseconds allowed (default {BUDGET_US})')
+    parser.add_argument('--top', type=int, default=10,
+                        help='number of slowest modules shown')
+    args = parser.parse_args()
+
+    times = best_import_times('main', args.repeat)
+    total = times['main']
+    for name, cumulative in sorted(times.items(),
+                                   key=lambda item: -item[1])[:args.top]:
+        print(f'{name:>40}: {cumulative / 1000:>8.1f}ms')
+
+    failed = False
+    eager = [name for name in LAZY_MODULES if name in times]
+    if eager:
+        print(f'FAILED: {", ".join(eager)} imported by main')
+        failed = True
+    if total > args.budget:
+        print(f'FAILED: import main took {total / 1000:.1f}ms > '
+              f'{args.budget / 1000:.1f}ms')
+        failed = True
+    if failed:
+        sys.exit(1)
+    print(f'import main took {total / 1000:.1f}ms '
+          f'(budget {args.budget / 1000:.1f}ms)')
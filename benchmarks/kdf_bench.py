@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  benchmarks/kdf_bench.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Measures the login throughput at each password hashing cost,
+#               with one and with many customers logging in at once.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import argparse
+import concurrent.futures
+import os
+import tempfile
+import time
+
+# Local application/library specific imports
+import authenticator
+from authenticator import Authenticator
+
+
+# ------------------------------- Named Constant ------------------------------
+# (KDF name, costs) measured by default.
+SETTINGS = (
+    ('pbkdf2_sha256', (10000,)),
+    ('pbkdf2_sha256', (100000,)),
+    ('pbkdf2_sha256', (600000,)),
+    ('scrypt', (2**14, 8, 1)),
+    ('scrypt', (2**15, 8, 1)),
+)
+
+
+# ---------------------------- Function Definitions ---------------------------
+def bench_logins(users_file, logins, clients):
+    """Return logins per second of clients threads sharing logins logins
+    of the users of users_file.
+    """
+    auth = Authenticator(users_file)
+    usernames = [f'user{number % 10}' for number in range(logins)]
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(clients) as executor:
+        list(executor.map(lambda username: auth.login(username, 'password'),
+                          usernames))
+    return logins / (time.perf_counter() - start)
+
+
+# ---------------------------------- Program ----------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Measure login throughput at each KDF cost.')
+    parser.add_argument('--logins', type=int, default=40,
+                        help='logins per measurement')
+    parser.add_argument('--clients', type=int, default=8,
+                        help='customers logging in at once')
+    args = parser.parse_args()
+
+    print(f'{os.cpu_count()} CPU(s), {authenticator.VERIFY_WORKERS} '
+          f'verifier thread(s)')
+    print(f'{"setting":>28} {"1 client":>12} '
+          f'{str(args.clients) + " clients":>12}')
+    for name, costs in SETTINGS:
+        authenticator.set_kdf(name, *costs)
+        with tempfile.TemporaryDirectory() as directory:
+            users_file = os.path.join(directory, 'users.csv')
+            with open(users_file, mode='w', encoding='UTF8') as outfile:
+                outfile.write('Username,Email,Password (encoded)\n')
+            auth = Authenticator(users_file)
+            for number in range(10):
+                auth.add_user(f'user{number}', f'user{number}@gmail.com',
+                              'password')
+                auth.save_user(f'user{number}')
+            auth.store.flush()
+            rates = [bench_logins(users_file, args.logins, clients)
+                     for clients in (1, args.clients)]
+        setting = f'{name} {",".join(map(str, costs))}'
+        print(f'{setting:>28} {rates[0]:>10.1f}/s {rates[1]:>10.1f}/s',
+              flush=True)
@@ -0,0 +1,338 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  benchmarks/loadgen.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Drives main.py with simulated customers and records the
+#               latency of every menu operation and the overall throughput.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import argparse
+import collections
+import concurrent.futures
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+
+# ------------------------------- Named Constant ------------------------------
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The end of each menu, up to the prompt main.py waits at. Both menus have
+# five options, so their last lines tell them apart.
+MAIN_MENU = '4. Low Stock\n5. Close\nEnter an option (1-5): '
+WISHLIST_MENU = '4. Purchase And Close\n5. Close\nEnter an option (1-5): '
+
+# Every operation, with the menu it starts from.
+MAIN_MENU_OPERATIONS = ('signup', 'login', 'admin')
+WISHLIST_OPERATIONS = ('add', 'remove', 'purchase', 'close')
+
+DEFAULT_MIX = 'signup=1,login=2,admin=1,add=6,remove=2,purchase=1,close=1'
+
+PASSWORD = 'password123'
+
+
+# ------------------------------ Class Definition -----------------------------
+class ShopProcess:
+    """One main.py process, fed a script on stdin one operation at a time.
+
+    Every operation writes its answers and waits until main.py prints the
+    prompt of the menu it should return to.
+    """
+
+    def __init__(self, workdir, timeout):
+        """Start main.py and wait for its Main Menu."""
+        self.__timeout = timeout
+        self.__output = ''
+        self.__condition = threading.Condition()
+        start = time.perf_counter()
+        # Customers who signed up before this are in the users.csv it reads.
+        self.started_at = start
+        self.customers = []
+        # A new session has no controlling terminal, so getpass() falls back
+        # to reading the password from stdin.
+        self.__process = subprocess.Popen(
+            [sys.executable, '-u', 'main.py'], cwd=workdir,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT, start_new_session=True,
+        )
+        threading.Thread(target=self.__read, daemon=True).start()
+        self.__wait_for(MAIN_MENU)
+        self.startup = time.perf_counter() - start
+
+    def __read(self):
+        """Collect the output of main.py in a background thread."""
+        while True:
+            chunk = os.read(self.__process.stdout.fileno(), 65536)
+            with self.__condition:
+                if not chunk:
+                    self.__output += '\0'
+                self.__output += chunk.decode('utf8', 'replace')
+                self.__condition.notify_all()
+            if not chunk:
+                return
+
+    def __wait_for(self, prompt):
+        """Wait until prompt is printed (or main.py exits)."""
+        with self.__condition:
+            found = self.__condition.wait_for(
+                lambda: prompt in self.__output or '\0' in self.__output,
+                self.__timeout,
+            )
+            output = self.__output
+            self.__output = ''
+        if not found or prompt not in output:
+            raise RuntimeError(f'Expected {prompt!r}, got:\n{output[-500:]}')
+        return output
+
+    def send(self, answers, prompt):
+        """Answer with each line of answers and return the seconds taken
+        until prompt is printed.
+        """
+        start = time.perf_counter()
+        self.__process.stdin.write(
+            ''.join(answer + '\n' for answer in answers).encode('utf8'))
+        self.__process.stdin.flush()
+        self.__wait_for(prompt)
+        return time.perf_counter() - start
+
+    def close(self):
+        """Choose Close in the Main Menu and return the seconds taken until
+        main.py exits.
+        """
+        start = time.perf_counter()
+        self.__process.stdin.write(b'5\n')
+        self.__process.stdin.close()
+        self.__process.wait(self.__timeout)
+        return time.perf_counter() - start
+
+    def kill(self):
+        """Stop main.py without closing it properly."""
+        self.__process.kill()
+        self.__process.wait()
+
+
+class LoadGenerator:
+    """Simulated customers, each running one main.py process."""
+
+    def __init__(self, workdir, mix, visits, timeout, seed):
+        """Initialise LoadGenerator object."""
+        self.__workdir = workdir
+        self.__mix = mix
+        self.__visits = visits
+        self.__timeout = timeout
+        self.__seed = seed
+        self.__lock = threading.Lock()
+        self.__customers = []       # (signup time, username) pairs.
+        self.__counter = 0
+        self.__latencies = collections.defaultdict(list)
+        self.__errors = collections.Counter()
+        with open(os.path.join(workdir, 'database', 'database.csv'),
+                  encoding='UTF8') as infile:
+            self.__part_names = [line.split(',')[1] for line in infile
+                                 if line.count(',') >= 2]
+
+    @property
+    def latencies(self):
+        """Return the latencies attribute (seconds, keyed by operation)."""
+        return self.__latencies
+
+    @property
+    def errors(self):
+        """Return the errors attribute (count, keyed by operation)."""
+        return self.__errors
+
+    def __choose(self, rng, operations):
+        """Pick one of operations, weighted by the mix."""
+        weights = [self.__mix.get(operation, 0) for operation in operations]
+        if not any(weights):
+            return operations[-1]
+        return rng.choices(operations, weights)[0]
+
+    def __next_number(self):
+        with self.__lock:
+            self.__counter += 1
+            return self.__counter
+
+    def __record(self, operation, seconds):
+        with self.__lock:
+            self.__latencies[operation].append(seconds)
+
+    def customer(self, number):
+        """Run one simulated customer from start to exit."""
+        rng = random.Random(self.__seed * 1_000_003 + number)
+        operation = 'startup'
+        shop = None
+        try:
+            shop = ShopProcess(self.__workdir, self.__timeout)
+            self.__record(operation, shop.startup)
+            for _ in range(self.__visits):
+                operation = self.__choose(rng, MAIN_MENU_OPERATIONS)
+                if operation == 'admin':
+                    self.__record(operation, self.__admin(shop, rng))
+                else:
+                    self.__visit(shop, rng, operation)
+            operation = 'exit'
+            self.__record(operation, shop.close())
+        except Exception:
+            with self.__lock:
+                self.__errors[operation] += 1
+            if shop is not None:
+                shop.kill()
+
+    def __admin(self, shop, rng):
+        """Add a new CPU through Add Part To Database."""
+        number = self.__next_number()
+        return shop.send(
+            ['3', '1', f'Load CPU {number}', f'{rng.uniform(50, 900):.2f}',
+             str(rng.choice((4, 8, 16))), f'{rng.uniform(2, 5):.1f}', '5'],
+            MAIN_MENU,
+        )
+
+    def __visit(self, shop, rng, operation):
+        """Open a Wishlist (signup or login) and act on it until it is
+        purchased or closed.
+        """
+        # Only customers this process knows about can log in.
+        with self.__lock:
+            known = shop.customers + [
+                username for signed_up_at, username in self.__customers
+                if signed_up_at < shop.started_at
+            ]
+        returning = operation == 'login' and known
+        if returning:
+            username = rng.choice(known)
+        if not returning:
+            operation = 'signup'
+            username = f'load{self.__seed}x{self.__next_number()}'
+        answers = ['1', username, f'{username}@gmail.com', PASSWORD, PASSWORD]
+        if returning:
+            answers.append('y')
+        self.__record(operation, shop.send(answers, WISHLIST_MENU))
+        if not returning:
+            shop.customers.append(username)
+            with self.__lock:
+                self.__customers.append((time.perf_counter(), username))
+
+        held = []
+        while True:
+            operation = self.__choose(rng, WISHLIST_OPERATIONS)
+            if operation == 'remove' and not held:
+                operation = 'add'
+            if operation == 'add':
+                held.append(rng.choice(self.__part_names))
+                answers, prompt = ['1', PASSWORD, held[-1]], WISHLIST_MENU
+            elif operation == 'remove':
+                part_name = held.pop(rng.randrange(len(held)))
+                answers, prompt = ['2', PASSWORD, part_name], WISHLIST_MENU
+            elif operation == 'purchase':
+                answers, prompt = ['4', PASSWORD], MAIN_MENU
+            else:
+                answers, prompt = ['5', PASSWORD], MAIN_MENU
+            self.__record(operation, shop.send(answers, prompt))
+            if prompt == MAIN_MENU:
+                return
+
+
+# ---------------------------- Function Definitions ---------------------------
+def parse_mix(text):
+    """Return a dictionary of weights from 'operation=weight,...'."""
+    mix = {}
+    for item in text.split(','):
+        operation, weight = item.split('=')
+        if operation not in MAIN_MENU_OPERATIONS + WISHLIST_OPERATIONS:
+            raise ValueError(f'Unknown operation {operation!r}.')
+        mix[operation] = float(weight)
+    return mix
+
+
+def summarise(latencies):
+    """Return count and latency statistics (milliseconds) of a list."""
+    latencies = sorted(latencies)
+    count = len(latencies)
+    return {
+        'count': count,
+        'mean_ms': statistics.fmean(latencies) * 1000,
+        'p50_ms': latencies[count // 2] * 1000,
+        'p95_ms': latencies[min(count - 1, int(count * 0.95))] * 1000,
+        'p99_ms': latencies[min(count - 1, int(count * 0.99))] * 1000,
+        'max_ms': latencies[-1] * 1000,
+    }
+
+
+def run(customers, concurrency, mix, visits, timeout=60, seed=0):
+    """Run the customers in a copy of the shop and return the report."""
+    with tempfile.TemporaryDirectory() as workdir:
+        # A copy, so that the load never touches the real database.
+        shutil.copytree(REPOSITORY, workdir, dirs_exist_ok=True,
+                        ignore=shutil.ignore_patterns(
+                            '.git', '__pycache__', '.*_cache'))
+        generator = LoadGenerator(workdir, mix, visits, timeout, seed)
+        start = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(concurrency) as executor:
+            list(executor.map(generator.customer, range(customers)))
+        elapsed = time.perf_counter() - start
+
+    operations = sum(len(latencies)
+                     for operation, latencies in generator.latencies.items()
+                     if operation not in ('startup', 'exit'))
+    return {
+        'config': {
+            'customers': customers, 'concurrency': concurrency,
+            'visits': visits, 'mix': mix, 'seed': seed,
+        },
+        'seconds': elapsed,
+        'operations': operations,
+        'throughput_ops_per_s': operations / elapsed,
+        'errors': dict(generator.errors),
+        'latency': {operation: summarise(latencies)
+                    for operation, latencies
+                    in sorted(generator.latencies.items())},
+    }
+
+
+# ---------------------------------- Program ----------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Drive main.py with simulated customers.')
+    parser.add_argument('--customers', type=int, default=20,
+                        help='number of simulated customers (processes)')
+    parser.add_argument('--concurrency', type=int, default=4,
+                        help='number of customers running at once')
+    parser.add_argument('--visits', type=int, default=3,
+                        help='Main Menu operations per customer')
+    parser.add_argument('--mix', default=DEFAULT_MIX,
+                        help=f'operation weights (default: {DEFAULT_MIX})')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=60,
+                        help='seconds to wait for any single prompt')
+    parser.add_argument('--output', default='loadgen_report.json',
+                        help='JSON report file')
+    args = parser.parse_args()
+
+    report = run(args.customers, args.concurrency, parse_mix(args.mix),
+                 args.visits, args.timeout, args.seed)
+    with open(args.output, mode='w', encoding='UTF8') as outfile:
+        json.dump(report, outfile, indent=2)
+    print(f'{report["operations"]} operations in {report["seconds"]:.2f}s '
+          f'({report["throughput_ops_per_s"]:.1f} ops/s), '
+          f'errors: {report["errors"] or "none"}')
+    for operation, stats in report['latency'].items():
+        print(f'{operation:>9}: n={stats["count"]:<5} '
+              f'p50={stats["p50_ms"]:.1f}ms p95={stats["p95_ms"]:.1f}ms')
+    print(f'Report written to {args.output}')
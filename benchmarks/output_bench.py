@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  benchmarks/output_bench.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Compares the output backends on large listings and bulk adds.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import argparse
+import contextlib
+import os
+import tempfile
+import time
+
+# Local application/library specific imports
+import main
+from benchmarks import datagen
+from output import BACKENDS
+
+
+# ---------------------------- Function Definitions ---------------------------
+def bench_backend(backend, partlist, parts):
+    """Return the seconds of listing partlist and of adding every part of
+    parts with its status printed, through the backend named backend.
+    """
+    main.console.use(backend)
+    cmd = main.CommandPrompt(main.ShopService(partlist))
+    with open(os.devnull, 'w') as devnull, \
+            contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        main.ListDatabase(cmd)
+        main.console.flush()
+        listing = time.perf_counter() - start
+
+        start = time.perf_counter()
+        new_partlist = main.Partlist()
+        for part in parts:
+            new_partlist.add_to_partlist(part, print_status=True)
+        main.console.flush()
+        adding = time.perf_counter() - start
+    return listing, adding
+
+
+# ---------------------------------- Program ----------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compare the output backends on large listings.')
+    parser.add_argument('--parts', type=int, default=10000,
+                        help='number of parts in the catalog')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        datagen.generate(directory, parts=args.parts, users=0, receipts=0)
+        partlist = main.Partlist.read_from_csv(directory=directory)
+    parts = list(partlist.items)
+
+    print(f'{"backend":>10} {"listing":>10} {"bulk add":>10}')
+    for backend in BACKENDS:
+        listing, adding = bench_backend(backend, partlist, parts)
+        print(f'{backend:>10} {listing:>9.3f}s {adding:>9.3f}s',
+              flush=True)
@@ -0,0 +1,131 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  benchmarks/service_bench.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Compares the operations per second of the ShopService with
+#               the interactive path through the Question classes.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import argparse
+import builtins
+import contextlib
+import os
+import tempfile
+import time
+
+# Local application/library specific imports
+import main
+from metrics import Metrics
+from wishlist_store import WishlistStore
+
+
+# ---------------------------- Function Definitions ---------------------------
+def bench_service(service, part_name, operations):
+    """Return the seconds taken by add/remove calls on the ShopService."""
+    wishlist = service.open_wishlist('benchmark')
+    start = time.perf_counter()
+    for _ in range(operations // 2):
+        service.add_to_wishlist(wishlist, part_name)
+        service.remove_from_wishlist(wishlist, part_name)
+    return time.perf_counter() - start
+
+
+def bench_interactive(service, part_name, operations):
+    """Return the seconds taken by the AddFromDatabase/RemoveFromWishlist
+    questions, with input() answered from a script and output discarded.
+    """
+    cmd = main.CommandPrompt(service)
+    cmd.wishlist = service.open_wishlist('benchmark')
+    answers = iter([part_name] * operations)
+    real_input = builtins.input
+    builtins.input = lambda prompt='': next(answers)
+    try:
+        with open(os.devnull, 'w') as devnull, \
+                contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            for _ in range(operations // 2):
+                main.AddFromDatabase(cmd)
+                main.RemoveFromWishlist(cmd)
+            elapsed = time.perf_counter() - start
+    finally:
+        builtins.input = real_input
+    return elapsed
+
+
+def bench_timed(calls):
+    """Return the seconds a Metrics.timed() wrapper adds to one call."""
+    def function():
+        pass
+
+    timings = []
+    for wrapped in (function, Metrics().timed('function', function)):
+        start = time.perf_counter()
+        for _ in range(calls):
+            wrapped()
+        timings.append(time.perf_counter() - start)
+    return (timings[1] - timings[0]) / calls
+
+
+def best_of(repeat, bench, *args):
+    """Return the shortest of repeat runs of bench(*args) (seconds)."""
+    return min(bench(*args) for _ in range(repeat))
+
+
+# ---------------------------------- Program ----------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compare the ShopService with the interactive path.')
+    parser.add_argument('--operations', type=int, default=2000,
+                        help='number of add/remove operations per path')
+    parser.add_argument('--part', default='AMD Ryzen 5',
+                        help='name of the part added and removed')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='runs of each path, the best is kept '
+                             '(default 5)')
+    parser.add_argument('--metrics', action='store_true',
+                        help='also measure the overhead of the metrics')
+    args = parser.parse_args()
+
+    # The wishlist records of the benchmark are not kept.
+    wishlists_directory = tempfile.TemporaryDirectory()
+    service = main.ShopService(wishlists=WishlistStore(
+        os.path.join(wishlists_directory.name, 'wishlists.db')))
+    seconds = {}
+    for label, bench in (('service', bench_service),
+                         ('interactive', bench_interactive)):
+        seconds[label] = best_of(args.repeat, bench, service, args.part,
+                                 args.operations)
+        print(f'{label:>20}: {args.operations / seconds[label]:>10.0f} ops/s')
+
+    if args.metrics:
+        # A whole run varies by more than the metrics cost, so the cost is
+        # also worked out from the timed calls per operation and the cost
+        # of one timed call.
+        overhead = best_of(args.repeat, bench_timed, args.operations * 100)
+        print(f'{"timed() overhead":>20}: {overhead * 1e9:>10.0f} ns/call')
+        # The same runs again, with every command and mutation timed.
+        with tempfile.TemporaryDirectory() as directory:
+            shop_metrics = main.enable_metrics(
+                os.path.join(directory, 'metrics.prom'), interval=3600)
+            for label, bench in (('service', bench_service),
+                                 ('interactive', bench_interactive)):
+                before = sum(shop_metrics.calls.values())
+                elapsed = best_of(args.repeat, bench, service, args.part,
+                                  args.operations)
+                timed = ((sum(shop_metrics.calls.values()) - before)
+                         / (args.repeat * args.operations))
+                share = timed * overhead * args.operations / seconds[label]
+                print(f'{label + "+metrics":>20}: '
+                      f'{args.operations / elapsed:>10.0f} ops/s '
+                      f'({elapsed / seconds[label] - 1:+.1%}; '
+                      f'{timed:.1f} timed calls/op, {share:+.1%})')
+            shop_metrics.stop_exporter()
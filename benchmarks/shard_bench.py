@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  benchmarks/shard_bench.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Measures the load and save times of a ShardedPartlist against
+#               the number of loading and saving processes.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import argparse
+import os
+import tempfile
+import time
+
+# Local application/library specific imports
+import main
+from benchmarks import datagen
+
+
+# ---------------------------- Function Definitions ---------------------------
+def bench_shards(directory, workers):
+    """Return the seconds of a cold load, a warm load and a save of the
+    warehouses of directory, by up to workers processes.
+    """
+    for filename in os.listdir(directory):
+        if filename.endswith('.cache'):
+            os.remove(os.path.join(directory, filename))
+    times = []
+    for _ in range(2):
+        start = time.perf_counter()
+        partlist = main.ShardedPartlist.read_shards(directory,
+                                                    workers=workers)
+        times.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    partlist.save_to_csv(workers=workers)
+    times.append(time.perf_counter() - start)
+    return times
+
+
+# ---------------------------------- Program ----------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Measure ShardedPartlist loads and saves against '
+                    'processes.')
+    parser.add_argument('--parts', type=int, default=100000,
+                        help='number of parts in the catalog')
+    parser.add_argument('--warehouses', type=int, default=4,
+                        help='number of warehouses')
+    parser.add_argument('--workers', default='1,2,4',
+                        help='comma separated numbers of processes')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        datagen.generate(directory, parts=args.parts, users=0, receipts=0)
+        partlist = main.Partlist.read_from_csv(directory=directory)
+        warehouses = os.path.join(directory, 'warehouses')
+        main.ShardedPartlist.split(
+            partlist, [f'warehouse{number}'
+                       for number in range(args.warehouses)], warehouses)
+
+        print(f'{os.cpu_count()} CPU(s), {args.warehouses} warehouses')
+        print(f'{"workers":>8} {"cold load":>10} {"warm load":>10} '
+              f'{"save":>10}')
+        for workers in [int(number) for number in args.workers.split(',')]:
+            cold, warm, save = bench_shards(warehouses, workers)
+            print(f'{workers:>8} {cold:>9.3f}s {warm:>9.3f}s {save:>9.3f}s',
+                  flush=True)
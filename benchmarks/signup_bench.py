@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  benchmarks/signup_bench.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Compares the signups per second of one users.csv append per
+#               signup with the group commit of users_writer.py.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+
+# Local application/library specific imports
+from authenticator import Authenticator
+from benchmarks import datagen
+from users_writer import GroupCommitAppender
+
+
+# ---------------------------- Function Definitions ---------------------------
+def append_each(filename):
+    """Return a function appending a row the way save_user() used to: one
+    open and close per signup, and no fsync.
+    """
+    def append(row):
+        with open(file=filename, mode='a',
+                  encoding='UTF8', newline='') as outfile:
+            csv.writer(outfile).writerow(row)
+    return append
+
+
+def bench_signups(directory, signups, append, close=None):
+    """Return the seconds taken by signups signups written with append."""
+    users_file = os.path.join(directory, 'users.csv')
+    authenticator = Authenticator(users_file)
+    start = time.perf_counter()
+    for number in range(signups):
+        username = f'new{number}'
+        authenticator.add_user(username, f'{username}@gmail.com', 'password')
+        user = authenticator.users[username]
+        append([user.username, user.email, user.password.password])
+    if close is not None:
+        close()
+    return time.perf_counter() - start
+
+
+def bench_writes(rows, append, close=None):
+    """Return the seconds taken by writing rows with append alone."""
+    start = time.perf_counter()
+    for row in rows:
+        append(row)
+    if close is not None:
+        close()
+    return time.perf_counter() - start
+
+
+# ---------------------------------- Program ----------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compare the users.csv writers on a burst of signups.')
+    parser.add_argument('--signups', type=int, default=2000,
+                        help='number of signups in the burst')
+    parser.add_argument('--users', type=int, default=10000,
+                        help='number of users already in users.csv')
+    parser.add_argument('--group', type=int, default=64,
+                        help='rows per group commit')
+    args = parser.parse_args()
+
+    for label in ('append each', 'fsync each', 'group commit'):
+        with tempfile.TemporaryDirectory() as directory:
+            datagen.write_lines(
+                os.path.join(directory, 'users.csv'),
+                datagen.iter_users(random.Random(0), args.users))
+            users_file = os.path.join(directory, 'users.csv')
+            rows = [[f'row{number}', f'row{number}@gmail.com', 'digest']
+                    for number in range(args.signups)]
+            if label == 'append each':
+                signups = bench_signups(directory, args.signups,
+                                        append_each(users_file))
+                writes = bench_writes(rows, append_each(users_file))
+            else:
+                group = 1 if label == 'fsync each' else args.group
+                appender = GroupCommitAppender(users_file, group)
+                signups = bench_signups(directory, args.signups,
+                                        appender.append, appender.close)
+                appender = GroupCommitAppender(users_file, group)
+                writes = bench_writes(rows, appender.append, appender.close)
+        print(f'{label:>14}: {args.signups / signups:>8.0f} signups/s '
+              f'{args.signups / writes:>9.0f} rows/s written alone')
@@ -0,0 +1,247 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  benchmarks/suite.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Times the Partlist, Authenticator and persistence operations
+#               at several catalog and customer sizes, and compares the
+#               results with a stored baseline.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+# Local application/library specific imports
+import main
+import user_store
+from authenticator import Authenticator
+from benchmarks import datagen
+
+
+# ------------------------------- Named Constant ------------------------------
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+DEFAULT_SIZES = '1000,10000,100000'
+
+# Default number of calls timed for the per-call operations.
+CALLS = 50
+
+
+# ---------------------------- Function Definitions ---------------------------
+def best_of(repeat, function):
+    """Return the shortest of repeat runs of function (seconds)."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_size(directory, size, repeat, calls=CALLS):
+    """Return a dictionary of seconds per call, keyed by operation."""
+    rng = random.Random(size)
+    datagen.generate(directory, parts=size, users=size, receipts=0,
+                     duplicate_rate=0.0)
+    results = {}
+    calls = min(calls, size)
+
+    # Catalog
+    results['catalog_load'] = best_of(
+        repeat, lambda: main.Partlist.read_from_csv(directory=directory))
+    cache_file = os.path.join(directory, 'database.cache')
+
+    def load_cold():
+        if os.path.exists(cache_file):
+            os.remove(cache_file)
+        main.Partlist.read_cached(directory=directory)
+    results['catalog_load_cold'] = best_of(repeat, load_cold)
+    results['catalog_load_warm'] = best_of(
+        repeat, lambda: main.Partlist.read_cached(directory=directory))
+    partlist = main.Partlist.read_from_csv(directory=directory)
+    parts = list(partlist.items)
+
+    def add_all():
+        new_partlist = main.Partlist()
+        for part in parts:
+            new_partlist.add_to_partlist(part)
+    results['add_to_partlist'] = best_of(repeat, add_all) / len(parts)
+
+    names = [part.name for part in rng.sample(parts, calls)]
+    results['get_part_using_name'] = best_of(
+        repeat, lambda: [partlist.get_part_using_name(name)
+                         for name in names]) / calls
+    positions = [rng.randrange(len(parts)) for _ in range(calls)]
+    results['get_part_using_position'] = best_of(
+        repeat, lambda: [partlist.get_part_using_position(position)
+                         for position in positions]) / calls
+
+    def remove_using_name():
+        for name in names:
+            partlist.remove_part_using_name(name)
+
+    def remove_using_position():
+        for position in positions:
+            partlist.remove_part_using_position(position % len(partlist))
+
+    for operation, remove in (('remove_part_using_name', remove_using_name),
+                              ('remove_part_using_position',
+                               remove_using_position)):
+        seconds = []
+        for _ in range(repeat):
+            partlist = main.Partlist.read_from_csv(directory=directory)
+            seconds.append(best_of(1, remove))
+        results[operation] = min(seconds) / calls
+
+    results['save_to_csv'] = best_of(
+        repeat, lambda: partlist.save_to_csv('saved', directory))
+
+    # Wishlist of every part in the catalog
+    wishlist = main.Wishlist('benchmark')
+    for part in parts:
+        wishlist.add_to_partlist(part)
+    results['wishlist_str'] = best_of(repeat, wishlist.__str__)
+
+    # Authenticator
+    users_file = os.path.join(directory, 'users.csv')
+    results['users_load'] = best_of(
+        repeat, lambda: Authenticator(users_file))
+    authenticator = Authenticator(users_file)
+    numbers = rng.sample(range(size), calls)
+    results['login'] = best_of(
+        repeat, lambda: [authenticator.login(f'user{number}',
+                                             datagen.user_password(number))
+                         for number in numbers]) / calls
+
+    seconds = []
+    for attempt in range(repeat):
+        start = time.perf_counter()
+        for number in range(calls):
+            username = f'new{attempt}x{number}'
+            authenticator.add_user(username, f'{username}@gmail.com',
+                                   'password')
+        seconds.append(time.perf_counter() - start)
+    results['add_user'] = min(seconds) / calls
+
+    # The same users in an SQLite store
+    users_db = os.path.join(directory, 'users.db')
+    user_store.migrate(users_file, users_db)
+    results['users_load_sqlite'] = best_of(
+        repeat, lambda: Authenticator(users_db))
+    seconds = []
+    for _ in range(repeat):
+        # A new store each time, so that no User object is cached yet.
+        authenticator = Authenticator(users_db)
+        start = time.perf_counter()
+        for number in numbers:
+            authenticator.login(f'user{number}',
+                                datagen.user_password(number))
+        seconds.append(time.perf_counter() - start)
+    results['login_sqlite'] = min(seconds) / calls
+    seconds = []
+    for attempt in range(repeat):
+        start = time.perf_counter()
+        for number in range(calls):
+            username = f'new{attempt}x{number}'
+            authenticator.add_user(username, f'{username}@gmail.com',
+                                   'password')
+            authenticator.save_user(username)
+        seconds.append(time.perf_counter() - start)
+    results['signup_sqlite'] = min(seconds) / calls
+    return results
+
+
+def run(sizes, repeat, calls=CALLS):
+    """Return the results of every size, keyed by operation then size."""
+    results = {}
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory, \
+                open(os.devnull, 'w') as devnull, \
+                contextlib.redirect_stdout(devnull):
+            timings = bench_size(directory, size, repeat, calls)
+        for operation, seconds in timings.items():
+            results.setdefault(operation, {})[str(size)] = seconds
+        print(f'size {size}: done', file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of (operation, size, seconds, baseline seconds) that
+    are slower than the baseline by more than tolerance (e.g. 0.25).
+    """
+    regressions = []
+    for operation, sizes in results.items():
+        for size, seconds in sizes.items():
+            expected = baseline.get(operation, {}).get(size)
+            if expected is not None and seconds > expected * (1 + tolerance):
+                regressions.append((operation, size, seconds, expected))
+    return regressions
+
+
+# ---------------------------------- Program ----------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark the shop at several sizes.')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help=f'comma separated sizes (default: '
+                             f'{DEFAULT_SIZES}; up to 1000000)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='runs per measurement, the best one is kept')
+    parser.add_argument('--calls', type=int, default=CALLS,
+                        help='calls timed per lookup/remove/login operation')
+    parser.add_argument('--output', default='bench_results.json',
+                        help='JSON file the results are written to')
+    parser.add_argument('--baseline', default=BASELINE_FILE,
+                        help='JSON file of the baseline results')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed slowdown against the baseline')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='store these results as the new baseline')
+    args = parser.parse_args()
+
+    results = run([int(size) for size in args.sizes.split(',')],
+                  args.repeat, args.calls)
+    report = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+    with open(args.output, mode='w', encoding='UTF8') as outfile:
+        json.dump(report, outfile, indent=2)
+
+    for operation, sizes in results.items():
+        print(f'{operation:>27}: ' + '  '.join(
+            f'{size}={seconds * 1e6:.1f}us' for size, seconds in sizes.items()
+        ))
+
+    if args.update_baseline:
+        with open(args.baseline, mode='w', encoding='UTF8') as outfile:
+            json.dump(report, outfile, indent=2)
+        print(f'Baseline written to {args.baseline}')
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding='UTF8') as infile:
+            baseline = json.load(infile)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        for operation, size, seconds, expected in regressions:
+            print(f'REGRESSION {operation} at {size}: '
+                  f'{seconds * 1e6:.1f}us > {expected * 1e6:.1f}us '
+                  f'(+{args.tolerance:.0%})')
+        if regressions:
+            sys.exit(1)
+        print(f'No regression against {args.baseline} '
+              f'(tolerance {args.tolerance:.0%})')
@@ -0,0 +1,163 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  bulk_import.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Imports many customers at once, hashing their passwords in
+#               parallel and adding them to the user store in order.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import argparse
+import collections
+import concurrent.futures
+import csv
+import os
+
+# Third party
+import icontract
+
+# Local application/library specific imports
+from authenticator import (USERS_FILE, VALID_EMAIL, Authenticator,
+                           encrypt_password)
+
+
+# ------------------------------- Named Constant ------------------------------
+# Customers validated, hashed and stored together.
+CHUNK_SIZE = 500
+
+
+# ---------------------------- Function Definitions ---------------------------
+def iter_partner_csv(filename):
+    """Yield the (username, email, password) records of a csv file, one
+    customer per line with the password in plain text.
+    """
+    with open(filename, encoding='UTF8', newline='') as infile:
+        for csv_list in csv.reader(infile):
+            if len(csv_list) == 3 and csv_list[0] != 'Username':
+                yield tuple(csv_list)
+
+
+def validate(store, chunk, usernames, emails):
+    """Return (accepted records, rejected (record, reason) pairs) of chunk.
+
+    A record is rejected like add_user() would, except that an improper
+    email is rejected instead of replaced. usernames and emails are the
+    sets already accepted by this import; they are updated.
+    """
+    accepted = []
+    rejected = []
+    for record in chunk:
+        username, email, password = record
+        if username == '' or ' ' in username:
+            reason = 'InvalidUsername'
+        elif len(password) < 6:
+            reason = 'PasswordTooShort'
+        elif not VALID_EMAIL.fullmatch(email):
+            reason = 'InappropriateEmail'
+        elif username in usernames or store.get(username) is not None:
+            reason = 'UsernameAlreadyExists'
+        elif email in emails or store.get_by_email(email) is not None:
+            reason = 'EmailAlreadyExists'
+        else:
+            usernames.add(username)
+            emails.add(email)
+            accepted.append(record)
+            continue
+        rejected.append((record, reason))
+    return accepted, rejected
+
+
+def hash_chunk(chunk):
+    """Return the (username, email, password digest) records of chunk."""
+    return [(username, email, encrypt_password(username, password))
+            for username, email, password in chunk]
+
+
+def iter_chunks(records, size):
+    """Yield lists of up to size records."""
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+@icontract.require(lambda workers: workers is None or workers >= 1)
+@icontract.require(lambda chunksize: chunksize >= 1)
+def import_users(authenticator, records, workers=None, chunksize=CHUNK_SIZE,
+                 threads=False):
+    """Add (username, email, password) records to the store of
+    authenticator and return (number imported, rejected pairs).
+
+    Passwords are hashed by workers processes (threads if threads is True,
+    for hash functions that release the GIL; in this process if workers is
+    1). At most two chunks per worker are in flight, and the hashed chunks
+    are stored in the order of records.
+    """
+    store = authenticator.store
+    workers = workers or os.cpu_count() or 1
+    usernames = set()
+    emails = set()
+    imported = 0
+    rejected = []
+
+    def accepted_chunks():
+        for chunk in iter_chunks(records, chunksize):
+            accepted, refused = validate(store, chunk, usernames, emails)
+            rejected.extend(refused)
+            if accepted:
+                yield accepted
+
+    if workers == 1:
+        for chunk in accepted_chunks():
+            imported += store.add_many(hash_chunk(chunk))
+        return imported, rejected
+
+    if threads:
+        executor_class = concurrent.futures.ThreadPoolExecutor
+    else:
+        executor_class = concurrent.futures.ProcessPoolExecutor
+    with executor_class(max_workers=workers) as executor:
+        in_flight = collections.deque()
+        for chunk in accepted_chunks():
+            in_flight.append(executor.submit(hash_chunk, chunk))
+            if len(in_flight) >= 2 * workers:
+                imported += store.add_many(in_flight.popleft().result())
+        while in_flight:
+            imported += store.add_many(in_flight.popleft().result())
+    return imported, rejected
+
+
+# ---------------------------------- Program ----------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Import customers from a username,email,password csv.')
+    parser.add_argument('file', help='csv file of the new customers')
+    parser.add_argument('--users', default=USERS_FILE,
+                        help=f'users.csv or .db to import into '
+                             f'(default {USERS_FILE})')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='hashing workers (default: one per core)')
+    parser.add_argument('--chunksize', type=int, default=CHUNK_SIZE,
+                        help='customers per chunk')
+    parser.add_argument('--threads', action='store_true',
+                        help='hash in threads instead of processes')
+    args = parser.parse_args()
+
+    imported, rejected = import_users(
+        Authenticator(args.users), iter_partner_csv(args.file),
+        args.workers, args.chunksize, args.threads)
+    for (username, email, _), reason in rejected:
+        print(f'Rejected {username} <{email}>: {reason}')
+    print(f'Imported {imported} customers, rejected {len(rejected)}.')
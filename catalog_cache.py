@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  catalog_cache.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Keeps the parsed catalog in a binary file next to its csv
+#               file, valid for as long as the csv file is unchanged.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import hashlib
+import marshal
+import os
+
+# Third party
+import icontract
+
+
+# ------------------------------- Named Constant ------------------------------
+# Bumped whenever the layout of the cached rows changes.
+FORMAT_VERSION = 1
+
+
+# ---------------------------- Function Definitions ---------------------------
+@icontract.ensure(lambda result: isinstance(result, tuple))
+def fingerprint(path):
+    """Return the key of a csv file: its size, modification time and
+    SHA-256, plus the cache and marshal format versions.
+    """
+    status = os.stat(path)
+    digest = hashlib.sha256()
+    with open(path, mode='rb') as infile:
+        for block in iter(lambda: infile.read(1 << 20), b''):
+            digest.update(block)
+    return (FORMAT_VERSION, marshal.version, status.st_size,
+            status.st_mtime_ns, digest.hexdigest())
+
+
+def load(cache_path, key):
+    """Return the value cached in cache_path under key, or None if the file
+    is missing, unreadable or was written for another key.
+    """
+    try:
+        with open(cache_path, mode='rb') as infile:
+            cached_key, value = marshal.load(infile)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if tuple(cached_key) != key:
+        return None
+    return value
+
+
+@icontract.ensure(lambda result: isinstance(result, bool))
+def save(cache_path, key, value):
+    """Write value to cache_path under key; return False if the file could
+    not be written (e.g. a read-only directory).
+
+    value may only hold the built-in types marshal supports.
+    """
+    temporary = cache_path + '.tmp'
+    try:
+        with open(temporary, mode='wb') as outfile:
+            marshal.dump((key, value), outfile)
+        os.replace(temporary, cache_path)
+    except OSError:
+        return False
+    return True
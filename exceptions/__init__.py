@@ -8,4 +8,5 @@ from .invalid_email import InvalidEmail                     # noqa: F401
 from .invalid_password import InvalidPassword               # noqa: F401
 from .invalid_username import InvalidUsername               # noqa: F401
 from .password_too_short import PasswordTooShort            # noqa: F401
+from .too_many_attempts import TooManyAttempts              # noqa: F401
 from .username_already_exists import UsernameAlreadyExists  # noqa: F401
@@ -13,8 +13,8 @@ from .auth_exception import AuthException
 class EmailAlreadyExists(AuthException):
 
     @icontract.require(
-        lambda message, user:
-            isinstance(message, str) & isinstance(user, dict))
+        lambda email, user:
+            isinstance(email, str) & isinstance(user, dict))
     @icontract.ensure(lambda result: result is None)
     def __init__(self, email, user):
         super().__init__(
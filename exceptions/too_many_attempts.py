@@ -0,0 +1,24 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# ------------------------------- Module Imports ------------------------------
+# Third party
+import icontract
+
+# Local application/library specific import
+from .auth_exception import AuthException
+
+
+# ------------------------------ Class Definition -----------------------------
+class TooManyAttempts(AuthException):
+
+    @icontract.require(
+        lambda key, retry_after:
+            isinstance(key, str) & isinstance(retry_after, (int, float)))
+    @icontract.ensure(lambda result: result is None)
+    def __init__(self, key, retry_after):
+        self.retry_after = retry_after
+        super().__init__(
+            'Too many failed logins for ' + repr(key) + '; try again in '
+            + str(max(1, round(retry_after))) + ' seconds.\n'
+        )
@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  file_lock.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Locks a file for every process and thread of a host, so that
+#               the shop processes can share the files of the database.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+try:
+    import fcntl
+except ImportError:
+    # e.g. on Windows: no lock is taken.
+    fcntl = None
+
+
+# ------------------------------ Class Definition -----------------------------
+class FileLock:
+    """An flock() of a lock file, held while in use.
+
+    Each use opens the lock file again, so two uses conflict even in the
+    same process: a use must not be nested in another use of the same
+    lock file.
+
+    Where fcntl is missing the lock does nothing, so main.py still runs
+    there, with one shop process at a time using the files.
+    """
+
+    def __init__(self, path, shared=False):
+        """Initialise FileLock object; shared locks only exclude the
+        exclusive ones.
+        """
+        self.__path = path
+        self.__shared = shared
+        self.__file = None
+
+    def __enter__(self):
+        if fcntl is None:
+            return self
+        self.__file = open(self.__path, 'a+b')
+        fcntl.flock(self.__file.fileno(),
+                    fcntl.LOCK_SH if self.__shared else fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.__file is None:
+            return
+        fcntl.flock(self.__file.fileno(), fcntl.LOCK_UN)
+        self.__file.close()
+        self.__file = None
@@ -0,0 +1,350 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  forecast.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Forecasts the daily demand of every part from its sales, to
+#               project how many days its stock lasts.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import argparse
+import array
+import datetime
+import math
+import struct
+
+# Third party
+import icontract
+
+# Local application/library specific imports
+from file_lock import FileLock
+
+
+# ------------------------------- Named Constant ------------------------------
+FORECAST_FILE = 'database/forecast.bin'
+
+# Smoothing of the daily units (ALPHA) and of the weekday factors (GAMMA).
+ALPHA = 0.3
+GAMMA = 0.1
+
+# The state of a part: its last day of sales (a proleptic ordinal), the
+# units sold that day, the smoothed daily units (-1 before a whole day was
+# seen) and one factor per weekday, Monday first.
+RECORD = struct.Struct('<iid7d')
+
+# The level of a part without a whole day of sales yet.
+UNSEEN = -1.0
+
+
+# ------------------------------ Class Definition -----------------------------
+class DemandForecast:
+    """Exponentially weighted daily units sold of every part, with a
+    multiplicative factor for each day of the week.
+
+    A part's sales are added up until a later day is recorded; that day is
+    then folded into the averages, together with the days without sales in
+    between, in a fixed number of steps. Each part is a fixed-size record
+    of <filename>, rewritten in place when it changes, and <filename>.names
+    holds the part name of each record. The state is held in one array per
+    field, so a forecast runs over the columns of all the parts at once.
+
+    Several processes may share the files: an order is recorded under the
+    lock of <filename>.lock, after reading the names the other processes
+    added and the records it changes; a forecast reads the files again.
+    """
+
+    @icontract.require(
+        lambda filename: isinstance(filename, str) & (filename != ''))
+    @icontract.require(
+        lambda alpha, gamma: (0 < alpha <= 1) & (0 < gamma <= 1))
+    def __init__(self, filename=FORECAST_FILE, alpha=ALPHA, gamma=GAMMA):
+        """Initialise DemandForecast object. Nothing is read yet."""
+        self.__filename = filename
+        self.__alpha = alpha
+        self.__gamma = gamma
+        self.__names = None
+
+    @property
+    def filename(self):
+        """Return the filename attribute."""
+        return self.__filename
+
+    @property
+    def names(self):
+        """Return the part names, loading the state on first access."""
+        if self.__names is None:
+            self.__load()
+        return self.__names
+
+    @icontract.ensure(lambda result: result is None)
+    def __load(self):
+        """Read the forecast files again, under a shared lock."""
+        with FileLock(self.__filename + '.lock', shared=True):
+            self.__read()
+
+    def __read(self):
+        """Read the forecast files, or start from nothing if there are
+        none. The caller holds the lock.
+        """
+        self.__names = []
+        self.__numbers = {}
+        self.__names_size = 0
+        self.__days = array.array('l')
+        self.__pending = array.array('l')
+        self.__levels = array.array('d')
+        # Seven factors per part, one after the other.
+        self.__seasons = array.array('d')
+        self.__read_names()
+        try:
+            with open(self.__filename, 'rb') as infile:
+                data = infile.read()
+        except FileNotFoundError:
+            data = b''
+        # A part whose record was never written keeps its first state.
+        for number, record in enumerate(RECORD.iter_unpack(
+                data[:min(len(data) // RECORD.size, len(self.__names))
+                     * RECORD.size])):
+            self.__set(number, record)
+
+    def __read_names(self):
+        """Add the names written since they were last read, each with the
+        first state of a part. The caller holds the lock.
+        """
+        try:
+            with open(self.__filename + '.names', 'rb') as infile:
+                infile.seek(self.__names_size)
+                data = infile.read()
+        except FileNotFoundError:
+            return
+        # Only whole lines; a name is written with its newline.
+        data = data[:data.rfind(b'\n') + 1]
+        self.__names_size += len(data)
+        for name in data.decode('UTF8').splitlines():
+            self.__numbers[name] = len(self.__names)
+            self.__names.append(name)
+            self.__days.append(0)
+            self.__pending.append(0)
+            self.__levels.append(UNSEEN)
+            self.__seasons.extend([1.0] * 7)
+
+    def __set(self, number, record):
+        """Set the state of part number to a RECORD."""
+        if record[0] == 0:
+            # Zeros: a gap before a record written after a crash.
+            return
+        self.__days[number] = record[0]
+        self.__pending[number] = record[1]
+        self.__levels[number] = record[2]
+        self.__seasons[7 * number:7 * number + 7] = array.array(
+            'd', record[3:])
+
+    def __number(self, part_name, day):
+        """Return the number of part_name, given to it if it has none.
+        The caller holds the lock and has read the names.
+        """
+        number = self.__numbers.get(part_name)
+        if number is None:
+            encoded = (part_name + '\n').encode('UTF8')
+            with open(self.__filename + '.names', 'ab') as outfile:
+                outfile.write(encoded)
+            self.__read_names()
+            number = self.__numbers[part_name]
+            self.__days[number] = day
+        return number
+
+    def __fold(self, number, day):
+        """Fold the pending day of part number, and the days without sales
+        up to day, into its averages, in constant time.
+        """
+        last = self.__days[number]
+        if day <= last:
+            return
+        alpha, gamma = self.__alpha, self.__gamma
+        units = self.__pending[number]
+        level = self.__levels[number]
+        base = 7 * number
+        adjusted = self.__adjusted(number, units, last)
+        if level == UNSEEN:
+            level = adjusted
+        else:
+            if level > 0:
+                weekday = base + weekday_of(last)
+                self.__seasons[weekday] = (gamma * units / level
+                                           + (1 - gamma)
+                                           * self.__seasons[weekday])
+            level = alpha * adjusted + (1 - alpha) * level
+        # Each day without sales moves the level, and the factor of its
+        # weekday, towards zero.
+        gap = day - last - 1
+        level *= (1 - alpha) ** gap
+        for offset in range(min(gap, 7)):
+            weekday = base + weekday_of(last + 1 + offset)
+            self.__seasons[weekday] *= (1 - gamma) ** (
+                gap // 7 + (offset < gap % 7))
+        self.__levels[number] = level
+        self.__days[number] = day
+        self.__pending[number] = 0
+
+    def __reread(self, outfile, number):
+        """Read the record of part number, which another process may have
+        changed.
+        """
+        outfile.seek(number * RECORD.size)
+        data = outfile.read(RECORD.size)
+        if len(data) == RECORD.size:
+            self.__set(number, RECORD.unpack(data))
+
+    def __write(self, outfile, number):
+        """Write the record of part number in place."""
+        base = 7 * number
+        outfile.seek(number * RECORD.size)
+        outfile.write(RECORD.pack(self.__days[number], self.__pending[number],
+                                  self.__levels[number],
+                                  *self.__seasons[base:base + 7]))
+
+    @icontract.ensure(lambda result: result is None)
+    def record_order(self, lines, day=None):
+        """Add the units of one purchased order and write the records of
+        its parts; each line costs O(1).
+
+        lines is an iterable of (part name, quantity). day defaults to
+        today, as 'YYYY-MM-DD'.
+        """
+        day = to_ordinal(day)
+        lines = list(lines)
+        if not lines:
+            return
+        with FileLock(self.__filename + '.lock'):
+            if self.__names is None:
+                self.__read()
+            else:
+                self.__read_names()
+            try:
+                outfile = open(self.__filename, 'r+b')
+            except FileNotFoundError:
+                outfile = open(self.__filename, 'w+b')
+            with outfile:
+                for part_name, quantity in lines:
+                    number = self.__number(part_name, day)
+                    self.__reread(outfile, number)
+                    self.__fold(number, day)
+                    self.__pending[number] += quantity
+                    self.__write(outfile, number)
+
+    def daily_units(self, day=None):
+        """Return a dictionary of the forecast units sold of every part on
+        a day (default: today), as 'YYYY-MM-DD'.
+        """
+        self.__load()
+        names = self.__names
+        day = to_ordinal(day)
+        weekday = weekday_of(day)
+        return dict(zip(names, map(
+            lambda rate, number: rate * self.__factors(number)[weekday],
+            self.__rates(day), range(len(names)))))
+
+    def __rates(self, day):
+        """Return an array of the average daily units of every part on day,
+        before the weekday factors, counting the pending day as if it were
+        over.
+        """
+        alpha = self.__alpha
+        return array.array('d', map(
+            lambda number, level, units, last:
+                (self.__adjusted(number, units, last) if level == UNSEEN
+                 else alpha * self.__adjusted(number, units, last)
+                 + (1 - alpha) * level)
+                * (1 - alpha) ** max(day - last - 1, 0),
+            range(len(self.__levels)), self.__levels, self.__pending,
+            self.__days))
+
+    def __factors(self, number):
+        """Return the weekday factors of part number, averaging one."""
+        factors = self.__seasons[7 * number:7 * number + 7]
+        mean = sum(factors) / 7
+        return [factor / mean for factor in factors] if mean > 0 else [1] * 7
+
+    def __adjusted(self, number, units, day):
+        """Return the units part number sold on day, divided by the factor
+        of its weekday.
+        """
+        factor = self.__factors(number)[weekday_of(day)]
+        return units / factor if factor > 0 else units
+
+    @icontract.ensure(lambda result: isinstance(result, dict))
+    def days_until_stockout(self, stock, day=None):
+        """Return a dictionary of the days the stock of every part in the
+        dictionary stock lasts after day (default: today), as 'YYYY-MM-DD'.
+
+        A part that is not selling lasts math.inf days. Each part costs a
+        fixed number of steps: its whole weeks are counted at once.
+        """
+        self.__load()
+        day = to_ordinal(day)
+        rates = dict(zip(self.__names, self.__rates(day)))
+        tomorrow = weekday_of(day + 1)
+        result = {}
+        for part_name, quantity in stock.items():
+            rate = rates.get(part_name, 0.0)
+            if quantity <= 0:
+                result[part_name] = 0.0
+                continue
+            if rate <= 0:
+                result[part_name] = math.inf
+                continue
+            factors = self.__factors(self.__numbers[part_name])
+            week = rate * 7
+            weeks, left = divmod(quantity, week)
+            days = 7 * weeks
+            for offset in range(7):
+                demand = rate * factors[(tomorrow + offset) % 7]
+                if demand >= left:
+                    days += offset + (left / demand if demand else 0)
+                    break
+                left -= demand
+            result[part_name] = days
+        return result
+
+
+# ---------------------------- Function Definitions ---------------------------
+def to_ordinal(day=None):
+    """Return the proleptic ordinal of a 'YYYY-MM-DD' day (default: today)."""
+    if day is None:
+        return datetime.date.today().toordinal()
+    return datetime.date.fromisoformat(day).toordinal()
+
+
+def weekday_of(ordinal):
+    """Return the weekday of a proleptic ordinal, Monday being 0."""
+    return (ordinal + 6) % 7
+
+
+# ---------------------------------- Program ----------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Show the days until each part in store runs out.')
+    parser.add_argument('--file', default=FORECAST_FILE,
+                        help='forecast file')
+    parser.add_argument('--day', help="day 'YYYY-MM-DD' (default: today)")
+    args = parser.parse_args()
+
+    # Imported here: main.py imports us.
+    import main
+
+    stock = main.Partlist.read_cached().stock
+    days = DemandForecast(args.file).days_until_stockout(stock, args.day)
+    for part_name, left in sorted(days.items(), key=lambda item: item[1]):
+        if not stock[part_name]:
+            print(f'{part_name}: out of stock')
+        elif math.isinf(left):
+            print(f'{part_name}: not selling')
+        else:
+            print(f'{part_name}: {left:.1f} days')
@@ -18,30 +18,65 @@
 # ------------------------------- Module Import -------------------------------
 # Stdlib
 import abc
+import argparse
+import builtins
 import collections
+import collections.abc
+import concurrent.futures
 import csv
 import getpass
+import math
+import os
 
 # Third party
 import icontract
-from rich import print
-from rich.console import Console
 
 # Local application/library specific imports
-from exceptions import InvalidEmail
-from authenticator import (Authenticator,
+import catalog_cache
+import stock_ledger
+from aggregates import SalesAggregates
+from exceptions import InvalidEmail, TooManyAttempts
+from forecast import DemandForecast
+from memory import MEMORY_FILE, MemoryTracker
+from metrics import METRICS_FILE, Metrics
+from output import BACKENDS, Output
+from price_history import FIRST_DAY, PriceHistory
+from profiler import PROFILE_PREFIX, SessionProfiler
+from reorder import ReorderQueue
+from wishlist_store import WishlistStore
+from authenticator import (USERS_FILE,
+                           Authenticator,
                            InvalidPassword,
                            UsernameAlreadyExists)
 
 
 # ------------------------------- Named Constant ------------------------------
-console = Console()
+# rich is only imported by the first print, and only if it is used.
+console = Output()
+print = console.print
+# Running sales totals, updated by every PurchaseAndClose.
+sales_aggregates = SalesAggregates()
+# Demand of every part, updated by every PurchaseAndClose.
+demand_forecast = DemandForecast()
+# Prices of every part over time, updated by every change of price.
+part_prices = PriceHistory()
+# The Wishlist of every customer, written by every change to it.
+saved_wishlists = WishlistStore()
+# One csv file per warehouse, read by ShardedPartlist.read_shards().
+WAREHOUSES_DIRECTORY = 'database/warehouses'
+# One csv and one index file per part type, read by PartitionedPartlist.
+PARTITIONS_DIRECTORY = 'database/partitions'
+# Reorder candidates shown by LowStock.
+REORDER_SHOWN = 10
 
 
 # ------------------------------- Computer Part -------------------------------
 class ComputerPart(metaclass=abc.ABCMeta):
     """An abstract class. The superclass for other ComputerPart types."""
 
+    # Arguments of the constructor between price and stock.
+    FIELDS = ()
+
     def __init__(self, name, price, stock=1):
         """Initialise name and price.
 
@@ -87,6 +122,35 @@ class ComputerPart(metaclass=abc.ABCMeta):
         """
         pass
 
+    @icontract.ensure(lambda result: isinstance(result, tuple))
+    def to_values(self):
+        """Return the type name followed by every argument of the
+        constructor, e.g. ('CPU', 'AMD Ryzen 5', 119.99, 4, 3.2, 21).
+        """
+        return ((type(self).__name__, self.name, self.price)
+                + tuple(getattr(self, field) for field in self.FIELDS)
+                + (self.stock,))
+
+    @classmethod
+    @icontract.require(lambda csv_list: isinstance(csv_list, list))
+    def from_csv_list(cls, csv_list):
+        """Return a ComputerPart object or None.
+
+        Look up the part type named by the first element of csv_list and
+        let that type's parse() method construct the part.
+        Rows of an unknown part type, empty rows and rows that cannot be
+        parsed (missing fields, values that are not numbers) return None.
+        """
+        if not csv_list:
+            return None
+        for part_type in ComputerPart.__subclasses__():
+            if part_type.__name__ == csv_list[0]:
+                try:
+                    return part_type.parse(csv_list)
+                except (IndexError, ValueError, icontract.ViolationError):
+                    return None
+        return None
+
     @classmethod
     @icontract.ensure(lambda result: isinstance(result, str) & (result != ''))
     def input_name(cls):
@@ -169,6 +233,14 @@ class ComputerPart(metaclass=abc.ABCMeta):
         """
         return self.__price
 
+    @price.setter
+    @icontract.require(
+        lambda price: isinstance(price, (int, float)) & (price > 0))
+    @icontract.ensure(lambda result: result is None)
+    def price(self, price):
+        """Set the price attribute to the argument."""
+        self.__price = price
+
     @property
     def stock(self):
         """Return the stock attribute.
@@ -195,6 +267,9 @@ class ComputerPart(metaclass=abc.ABCMeta):
 class CPU(ComputerPart):
     """A subclass of the ComputerPart class."""
 
+    # Arguments of the constructor between price and stock.
+    FIELDS = ('cores', 'frequency_ghz')
+
     def __init__(self, name, price, cores, frequency_ghz, stock=1):
         """Initialise cores and frequency_ghz."""
         super().__init__(name, price, stock)
@@ -337,6 +412,9 @@ class CPU(ComputerPart):
 class GraphicsCard(ComputerPart):
     """A subclass of the ComputerPart class."""
 
+    # Arguments of the constructor between price and stock.
+    FIELDS = ('frequency_mhz', 'memory_gb')
+
     def __init__(self, name, price, frequency_mhz, memory_gb, stock=1):
         """
         Initialise frequency_mhz and memory_gb by calling theirs
@@ -482,6 +560,9 @@ class GraphicsCard(ComputerPart):
 class Memory(ComputerPart):
     """A subclass of the ComputerPart class."""
 
+    # Arguments of the constructor between price and stock.
+    FIELDS = ('capacity_gb', 'frequency_mhz', 'ddr')
+
     def __init__(self, name, price, capacity_gb, frequency_mhz, ddr, stock=1):
         """
         Initialise capacity_gb and frequency_mhz by calling theirs
@@ -660,6 +741,9 @@ class Memory(ComputerPart):
 class Storage(ComputerPart):
     """A subclass of the ComputerPart class."""
 
+    # Arguments of the constructor between price and stock.
+    FIELDS = ('capacity_gb', 'storage_type')
+
     def __init__(self, name, price, capacity_gb, storage_type, stock=1):
         """Initialise capacity_gb and frequency_mhz."""
         super().__init__(name, price, stock)
@@ -800,6 +884,10 @@ class Storage(ComputerPart):
 
 
 # ------------------------------- Data Structure ------------------------------
+# A part together with a number of units of it (in stock, in a Wishlist...).
+PartLine = collections.namedtuple('PartLine', ['part', 'quantity'])
+
+
 class Partlist():
     """
     A subclass of the Wishlist class.
@@ -817,6 +905,10 @@ class Partlist():
         2. Value is the number of stock that key has in stock.
         """
         self.__stock = {}
+        # Functions called with (part name, new stock) on every change.
+        self.__listeners = []
+        # Rows of the csv file read_from_csv() could not load as a part.
+        self.__skipped_rows = 0
 
     @icontract.ensure(lambda result: isinstance(result, str))
     def __str__(self):
@@ -874,6 +966,11 @@ class Partlist():
         """Clean up the stock dictionary."""
         self.__stock.clear()
 
+    @property
+    def skipped_rows(self):
+        """Return the skipped_rows attribute."""
+        return self.__skipped_rows
+
     @icontract.require(
         lambda new_part, print_status:
             isinstance(new_part, ComputerPart)
@@ -890,16 +987,17 @@ class Partlist():
         except KeyError:
             self.__items.append(new_part)
             self.__stock[name_of_new_part] = new_part.stock
+            self.stock_changed(name_of_new_part)
         else:
             # Duplicate item, so increment available stock by 1.
-            self.__stock[name_of_new_part] += 1
+            self.adjust_stock(name_of_new_part, 1)
 
         stock = self.__stock[name_of_new_part]
 
         if print_status:
             console.print(f'Added {new_part.__str__()} (x{stock})',
                           style='green')
-        print()
+            print()
 
     @icontract.require(
         lambda part_name: isinstance(part_name, str) & (part_name != ''))
@@ -931,6 +1029,87 @@ class Partlist():
             return self.__items[part_position]
         return f'{part_position} out of range 1 - {len(self)}'
 
+    def get(self, part_name):
+        """Return the part named part_name, or None."""
+        if part_name in self.__stock:
+            for item in self.__items:
+                if item.name == part_name:
+                    return item
+        return None
+
+    def adjust_stock(self, part_name, delta):
+        """Add delta (negative to take) to the stock of a part in store
+        and return its new stock.
+
+        Raise ValueError if that would leave less than nothing in stock.
+        """
+        if not isinstance(self.__stock, dict):
+            # e.g. a SharedStock, which changes it under its own lock.
+            stock = self.__stock.adjust(part_name, delta)
+        else:
+            stock = self.__stock[part_name] + delta
+            if stock < 0:
+                raise ValueError(f'Not enough of {part_name} in stock!')
+            self.__stock[part_name] = stock
+        self.stock_changed(part_name)
+        return stock
+
+    @property
+    def shares_stock(self):
+        """Return True if the stock is shared with other processes (e.g. a
+        SharedStock), so that each change of it outlives this process.
+        """
+        return not isinstance(self.__stock, dict)
+
+    def add_listener(self, function):
+        """Call function with (part name, new stock) on every change of
+        stock from now on; the stock is None once a part is removed.
+        """
+        self.__listeners.append(function)
+
+    def stock_changed(self, part_name):
+        """Tell every listener the stock of part_name."""
+        for function in self.__listeners:
+            function(part_name, self.__stock.get(part_name))
+
+    def use_stock(self, stock):
+        """Keep the stock in the dictionary stock from now on, e.g. a
+        shared_stock.SharedStock. Parts it does not have yet are added with
+        their current stock.
+        """
+        for part_name, quantity in self.__stock.items():
+            stock.setdefault(part_name, quantity)
+        self.__stock = stock
+
+    def set_price(self, part_name, price):
+        """Change the price of a part in store and return the part.
+
+        Raise LookupError if there is no part with that name.
+        """
+        item = self.get(part_name)
+        if item is None:
+            raise LookupError(f'Could not find {part_name}!')
+        item.price = price
+        return item
+
+    @icontract.require(
+        lambda part_name: isinstance(part_name, str) & (part_name != ''))
+    def pop_part(self, part_name):
+        """Return a PartLine object or None.
+
+        Find and remove a part using its name, together with all of its
+        stock, without printing anything.
+        Return None if that part name is not in store.
+        """
+        for index, item in enumerate(self.items):
+            if item.name == part_name:
+                # Delete that item and its entry in the stock dictionary.
+                del self.items[index]
+                removed = PartLine(item, self.stock.pop(part_name))
+                self.stock_changed(part_name)
+                return removed
+        return None
+
     @icontract.require(
         lambda part_name: isinstance(part_name, str) & (part_name != ''))
     def remove_part_using_name(self, part_name):
@@ -940,17 +1119,12 @@ class Partlist():
         Check to see if that part name is in store.
         Clear all stock of that part in store.
         """
-        done = False
-        for index, item in enumerate(self.items):
-            if item.name == part_name:
-                # Delete that item and its entry in the stock dictionary.
-                del self.items[index]
-                stock = self.stock.pop(part_name)
-                done = True
-        if not done:
+        removed = self.pop_part(part_name)
+        if removed is None:
             console.print(f'Could not find {part_name}!', style='red')
         else:
-            console.print(f'Removed {part_name} (x{stock})', style='green')
+            console.print(f'Removed {part_name} (x{removed.quantity})',
+                          style='green')
 
     @icontract.require(lambda part_position: isinstance(part_position, int))
     def remove_part_using_position(self, part_position):
@@ -963,20 +1137,78 @@ class Partlist():
         if part_position < len(self):
             removed_part = self.items.pop(part_position)
             stock = self.stock.pop(removed_part.name)
+            self.stock_changed(removed_part.name)
             console.print(f'Removed {removed_part.__str__()} (x{stock})',
                           style='green')
         else:
             print(f'{part_position} out of range 1 - {len(self)}')
 
+    @classmethod
+    @icontract.require(
+        lambda filename: isinstance(filename, str) & (filename != ''))
+    def read_from_csv(cls, filename='database', directory='database'):
+        """Return a new Partlist filled with the parts of a csv file.
+
+        Default to the file name database.csv in the database directory.
+        Rows that are not a part are skipped and counted in skipped_rows.
+        """
+        partlist = cls()
+        with open(file=f'{directory}/{filename}.csv', mode='r',
+                  encoding='UTF8', newline='') as infile:
+            for csv_list in csv.reader(infile, delimiter=',', quotechar='|'):
+                # Construct a CPU/GraphicsCard/Memory/Storage object.
+                new_part = ComputerPart.from_csv_list(csv_list)
+                if new_part is not None:
+                    partlist.add_to_partlist(new_part)
+                elif csv_list:
+                    partlist.__skipped_rows += 1
+        return partlist
+
+    @classmethod
+    def read_cached(cls, filename='database', directory='database'):
+        """Return read_from_csv(filename, directory), loaded from the
+        binary file <filename>.cache if the csv file has not changed since
+        the cache was written. Otherwise the csv file is parsed and the
+        cache rebuilt.
+        """
+        csv_path = f'{directory}/{filename}.csv'
+        cache_path = f'{directory}/{filename}.cache'
+        key = catalog_cache.fingerprint(csv_path)
+        cached = catalog_cache.load(cache_path, key)
+        if cached is None:
+            partlist = cls.read_from_csv(filename, directory)
+            catalog_cache.save(cache_path, key, (
+                [item.to_values() for item in partlist.items],
+                partlist.stock,
+            ))
+            return partlist
+
+        # No parsing and no add_to_partlist(): the rows were checked when
+        # the cache was written.
+        return cls.from_values(*cached)
+
+    @classmethod
+    def from_values(cls, rows, stock):
+        """Return a new Partlist of the ComputerPart.to_values() rows of
+        its items and its stock dictionary.
+        """
+        part_types = {part_type.__name__: part_type
+                      for part_type in ComputerPart.__subclasses__()}
+        partlist = cls()
+        partlist.items.extend(part_types[values[0]](*values[1:])
+                              for values in rows)
+        partlist.stock.update(stock)
+        return partlist
+
     @icontract.require(
         lambda filename: isinstance(filename, str) & (filename != ''))
     @icontract.ensure(lambda result: result is None)
-    def save_to_csv(self, filename='database'):
+    def save_to_csv(self, filename='database', directory='database'):
         """
         Save all parts to a csv file with an argument file name.
-        Default to the file name database.csv
+        Default to the file name database.csv in the database directory.
         """
-        with open(file=f'database/{filename}.csv', mode='w',
+        with open(file=f'{directory}/{filename}.csv', mode='w',
                   encoding='UTF8', newline='') as outfile:
             for item in self.items:
                 outfile.write(item.to_csv_string())
@@ -994,12 +1226,15 @@ class Partlist():
 class Wishlist(Partlist):
     """A subclass of the Partlist class."""
 
-    __authenticator = Authenticator()
+    # Loaded from users.csv by the first get_authenticator().
+    __authenticator = None
 
-    def __init__(self):
-        """Initialise Wishlist object."""
+    @icontract.require(
+        lambda username: isinstance(username, str) & (username != ''))
+    def __init__(self, username):
+        """Initialise an empty Wishlist object for the username."""
         super().__init__()
-        self.__create_user()
+        self.__username = username
 
     @icontract.ensure(lambda result: isinstance(result, str))
     def __str__(self):
@@ -1023,7 +1258,7 @@ class Wishlist(Partlist):
             result += super().__str__()[20:-20]
 
         result += '--------------------\n'
-        result += f'${self.__get_total_cost():.2f}\n'
+        result += f'${self.total_cost:.2f}\n'
 
         if self.__is_valid_computer():
             result += 'Valid computer'
@@ -1034,6 +1269,8 @@ class Wishlist(Partlist):
 
     @classmethod
     def get_authenticator(cls):
+        if cls.__authenticator is None:
+            cls.__authenticator = Authenticator()
         return cls.__authenticator
 
     @property
@@ -1041,100 +1278,10 @@ class Wishlist(Partlist):
         """Return the username attribute."""
         return self.__username
 
-    @icontract.ensure(
-        lambda self, result:
-            isinstance(self.__username, str)
-            & (result is None) & (self.__username != '')
-    )
-    def set_username(self):
-        """Set the username attribute by keeping prompting the user."""
-        username = None
-        valid = False
-        while username is None or not valid:
-            try:
-                username = input('Enter your username: ')
-                if username == '':
-                    raise ValueError(
-                        'Cannot create a Wishlist with an empty name.')
-                elif ' ' in username:
-                    raise NameError(
-                        'Username cannot contain any space character.')
-            except Exception as e:
-                print(e)
-            else:
-                valid = True
-        self.__username = username
-
-    @icontract.require(
-        lambda username, email, password:
-            isinstance(username, str) & isinstance(email, str)
-            & isinstance(password, str))
-    @icontract.ensure(lambda result: result is None)
-    def __update_users(self, username, email, password):
-        with open(file='database/users.csv', mode='a',
-                  encoding='UTF8', newline='') as outfile:
-            csv.writer(outfile).writerow(
-                [self.username, email, password]
-            )
-
-    @icontract.ensure(lambda result: result is None)
-    def __create_user(self):
-        """Keep trying to add/validate new username/password."""
-        valid = False
-        while not valid:
-            self.set_username()
-            email = input('Enter your email: ')
-
-            password = None
-            verified = False
-            while password is None or not verified:
-                password = getpass.getpass(
-                    prompt='Enter your password: '
-                )
-                password_verify = getpass.getpass(
-                    prompt='Verify your password: '
-                )
-                try:
-                    if password != password_verify:
-                        raise InvalidPassword(password_verify)
-                except InvalidPassword as e1:
-                    print(e1)
-                else:
-                    verified = True
-
-            try:
-                Wishlist.__authenticator.add_user(self.__username,
-                                                  email,
-                                                  password)
-            except UsernameAlreadyExists as e2:
-                is_returned = input('Are you a returned customer? [Y/n] ')
-                if is_returned in ('y'.lower(), ''):
-                    try:
-                        if email != self.get_authenticator().user_email[
-                            self.__username
-                        ]:
-                            raise InvalidEmail(email)
-                        self.get_authenticator().login(self.__username,
-                                                       password)
-                    except (InvalidPassword, InvalidEmail) as e3:
-                        print(e3)
-                    else:
-                        valid = True
-                        print()
-                else:
-                    print(e2)
-            except Exception as e:
-                print(e)
-            else:
-                valid = True
-                print()
-                self.__update_users(
-                    self.__username,
-                    Wishlist.__authenticator.users[self.username].email,
-                    Wishlist.__authenticator.users[
-                        self.username
-                    ].password.password,
-                )
+    @property
+    def total_cost(self):
+        """Return the total cost of all parts."""
+        return self.__get_total_cost()
 
     @icontract.ensure(lambda result: isinstance(result, float) or result >= 0)
     def __get_total_cost(self):
@@ -1179,7 +1326,811 @@ class Wishlist(Partlist):
                 is_in_wishlist['Storage'] is True)
 
 
+class ShardedPartlist(Partlist):
+    """A Partlist kept as one Partlist (shard) per warehouse.
+
+    The inherited items and stock are the merged view of every shard: one
+    entry per part name, whose stock is the sum over the warehouses. It is
+    kept up to date by the methods below, so listings and lookups cost the
+    same as with a single Partlist. Stock is taken from the first warehouse
+    that has some.
+    """
+
+    def __init__(self, shards, directory=WAREHOUSES_DIRECTORY):
+        """Initialise ShardedPartlist object from a dictionary of Partlist
+        objects by warehouse name, saved to <directory>/<warehouse>.csv.
+        """
+        super().__init__()
+        self.__shards = dict(shards)
+        self.__directory = directory
+        for shard in self.__shards.values():
+            for item in shard.items:
+                self.__count(item, shard.stock[item.name])
+
+    @property
+    def shards(self):
+        """Return the shards attribute."""
+        return self.__shards
+
+    @property
+    def directory(self):
+        """Return the directory attribute."""
+        return self.__directory
+
+    def __count(self, item, quantity):
+        """Add quantity to the merged stock of item."""
+        if item.name in self.stock:
+            self.stock[item.name] += quantity
+        else:
+            self.items.append(item)
+            self.stock[item.name] = quantity
+        self.stock_changed(item.name)
+
+    def stock_by_warehouse(self, part_name):
+        """Return the stock of a part in each warehouse that lists it."""
+        return {warehouse: shard.stock[part_name]
+                for warehouse, shard in self.__shards.items()
+                if part_name in shard.stock}
+
+    def add_to_partlist(self, new_part, print_status=False, warehouse=None):
+        """Add a new item to the store of warehouse (default: the first
+        one) like Partlist.add_to_partlist().
+        """
+        if warehouse is None:
+            warehouse = next(iter(self.__shards))
+        shard = self.__shards[warehouse]
+        before = shard.stock.get(new_part.name, 0)
+        shard.add_to_partlist(new_part)
+        self.__count(new_part, shard.stock[new_part.name] - before)
+        if print_status:
+            console.print(f'Added {new_part.__str__()} '
+                          f'(x{self.stock[new_part.name]})', style='green')
+            print()
+
+    def adjust_stock(self, part_name, delta):
+        """Add delta to the stock of a part and return its new total.
+
+        Stock is taken from the warehouses in order, and put back into the
+        first warehouse that lists the part.
+        """
+        total = self.stock[part_name] + delta
+        if total < 0:
+            raise ValueError(f'Not enough of {part_name} in stock!')
+        shards = [shard for shard in self.__shards.values()
+                  if part_name in shard.stock]
+        if delta > 0:
+            shards[0].adjust_stock(part_name, delta)
+        for shard in shards:
+            if delta >= 0:
+                break
+            taken = min(shard.stock[part_name], -delta)
+            shard.adjust_stock(part_name, -taken)
+            delta += taken
+        self.stock[part_name] = total
+        self.stock_changed(part_name)
+        return total
+
+    def set_price(self, part_name, price):
+        """Change the price of a part in every warehouse that lists it."""
+        for shard in self.__shards.values():
+            if part_name in shard.stock:
+                shard.set_price(part_name, price)
+        return super().set_price(part_name, price)
+
+    def pop_part(self, part_name):
+        """Return a PartLine object or None.
+
+        Remove a part from every warehouse, with all of its stock.
+        """
+        removed = super().pop_part(part_name)
+        if removed is not None:
+            for shard in self.__shards.values():
+                shard.pop_part(part_name)
+        return removed
+
+    def remove_part_using_position(self, part_position):
+        """Remove the part at part_position from every warehouse."""
+        if part_position < len(self):
+            self.remove_part_using_name(self.items[part_position].name)
+        else:
+            print(f'{part_position} out of range 1 - {len(self)}')
+
+    def save_to_csv(self, filename=None, directory=None, workers=None):
+        """Save each shard to <directory>/<warehouse>.csv.
+
+        Default to the directory the shards were read from; filename is
+        not used, there is one file per warehouse. The rows are formatted
+        and written by up to workers processes, one per core by default.
+        """
+        directory = directory or self.__directory
+        warehouses = list(self.__shards)
+        workers = min(workers or os.cpu_count() or 1, len(warehouses))
+        if workers <= 1:
+            for warehouse in warehouses:
+                self.__shards[warehouse].save_to_csv(warehouse, directory)
+            return
+        # Formatting the rows holds the GIL, so it is done by processes.
+        rows = [[item.to_values() for item in shard.items]
+                for shard in self.__shards.values()]
+        stocks = [dict(shard.stock) for shard in self.__shards.values()]
+        with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+            list(executor.map(self.save_shard, rows, stocks, warehouses,
+                              [directory] * len(warehouses)))
+
+    @staticmethod
+    def save_shard(rows, stock, warehouse, directory):
+        """Write the to_values() rows and the stock of a shard to
+        <directory>/<warehouse>.csv; run by the saving processes.
+        """
+        Partlist.from_values(rows, stock).save_to_csv(warehouse, directory)
+
+    @staticmethod
+    def load_shard(warehouse, directory):
+        """Return the to_values() rows and the stock of the cached Partlist
+        of <directory>/<warehouse>.csv; run by the loading processes.
+        """
+        partlist = Partlist.read_cached(warehouse, directory)
+        return [item.to_values() for item in partlist.items], partlist.stock
+
+    @classmethod
+    def read_shards(cls, directory=WAREHOUSES_DIRECTORY, warehouses=None,
+                    workers=None):
+        """Return a new ShardedPartlist of the csv files of directory, one
+        warehouse per file, in the order of warehouses (default: every
+        file, by name).
+
+        The shards are parsed (or read from their cache) by up to workers
+        processes, one per core by default.
+        """
+        if warehouses is None:
+            warehouses = sorted(filename[:-4]
+                                for filename in os.listdir(directory)
+                                if filename.endswith('.csv'))
+        workers = min(workers or os.cpu_count() or 1, len(warehouses))
+        if workers <= 1:
+            loaded = [cls.load_shard(warehouse, directory)
+                      for warehouse in warehouses]
+        else:
+            with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+                loaded = list(executor.map(cls.load_shard, warehouses,
+                                           [directory] * len(warehouses)))
+        return cls({warehouse: Partlist.from_values(*values)
+                    for warehouse, values in zip(warehouses, loaded)},
+                   directory)
+
+    @staticmethod
+    def split(partlist, warehouses, directory=WAREHOUSES_DIRECTORY):
+        """Write the parts of partlist to <directory>/<warehouse>.csv,
+        spreading the stock of each part evenly over the warehouses.
+        """
+        os.makedirs(directory, exist_ok=True)
+        shards = {warehouse: Partlist() for warehouse in warehouses}
+        for item in partlist.items:
+            quantity = partlist.stock[item.name]
+            for index, shard in enumerate(shards.values()):
+                shard.items.append(item)
+                shard.stock[item.name] = (quantity // len(shards) +
+                                          (index < quantity % len(shards)))
+        for warehouse, shard in shards.items():
+            shard.save_to_csv(warehouse, directory)
+
+
+class PartitionStock(collections.abc.MutableMapping):
+    """The stock dictionary of a PartitionedPartlist.
+
+    Looking up or setting a part loads the partition of its type first.
+    The stock dictionary of the PartitionedPartlist is looked up on each
+    use, so that one given to use_stock() is followed.
+    """
+
+    def __init__(self, partlist):
+        """Initialise PartitionStock object over the stock dictionary of the
+        partitions of partlist loaded so far.
+        """
+        self.__partlist = partlist
+
+    def __getitem__(self, part_name):
+        self.__partlist.load_part(part_name)
+        return self.__partlist.loaded_stock[part_name]
+
+    def __setitem__(self, part_name, stock):
+        # Otherwise loading the partition later would undo it.
+        self.__partlist.load_part(part_name)
+        self.__partlist.loaded_stock[part_name] = stock
+
+    def __delitem__(self, part_name):
+        self.__partlist.load_part(part_name)
+        del self.__partlist.loaded_stock[part_name]
+
+    def __iter__(self):
+        self.__partlist.load()
+        return iter(self.__partlist.loaded_stock)
+
+    def __len__(self):
+        self.__partlist.load()
+        return len(self.__partlist.loaded_stock)
+
+
+class PartitionedPartlist(Partlist):
+    """A Partlist stored as one partition per part type.
+
+    <directory>/<type>.csv holds the parts of a type and <type>.index
+    their names, one per line. Only the indexes are read at first; the
+    parts of a type are read the first time one of them is looked up or
+    added. Listing every part loads every partition.
+    """
+
+    # The part types, by class name, in the order of the Part Types menu.
+    PART_TYPES = ('CPU', 'GraphicsCard', 'Memory', 'Storage')
+
+    def __init__(self, directory=PARTITIONS_DIRECTORY):
+        """Initialise PartitionedPartlist object from the index files of
+        directory. A partition without an index file is loaded at once.
+        """
+        super().__init__()
+        self.__directory = directory
+        self.__stock = PartitionStock(self)
+        self.__loaded = set()
+        # The part type of every part name, loaded or not.
+        self.__index = {}
+        for part_type in self.PART_TYPES:
+            try:
+                with open(file=f'{directory}/{part_type}.index', mode='r',
+                          encoding='UTF8') as infile:
+                    for line in infile:
+                        self.__index[line.rstrip('\n')] = part_type
+            except FileNotFoundError:
+                self.load(part_type)
+
+    @property
+    def directory(self):
+        """Return the directory attribute."""
+        return self.__directory
+
+    @property
+    def loaded(self):
+        """Return the set of part types loaded so far."""
+        return self.__loaded
+
+    @property
+    def items(self):
+        """Return the items attribute, once every partition is loaded."""
+        self.load()
+        return super().items
+
+    @property
+    def stock(self):
+        """Return the stock attribute, a PartitionStock."""
+        return self.__stock
+
+    @property
+    def loaded_stock(self):
+        """Return the stock dictionary of the partitions loaded so far."""
+        return super().stock
+
+    def load(self, part_type=None):
+        """Read the partition of part_type (default: every partition) if
+        it has not been read yet.
+        """
+        if part_type is None:
+            for part_type in self.PART_TYPES:
+                self.load(part_type)
+        elif part_type not in self.__loaded:
+            self.__loaded.add(part_type)
+            if os.path.exists(f'{self.__directory}/{part_type}.csv'):
+                partition = Partlist.read_cached(part_type, self.__directory)
+                super().items.extend(partition.items)
+                super().stock.update(partition.stock)
+                for item in partition.items:
+                    self.__index[item.name] = part_type
+
+    def load_part(self, part_name):
+        """Read the partition that lists part_name, if any."""
+        part_type = self.__index.get(part_name)
+        if part_type is not None:
+            self.load(part_type)
+
+    def partition(self, part_type):
+        """Return a new Partlist of the parts of part_type."""
+        self.load(part_type)
+        partlist = Partlist()
+        for item in super().items:
+            if type(item).__name__ == part_type:
+                partlist.items.append(item)
+                partlist.stock[item.name] = super().stock[item.name]
+        return partlist
+
+    def get(self, part_name):
+        """Return the part named part_name, or None."""
+        self.load_part(part_name)
+        return super().get(part_name)
+
+    def add_to_partlist(self, new_part, print_status=False):
+        """Add a new item to the partition of its type like
+        Partlist.add_to_partlist().
+        """
+        self.load_part(new_part.name)
+        self.load(type(new_part).__name__)
+        super().add_to_partlist(new_part, print_status)
+        self.__index.setdefault(new_part.name, type(new_part).__name__)
+
+    def adjust_stock(self, part_name, delta):
+        """Add delta to the stock of a part and return its new stock."""
+        self.load_part(part_name)
+        return super().adjust_stock(part_name, delta)
+
+    def pop_part(self, part_name):
+        """Return a PartLine object or None.
+
+        Remove a part and all of its stock from its partition.
+        """
+        self.load_part(part_name)
+        items = super().items
+        for index, item in enumerate(items):
+            if item.name == part_name:
+                del items[index]
+                self.__index.pop(part_name, None)
+                removed = PartLine(item, super().stock.pop(part_name))
+                self.stock_changed(part_name)
+                return removed
+        return None
+
+    def remove_part_using_position(self, part_position):
+        """Remove the part at part_position from its partition."""
+        if part_position < len(self):
+            self.remove_part_using_name(self.items[part_position].name)
+        else:
+            print(f'{part_position} out of range 1 - {len(self)}')
+
+    def save_to_csv(self, filename=None, directory=None):
+        """Save every loaded partition to <directory>/<type>.csv and its
+        index to <directory>/<type>.index.
+
+        Default to the directory the partitions were read from; filename
+        is not used. Partitions that were never loaded are left as they
+        are.
+        """
+        directory = directory or self.__directory
+        os.makedirs(directory, exist_ok=True)
+        for part_type in self.__loaded:
+            self.partition(part_type).save_to_csv(part_type, directory)
+            with open(file=f'{directory}/{part_type}.index', mode='w',
+                      encoding='UTF8') as outfile:
+                for name, name_type in self.__index.items():
+                    if name_type == part_type:
+                        outfile.write(name + '\n')
+
+    @classmethod
+    def split(cls, partlist, directory=PARTITIONS_DIRECTORY):
+        """Write the parts of partlist to one partition per part type."""
+        partitioned = cls(directory)
+        partitioned.load()
+        for item in partlist.items:
+            partitioned.add_to_partlist(item)
+            partitioned.stock[item.name] = partlist.stock[item.name]
+        partitioned.save_to_csv()
+
+
+# ------------------------------- Service Layer -------------------------------
+# The outcome of a purchase.
+Receipt = collections.namedtuple(
+    'Receipt', ['username', 'filename', 'lines', 'total'])
+
+
+class ShopService:
+    """The computer shop without a user interface.
+
+    Every call takes plain arguments and returns its result (or raises an
+    exception) instead of reading input or printing anything, so the shop
+    can be driven by batch jobs and other services.
+    The CommandPrompt is a front end over one ShopService object.
+    """
+
+    def __init__(self, partlist=None, authenticator=None, aggregates=None,
+                 ledger=None, forecast=None, prices=None, wishlists=None):
+        """Initialise ShopService object.
+
+        Default to the parts in database.csv, the Authenticator shared by
+        every Wishlist, the running sales totals, the demand forecast in
+        database/forecast.bin, the price history in database/prices.bin
+        and the wishlists in database/wishlists.db. If a StockLedger is
+        given, every stock movement is recorded in it, once it has been
+        brought in line with the stock of the parts.
+        """
+        if partlist is None:
+            partlist = Partlist.read_cached()
+        if authenticator is None:
+            authenticator = Wishlist.get_authenticator()
+        if aggregates is None:
+            aggregates = sales_aggregates
+        if forecast is None:
+            forecast = demand_forecast
+        if prices is None:
+            prices = part_prices
+        if wishlists is None:
+            wishlists = saved_wishlists
+        self.__partlist = partlist
+        self.__authenticator = authenticator
+        self.__aggregates = aggregates
+        self.__forecast = forecast
+        self.__prices = prices
+        self.__wishlists = wishlists
+        # The Wishlist objects in use, by username.
+        self.__open = {}
+        # The units of each open Wishlist that are out of the stock which
+        # outlives the process, by username.
+        self.__held = {}
+        self.__ledger = ledger
+        if ledger is not None:
+            ledger.sync(partlist.stock)
+        self.__reorder = None
+
+    @property
+    def partlist(self):
+        """Return the Partlist object."""
+        return self.__partlist
+
+    @property
+    def authenticator(self):
+        """Return the Authenticator object."""
+        return self.__authenticator
+
+    @property
+    def forecast(self):
+        """Return the DemandForecast object."""
+        return self.__forecast
+
+    @property
+    def prices(self):
+        """Return the PriceHistory object."""
+        return self.__prices
+
+    @property
+    def wishlists(self):
+        """Return the WishlistStore object."""
+        return self.__wishlists
+
+    @property
+    def ledger(self):
+        """Return the StockLedger object, or None."""
+        return self.__ledger
+
+    @property
+    def reorder(self):
+        """Return the ReorderQueue of the parts in store.
+
+        It is made on first use, which reads every part once; from then on
+        it follows each change of stock. A stock shared with other
+        processes is read again by each ReorderQueue.urgent() call.
+        """
+        if self.__reorder is None:
+            self.__reorder = ReorderQueue()
+            self.__reorder.track(self.__partlist)
+        return self.__reorder
+
+    def __record(self, kind, part_name, quantity):
+        """Record a stock movement in the ledger, if there is one."""
+        if self.__ledger is not None:
+            self.__ledger.record(kind, part_name, quantity)
+
+    # Catalog
+    @icontract.ensure(lambda result: isinstance(result, list))
+    def list_parts(self):
+        """Return a list of PartLine objects, one per part in store."""
+        stock = self.__partlist.stock
+        return [PartLine(item, stock[item.name])
+                for item in self.__partlist.items]
+
+    @icontract.require(lambda part_name: isinstance(part_name, str))
+    @icontract.ensure(lambda result: isinstance(result, PartLine))
+    def find_part(self, part_name):
+        """Return the PartLine of a part in store, found by its name.
+
+        Raise LookupError if there is no part with that name.
+        """
+        item = self.__partlist.get(part_name)
+        if item is None:
+            raise LookupError(f'Could not find {part_name}!')
+        return PartLine(item, self.__partlist.stock[part_name])
+
+    @icontract.require(lambda new_part: isinstance(new_part, ComputerPart))
+    @icontract.ensure(lambda result: isinstance(result, PartLine))
+    def add_part(self, new_part):
+        """Add a part to the store and return its PartLine.
+
+        If the part is already in store, its stock is incremented by 1.
+        Raise ValueError if a different part of the same type already has
+        that name.
+        """
+        item = self.__partlist.get(new_part.name)
+        if (type(item) is type(new_part) and
+                not new_part.equals(item)):
+            raise ValueError(f'Invalid {type(item).__name__}! '
+                             f'Try again with different arguments.')
+        before = self.__partlist.stock.get(new_part.name, 0)
+        self.__partlist.add_to_partlist(new_part)
+        stock = self.__partlist.stock[new_part.name]
+        self.__record(stock_ledger.RESTOCK, new_part.name, stock - before)
+        if item is None:
+            self.__prices.record(new_part.name, new_part.price)
+        return PartLine(new_part, stock)
+
+    @icontract.require(lambda part_name: isinstance(part_name, str))
+    @icontract.require(
+        lambda price: isinstance(price, (int, float)) & (price > 0))
+    @icontract.ensure(lambda result: isinstance(result, PartLine))
+    def update_price(self, part_name, price):
+        """Change the price of a part in store, keep the change in the
+        price history and return its PartLine.
+
+        Raise LookupError if there is no part with that name.
+        """
+        old = self.find_part(part_name).part.price
+        item = self.__partlist.set_price(part_name, price)
+        # The first change of a part also keeps the price it had.
+        if self.__prices.price_at(part_name) is None:
+            self.__prices.record(part_name, old, FIRST_DAY)
+        self.__prices.record(part_name, price)
+        return PartLine(item, self.__partlist.stock[part_name])
+
+    @icontract.require(lambda k: isinstance(k, int) & (k >= 0))
+    @icontract.ensure(lambda result: isinstance(result, list))
+    def reorder_candidates(self, k=REORDER_SHOWN):
+        """Return the Candidate objects of the k parts closest to running
+        out, relative to their reorder thresholds.
+        """
+        return self.reorder.urgent(k)
+
+    @icontract.ensure(lambda result: isinstance(result, dict))
+    def days_until_stockout(self):
+        """Return a dictionary of the days the stock of every part in store
+        is forecast to last (math.inf for a part that is not selling).
+        """
+        return self.__forecast.days_until_stockout(self.__partlist.stock)
+
+    @icontract.ensure(lambda result: result is None)
+    def save_catalog(self):
+        """Save the Partlist to the CSV file named "database.csv", or to
+        one file per warehouse for a ShardedPartlist, and compact the price
+        history.
+
+        Every unit of an open Wishlist is then held in the saved catalog.
+        """
+        self.__partlist.save_to_csv()
+        self.__prices.save()
+        for wishlist in self.__open.values():
+            self.__held[wishlist.username] = dict(wishlist.stock)
+            self.__save_wishlist(wishlist)
+
+    # Authentication
+    @staticmethod
+    @icontract.require(lambda username: isinstance(username, str))
+    @icontract.ensure(lambda result: result is None)
+    def check_username(username):
+        """Raise an exception if the username cannot own a Wishlist."""
+        if username == '':
+            raise ValueError('Cannot create a Wishlist with an empty name.')
+        elif ' ' in username:
+            raise NameError('Username cannot contain any space character.')
+
+    @icontract.require(
+        lambda username, email, password:
+            isinstance(username, str) & isinstance(email, str)
+            & isinstance(password, str))
+    def sign_up(self, username, email, password):
+        """Register a new customer, save them to users.csv and return them.
+
+        Raise the exception of the Authenticator if the details are not
+        accepted (e.g. UsernameAlreadyExists).
+        """
+        self.check_username(username)
+        self.__authenticator.add_user(username, email, password)
+        self.__authenticator.save_user(username)
+        return self.__authenticator.users[username]
+
+    @icontract.require(
+        lambda username, password:
+            isinstance(username, str) & isinstance(password, str))
+    def log_in(self, username, password, email=None, source=None):
+        """Log a customer in and return them.
+
+        If an email is given, it must be the one of that customer,
+        otherwise InvalidEmail is raised. source identifies where the
+        login comes from for throttling (see throttle.py).
+        """
+        if (email is not None and
+                email != self.__authenticator.user_email.get(username)):
+            raise InvalidEmail(email)
+        self.__authenticator.login(username, password, source)
+        return self.__authenticator.users[username]
+
+    @icontract.require(lambda username: isinstance(username, str))
+    @icontract.ensure(lambda result: result is None)
+    def log_out(self, username):
+        """Log a customer out."""
+        self.__authenticator.logout(username)
+
+    # Wishlist
+    @icontract.require(lambda username: isinstance(username, str))
+    @icontract.ensure(lambda result: isinstance(result, Wishlist))
+    def open_wishlist(self, username):
+        """Return the Wishlist of a customer.
+
+        A customer who left without closing their Wishlist gets it back.
+        The units it held in a shared stock or a saved catalog are still
+        out of the stock; the others are held from the store again, as
+        many as are left in stock. Otherwise the Wishlist is new and empty.
+        """
+        wishlist = self.__open.get(username)
+        if wishlist is not None:
+            return wishlist
+        wishlist = self.__open[username] = Wishlist(username)
+        saved = self.__wishlists.get(username)
+        held = self.__wishlists.held(username)
+        for part_name, count in saved.items():
+            part = self.__partlist.get(part_name)
+            if part is None:
+                continue
+            quantity = held.get(part_name, 0)
+            missing = min(count - quantity, self.__partlist.stock[part_name])
+            if missing > 0:
+                self.__partlist.adjust_stock(part_name, -missing)
+                self.__record(stock_ledger.HOLD, part_name, missing)
+                quantity += missing
+            if quantity > 0:
+                wishlist.items.append(part)
+                wishlist.stock[part_name] = quantity
+        self.__held[username] = held
+        if saved != wishlist.stock:
+            self.__save_wishlist(wishlist)
+        return wishlist
+
+    def __save_wishlist(self, wishlist):
+        """Write the part counts of a Wishlist, and how many of them are
+        held, to the WishlistStore.
+        """
+        username = wishlist.username
+        if self.__partlist.shares_stock:
+            # Each hold was taken out of the shared stock at once.
+            held = dict(wishlist.stock)
+        else:
+            held = {part_name: min(quantity, wishlist.stock[part_name])
+                    for part_name, quantity
+                    in self.__held.get(username, {}).items()
+                    if part_name in wishlist.stock}
+        self.__held[username] = held
+        self.__wishlists.put(username, wishlist.stock, held)
+
+    def __forget_wishlist(self, wishlist):
+        """Delete the record of an emptied Wishlist."""
+        self.__open.pop(wishlist.username, None)
+        self.__held.pop(wishlist.username, None)
+        self.__wishlists.delete(wishlist.username)
+
+    @icontract.require(
+        lambda wishlist, part_name:
+            isinstance(wishlist, Wishlist) & isinstance(part_name, str))
+    @icontract.ensure(lambda result: isinstance(result, PartLine))
+    def add_to_wishlist(self, wishlist, part_name):
+        """Move one unit of a part from the store to a Wishlist, and write
+        the record of the Wishlist.
+
+        Return the PartLine of that part in the Wishlist.
+        Raise LookupError if the part is not in store and ValueError if it
+        is out of stock.
+        """
+        part = self.find_part(part_name).part
+        # Decrement that item in Partlist.
+        self.__partlist.adjust_stock(part_name, -1)
+        self.__record(stock_ledger.HOLD, part_name, 1)
+        if part_name in wishlist.stock:
+            # Increment that item in Wishlist if it is there.
+            wishlist.stock[part_name] += 1
+        else:
+            # Otherwise add that new item and set its number to 1.
+            wishlist.items.append(part)
+            wishlist.stock[part_name] = 1
+        self.__save_wishlist(wishlist)
+        return PartLine(part, wishlist.stock[part_name])
+
+    @icontract.require(
+        lambda wishlist, part_name:
+            isinstance(wishlist, Wishlist) & isinstance(part_name, str))
+    @icontract.ensure(lambda result: isinstance(result, PartLine))
+    def remove_from_wishlist(self, wishlist, part_name):
+        """Remove a part from a Wishlist and return its stock to the store.
+        The record of the Wishlist is written.
+
+        Return the PartLine that was removed.
+        Raise LookupError if the part is not in the Wishlist.
+        """
+        removed = None
+        if part_name != '':
+            removed = wishlist.pop_part(part_name)
+        if removed is None:
+            raise LookupError(f'Could not find {part_name}!')
+        self.__save_wishlist(wishlist)
+        if part_name in self.__partlist.stock:
+            self.__partlist.adjust_stock(part_name, removed.quantity)
+            self.__record(stock_ledger.RELEASE, part_name, removed.quantity)
+        return removed
+
+    # Checkout
+    @icontract.require(lambda wishlist: isinstance(wishlist, Wishlist))
+    @icontract.ensure(lambda result: isinstance(result, Receipt))
+    def purchase(self, wishlist):
+        """Purchase every part of a Wishlist and return the Receipt.
+
+        The Wishlist is saved to a CSV file named after the customer, for
+        example "Gary.csv", its order is added to the running sales totals
+        and the demand forecast, and the Wishlist is emptied and its
+        record deleted.
+        """
+        username = wishlist.username
+        filename = 'receipts/' + username
+        wishlist.save_to_csv(filename=filename)
+        lines = [PartLine(item, wishlist.stock[item.name])
+                 for item in wishlist.items]
+        self.__aggregates.record_order(
+            username,
+            ((line.part.name, type(line.part).__name__, line.part.price,
+              line.quantity) for line in lines),
+        )
+        self.__forecast.record_order(
+            (line.part.name, line.quantity) for line in lines)
+        for line in lines:
+            self.__record(stock_ledger.PURCHASE, line.part.name,
+                          line.quantity)
+        receipt = Receipt(username, f'database/{filename}.csv', lines,
+                          wishlist.total_cost)
+        # Remove all items from Wishlist. Deleter is called.
+        del wishlist.items
+        del wishlist.stock
+        self.__forget_wishlist(wishlist)
+        return receipt
+
+    @icontract.require(lambda wishlist: isinstance(wishlist, Wishlist))
+    @icontract.ensure(lambda result: result is None)
+    def close_wishlist(self, wishlist):
+        """Empty a Wishlist, add its stock back into the store and delete
+        its record.
+        """
+        for item in wishlist.items:
+            self.__partlist.adjust_stock(item.name,
+                                         wishlist.stock[item.name])
+            self.__record(stock_ledger.RELEASE, item.name,
+                          wishlist.stock[item.name])
+        # Remove all items from Wishlist. Deleter is called.
+        del wishlist.items
+        del wishlist.stock
+        self.__forget_wishlist(wishlist)
+
+
 # ------------------------------- User Interface ------------------------------
+def input(prompt=''):
+    """Write what the output holds, then read a line like the built-in
+    input().
+    """
+    console.flush()
+    return builtins.input(prompt)
+
+
+def print_alert(alert):
+    """Print a reorder.Alert of a part crossing its reorder threshold."""
+    if alert.low:
+        console.print(f'Low stock: {alert.part_name} (x{alert.stock}, '
+                      f'reorder at {alert.threshold})', style='red')
+    else:
+        console.print(f'Restocked: {alert.part_name} (x{alert.stock})',
+                      style='green')
+
+
+def read_password(prompt):
+    """Write what the output holds, then read a password without echo."""
+    console.flush()
+    return getpass.getpass(prompt=prompt)
+
+
 @icontract.invariant(
     lambda self:
         (isinstance(self.partlist, Partlist))
@@ -1193,10 +2144,15 @@ class CommandPrompt:
 
     __menu = None
 
-    def __init__(self):
-        """Initialise CommandPrompt object."""
+    def __init__(self, service=None):
+        """Initialise CommandPrompt object.
+
+        Default to a ShopService over the parts in database.csv.
+        """
         self.__wishlist = None
-        self.__read_from_csv()
+        if service is None:
+            service = ShopService()
+        self.__service = service
         if CommandPrompt.__menu is None:
             CommandPrompt.__set_menu()
 
@@ -1243,7 +2199,7 @@ class CommandPrompt:
         # A defaultdict type variable to store three types of menus.
         cls.__menu = collections.defaultdict(list)
 
-        # Add four options for Main Menu.
+        # Add five options for Main Menu.
         cls.__menu['Main Menu'].append(
             convert_class_name(NewWishlist(CommandPrompt(), False)),
         )
@@ -1253,6 +2209,9 @@ class CommandPrompt:
         cls.__menu['Main Menu'].append(
             convert_class_name(AddPartToDatabase(CommandPrompt(), False)),
         )
+        cls.__menu['Main Menu'].append(
+            convert_class_name(LowStock(CommandPrompt(), False)),
+        )
         cls.__menu['Main Menu'].append(
             convert_class_name(Close(CommandPrompt(), execute=False)),
         )
@@ -1281,10 +2240,15 @@ class CommandPrompt:
         cls.__menu['Part Types'].append('Storage')
         cls.__menu['Part Types'].append('Back')
 
+    @property
+    def service(self):
+        """Return the ShopService object."""
+        return self.__service
+
     @property
     def partlist(self):
         """Return the Partlist object."""
-        return self.__partlist
+        return self.__service.partlist
 
     @property
     def wishlist(self):
@@ -1323,41 +2287,6 @@ class CommandPrompt:
                   f'1 - {limit}.\n')
         return option
 
-    @icontract.ensure(lambda result: result is None)
-    def __read_from_csv(self):
-        """Automatically invoked when a CommandPrompt object is constructed.
-
-        By invoking this method, the CommandPrompt class should automatically
-        construct a part list and fill it with items that it reads from the
-        CSV file named "database.csv".
-        """
-        self.__partlist = Partlist()
-        with open(file='database/database.csv', mode='r',
-                  encoding='UTF8', newline='') as infile:
-            csv_lists = list(csv.reader(infile, delimiter=',', quotechar='|'))
-
-            for csv_list in csv_lists:
-                if csv_list[0] == ('CPU'):
-                    # Construct a CPU object.
-                    self.partlist.add_to_partlist(
-                        CPU.parse(csv_list)
-                    )
-                elif csv_list[0] == ('GraphicsCard'):
-                    # Construct a GraphicsCard object.
-                    self.partlist.add_to_partlist(
-                        GraphicsCard.parse(csv_list)
-                    )
-                elif csv_list[0] == ('Memory'):
-                    # Construct a Memory object.
-                    self.partlist.add_to_partlist(
-                        Memory.parse(csv_list)
-                    )
-                elif csv_list[0] == ('Storage'):
-                    # Construct a Storage object.
-                    self.partlist.add_to_partlist(
-                        Storage.parse(csv_list)
-                    )
-
 
 @icontract.invariant(lambda self: isinstance(self.cmd, CommandPrompt))
 class Question:
@@ -1378,14 +2307,28 @@ class Question:
 
 
 class ListDatabase(Question):
-    """Display the Partlist object."""
+    """Display the Partlist object.
+
+    A PartitionedPartlist is displayed one part type at a time, chosen
+    from the Part Types menu, so that only that partition is loaded.
+    """
 
     def __init__(self, cmd, execute=True):
         """Only execute __init__ method when the 'execute' argument is True."""
         if execute:
             super().__init__(cmd)
+            partlist = self.cmd.partlist
+            if isinstance(partlist, PartitionedPartlist):
+                option = None
+                while option is None or option not in range(1, 6):
+                    CommandPrompt.display_menu('Part Types')
+                    option = self.cmd.prompt_for_option(limit=6)
+                if option == 5:
+                    return
+                partlist = partlist.partition(
+                    PartitionedPartlist.PART_TYPES[option - 1])
             # The Partlist __str__() method is invoked.
-            print(self.cmd.partlist)
+            print(partlist)
 
 
 class AddPartToDatabase(Question):
@@ -1432,38 +2375,43 @@ class AddPartToDatabase(Question):
                         else:
                             new_part = Storage.input()
 
-                        added = False
-                        partlist = self.cmd.partlist
-                        parts_of_new_part_type = (
-                            item for item in partlist.items
-                            if type(new_part).__name__ == type(item).__name__
+                        added = self.cmd.service.add_part(new_part)
+                        console.print(
+                            f'Added {added.part.__str__()} '
+                            f'(x{added.quantity})',
+                            style='green',
                         )
-                        for item in parts_of_new_part_type:
-                            if item.name == new_part.name:
-                                if not new_part.equals(item):
-                                    console.print(
-                                        'Invalid ' + type(item).__name__ + '!',
-                                        'Try again with different arguments.',
-                                        end='\n\n',
-                                        style='red',
-                                    )
-                                else:
-                                    partlist.add_to_partlist(
-                                        new_part, print_status=True
-                                    )
-                                added = True
-
-                        if not added:
-                            partlist.add_to_partlist(
-                                new_part, print_status=True
-                            )
+                        print()
                     except Exception as e:
                         console.print(type(e).__name__ + ':', e, end='\n\n',
                                       style='red')
 
 
+class LowStock(Question):
+    """Display the parts closest to running out, relative to their reorder
+    thresholds, most urgent first, with the days their stock is forecast
+    to last.
+    """
+
+    def __init__(self, cmd, execute=True):
+        """Only execute __init__ method when the 'execute' argument is True."""
+        if execute:
+            super().__init__(cmd)
+            print('---- Low Stock ----')
+            days = self.cmd.service.days_until_stockout()
+            for candidate in self.cmd.service.reorder_candidates():
+                stock = (f'x{candidate.stock}' if candidate.stock
+                         else 'OUT OF STOCK')
+                left = days.get(candidate.part_name, math.inf)
+                forecast = ('' if math.isinf(left) or not candidate.stock
+                            else f', ~{left:.0f} days left')
+                print(f'{candidate.part_name}: {stock} '
+                      f'(reorder at {candidate.threshold}{forecast})')
+            print('--------------------')
+
+
 class Close(Question):
-    """Called when user chooses 4 in Main Menu or 5 in Wishlist Menu.
+    """Called when user chooses 5 in Main Menu or 5 in Wishlist Menu.
 
     Before closing the main menu (and ending the program), the Partlist
     should be saved to a CSV file called "database.csv".
@@ -1476,19 +2424,13 @@ class Close(Question):
         """Only execute __init__ method when the 'execute' argument is True."""
         if execute:
             super().__init__(cmd)
-            partlist = self.cmd.partlist
-            wishlist = self.cmd.wishlist
             if current_menu == 'Main Menu':
                 # Save Partlist to a csv file.
-                partlist.save_to_csv()
+                self.cmd.service.save_catalog()
                 print('\nSee you again soon.')
             else:
-                # Add stock back into Partlist.
-                for item in wishlist.items:
-                    partlist.stock[item.name] += wishlist.stock[item.name]
-                # Remove all items from Wishlist. Deleter is called.
-                del wishlist.items
-                del wishlist.stock
+                # Add stock back into Partlist and empty the Wishlist.
+                self.cmd.service.close_wishlist(self.cmd.wishlist)
 
 
 class NewWishlist(Question):
@@ -1502,7 +2444,11 @@ class NewWishlist(Question):
         if execute:
             super().__init__(cmd)
             if self.cmd.wishlist is None:
-                self.cmd.wishlist = Wishlist()
+                self.cmd.wishlist = self.__create_wishlist()
+                if len(self.cmd.wishlist) > 0:
+                    console.print('Welcome back! Your Wishlist was restored '
+                                  f'({len(self.cmd.wishlist)} parts).',
+                                  style='green')
                 done = False
                 while not done:
                     # The menu is kept repeating until the user enters 5.
@@ -1513,11 +2459,10 @@ class NewWishlist(Question):
 
                     # Now we have a valid option between 1 and 5.
                     if option in range(1, 6):
-                        password = getpass.getpass(
-                            prompt='Please enter your password: '
-                        )
+                        password = read_password(
+                            'Please enter your password: ')
                         try:
-                            self.cmd.wishlist.get_authenticator().login(
+                            self.cmd.service.log_in(
                                 self.cmd.wishlist.username,
                                 password,
                             )
@@ -1537,13 +2482,74 @@ class NewWishlist(Question):
                                 Close(cmd, 'Wishlist')
                                 done = True
                             print()
-                            self.cmd.wishlist.get_authenticator().logout(
+                            self.cmd.service.log_out(
                                 self.cmd.wishlist.username,
-                                password,
                             )
                             if option in (4, 5):
                                 self.cmd.wishlist = None
 
+    @icontract.ensure(lambda result: isinstance(result, str) & (result != ''))
+    def __input_username(self):
+        """Return a valid username by keeping prompting the user."""
+        username = None
+        valid = False
+        while username is None or not valid:
+            try:
+                username = input('Enter your username: ')
+                ShopService.check_username(username)
+            except Exception as e:
+                print(e)
+            else:
+                valid = True
+        return username
+
+    @icontract.ensure(lambda result: isinstance(result, Wishlist))
+    def __create_wishlist(self):
+        """Keep trying to add/validate new username/password.
+
+        Return the Wishlist of the new (or returned) customer.
+        """
+        service = self.cmd.service
+        valid = False
+        while not valid:
+            username = self.__input_username()
+            email = input('Enter your email: ')
+
+            password = None
+            verified = False
+            while password is None or not verified:
+                password = read_password('Enter your password: ')
+                password_verify = read_password('Verify your password: ')
+                try:
+                    if password != password_verify:
+                        raise InvalidPassword(password_verify)
+                except InvalidPassword as e1:
+                    print(e1)
+                else:
+                    verified = True
+
+            try:
+                service.sign_up(username, email, password)
+            except UsernameAlreadyExists as e2:
+                is_returned = input('Are you a returned customer? [Y/n] ')
+                if is_returned in ('y'.lower(), ''):
+                    try:
+                        service.log_in(username, password, email)
+                    except (InvalidPassword, InvalidEmail,
+                            TooManyAttempts) as e3:
+                        print(e3)
+                    else:
+                        valid = True
+                        print()
+                else:
+                    print(e2)
+            except Exception as e:
+                print(e)
+            else:
+                valid = True
+                print()
+        return service.open_wishlist(username)
+
     @icontract.require(lambda part_name: isinstance(part_name, str))
     @icontract.ensure(lambda result: isinstance(result, bool))
     def look_up_partlist(self, part_name):
@@ -1599,30 +2605,14 @@ class AddFromDatabase(NewWishlist):
             ListDatabase(cmd)
             part_name = input('Enter the name of the part to add: ')
             if self.look_up_partlist(part_name):
-                partlist = self.cmd.partlist
-                wishlist = self.cmd.wishlist
                 # The part_name is available in stock.
-                for partlist_item in partlist.items:
-                    if partlist_item.name == part_name:
-                        # Decrement that item in Partlist.
-                        partlist.stock[part_name] -= 1
-                        try:
-                            wishlist.stock[part_name]
-                        except KeyError:
-                            # If the item is not in Wishlist:
-                            # 1. Add that new item to Wishlist.
-                            # 2. Set its number in Wishlist to 1.
-                            wishlist.items.append(partlist_item)
-                            wishlist.stock[part_name] = 1
-                        else:
-                            # Increment that item in Wishlist if it is there.
-                            wishlist.stock[part_name] += 1
-                        # Display result.
-                        stock = wishlist.stock[part_name]
-                        console.print(
-                            f'Added {partlist_item.__str__()} (x{stock})',
-                            style='green',
-                        )
+                added = self.cmd.service.add_to_wishlist(self.cmd.wishlist,
+                                                         part_name)
+                # Display result.
+                console.print(
+                    f'Added {added.part.__str__()} (x{added.quantity})',
+                    style='green',
+                )
 
 
 class RemoveFromWishlist(NewWishlist):
@@ -1638,10 +2628,12 @@ class RemoveFromWishlist(NewWishlist):
             super().__init__(cmd)
             part_name = input('Enter the name of the part to remove: ')
             if self.look_up_wishlist(part_name):
-                self.cmd.wishlist.remove_part_using_name(
-                    part_name
+                removed = self.cmd.service.remove_from_wishlist(
+                    self.cmd.wishlist,
+                    part_name,
                 )
-                self.cmd.partlist.stock[part_name] += 1
+                console.print(f'Removed {part_name} (x{removed.quantity})',
+                              style='green')
 
 
 class ShowWishlist(NewWishlist):
@@ -1666,16 +2658,144 @@ class PurchaseAndClose(NewWishlist):
         """Only execute __init__ method when the 'execute' argument is True."""
         if execute:
             super().__init__(cmd)
-            username = self.cmd.wishlist.username
-            self.cmd.wishlist.save_to_csv(filename='receipts/'+username)
+            receipt = self.cmd.service.purchase(self.cmd.wishlist)
             console.print('Successful purchase!\n',
-                          'Receipt in database/receipts/' + username + '.csv',
+                          'Receipt in ' + receipt.filename,
                           sep='',
                           style='green')
 
 
+# ------------------------------- Instrumentation -----------------------------
+@icontract.ensure(lambda result: isinstance(result, list))
+def all_questions():
+    """Return every subclass of Question, subclasses of subclasses too."""
+    questions = []
+    remaining = [Question]
+    while remaining:
+        for question in remaining.pop().__subclasses__():
+            questions.append(question)
+            remaining.append(question)
+    return questions
+
+
+@icontract.ensure(lambda result: isinstance(result, Metrics))
+def enable_metrics(filename=METRICS_FILE, interval=10.0):
+    """Time every command, Partlist mutation and login from now on.
+
+    The metrics are written to filename every interval seconds and when
+    the program exits.
+    """
+    shop_metrics = Metrics()
+    for question in all_questions():
+        shop_metrics.instrument(question, ['__init__'])
+    shop_metrics.instrument(Partlist, ['add_to_partlist', 'adjust_stock',
+                                       'set_price', 'pop_part',
+                                       'remove_part_using_name',
+                                       'remove_part_using_position',
+                                       'save_to_csv'])
+    shop_metrics.instrument(Authenticator, ['login'])
+    shop_metrics.start_exporter(filename, interval)
+    return shop_metrics
+
+
+@icontract.ensure(lambda result: isinstance(result, SessionProfiler))
+def enable_profiling(commands=None, interval=0.005):
+    """Profile the rest of the session, or only the listed commands.
+
+    commands is a collection of Question class names, e.g.
+    {'AddFromDatabase'}; each call of those is profiled on its own.
+    """
+    profiler = SessionProfiler(interval)
+    if commands:
+        for question in all_questions():
+            if question.__name__ in commands:
+                question.__init__ = profiler.scoped(question.__init__,
+                                                    only_for=question)
+    else:
+        profiler.start()
+    return profiler
+
+
+def enable_memory(users_file=USERS_FILE, frames=1):
+    """Measure the memory kept by the catalog load, the load of the users
+    in users_file and every command from now on.
+
+    Return the MemoryTracker and a ShopService over the catalog and users
+    loaded while measured.
+    """
+    tracker = MemoryTracker(frames)
+    partlist = tracker.measure('catalog_load', Partlist.read_from_csv)
+    tracker.per_object('ComputerPart', 'catalog_load', len(partlist))
+    authenticator = tracker.measure('users_load', Authenticator, users_file)
+    tracker.per_object('User', 'users_load', len(authenticator.users))
+    for question in all_questions():
+        question.__init__ = tracker.tracked(question.__name__,
+                                            question.__init__,
+                                            only_for=question)
+    return tracker, ShopService(partlist, authenticator)
+
+
 # ---------------------------------- Program ----------------------------------
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='The Computer Store.')
+    parser.add_argument('--metrics', nargs='?', const=METRICS_FILE,
+                        metavar='FILE',
+                        help='time every command and export the metrics to '
+                             f'FILE (.json or Prometheus text, default '
+                             f'{METRICS_FILE})')
+    parser.add_argument('--metrics-interval', type=float, default=10.0,
+                        metavar='SECONDS',
+                        help='seconds between two exports of the metrics')
+    parser.add_argument('--profile', nargs='?', const=PROFILE_PREFIX,
+                        metavar='PREFIX',
+                        help='profile the session and write PREFIX.pstats '
+                             'and PREFIX.collapsed on Close (default '
+                             f'{PROFILE_PREFIX})')
+    parser.add_argument('--profile-commands', metavar='NAMES',
+                        help='comma separated Question classes to profile, '
+                             'e.g. AddFromDatabase (default: everything)')
+    parser.add_argument('--profile-interval', type=float, default=0.005,
+                        metavar='SECONDS',
+                        help='seconds between two stack samples')
+    parser.add_argument('--memory', nargs='?', const=MEMORY_FILE,
+                        metavar='FILE',
+                        help='trace the memory kept by the loads and every '
+                             'command and write a report to FILE on Close '
+                             f'(.json or text, default {MEMORY_FILE})')
+    parser.add_argument('--output', choices=['auto'] + list(BACKENDS),
+                        default='auto',
+                        help='rich for a terminal, plain text for pipes, '
+                             'buffered plain text written once per command '
+                             'for batch runs (default: auto)')
+    parser.add_argument('--users', default=USERS_FILE, metavar='FILE',
+                        help='users.csv, or an SQLite database (.db) made '
+                             f'by user_store.py (default {USERS_FILE})')
+    parser.add_argument('--ledger', nargs='?', const=stock_ledger.LEDGER_FILE,
+                        metavar='FILE',
+                        help='record every stock movement in the ledger '
+                             'FILE, queried with stock_ledger.py (default '
+                             f'{stock_ledger.LEDGER_FILE})')
+    catalog = parser.add_mutually_exclusive_group()
+    catalog.add_argument('--warehouses', nargs='?',
+                         const=WAREHOUSES_DIRECTORY, metavar='DIR',
+                         help='sell from one csv file per warehouse in DIR '
+                              f'(default {WAREHOUSES_DIRECTORY}) instead of '
+                              'database.csv')
+    catalog.add_argument('--partitions', nargs='?',
+                         const=PARTITIONS_DIRECTORY, metavar='DIR',
+                         help='read each part type from its own partition '
+                              f'in DIR (default {PARTITIONS_DIRECTORY}) '
+                              'when first used; DIR is made from '
+                              'database.csv if it does not exist')
+    catalog.add_argument('--shared-stock', nargs='?', const='',
+                         metavar='NAME',
+                         help='share the stock of database.csv with the '
+                              'other shop processes of this host through '
+                              'the shared memory NAME (default: see '
+                              'shared_stock.py)')
+    args = parser.parse_args()
+    console.use(args.output)
+
     console.print(
         'Copyright (C) 2022 Tan Duc Mai '
         '(tan.duc.work@gmail.com, @tanducmai on LinkedIn)',
@@ -1686,27 +2806,72 @@ if __name__ == '__main__':
     )
     console.print('~~ [italic]Welcome to the Computer Store[/] ~~')
     print()
-    cmd = CommandPrompt()
+    memory = None
+    if args.memory:
+        memory, service = enable_memory(args.users)
+    else:
+        partlist = None
+        if args.warehouses:
+            partlist = ShardedPartlist.read_shards(args.warehouses)
+        elif args.partitions:
+            if not os.path.isdir(args.partitions):
+                PartitionedPartlist.split(Partlist.read_cached(),
+                                          args.partitions)
+            partlist = PartitionedPartlist(args.partitions)
+        elif args.shared_stock is not None:
+            # Imported here: it needs fcntl, which not every system has.
+            from shared_stock import SHARED_NAME, SharedStock
+            partlist = Partlist.read_cached()
+            partlist.use_stock(SharedStock(args.shared_stock or SHARED_NAME))
+        ledger = None
+        if args.ledger:
+            ledger = stock_ledger.StockLedger(args.ledger)
+        service = ShopService(partlist, Authenticator(args.users),
+                              ledger=ledger)
+    cmd = CommandPrompt(service)
+    if not args.partitions:
+        # Not with partitions: following the stock reads every partition.
+        service.reorder.add_listener(print_alert)
+    # Only once the menus are built, so that building them is not counted.
+    if args.metrics:
+        enable_metrics(args.metrics, args.metrics_interval)
+    profiler = None
+    if args.profile:
+        profiler = enable_profiling(
+            args.profile_commands and args.profile_commands.split(','),
+            args.profile_interval,
+        )
 
     done = False
     while not done:
-        # Keep displaying Main Menu until the user enters 4.
+        # Keep displaying Main Menu until the user enters 5.
         option = None
-        while option is None or option not in range(1, 5):
+        while option is None or option not in range(1, 6):
             CommandPrompt.display_menu('Main Menu')
-            option = cmd.prompt_for_option(limit=5)
+            option = cmd.prompt_for_option(limit=6)
 
-        # Now we have a valid option between 1 and 4.
-        if option != 4:
+        # Now we have a valid option between 1 and 5.
+        if option != 5:
             if option == 1:
                 NewWishlist(cmd)
             elif option == 2:
                 print()
                 ListDatabase(cmd)
                 print()
-            else:
+            elif option == 3:
                 print()
                 AddPartToDatabase(cmd)
+            else:
+                print()
+                LowStock(cmd)
+                print()
         else:
             Close(cmd, 'Main Menu')
             done = True
+            if profiler is not None:
+                profiler.stop()
+                for filename in profiler.write(args.profile):
+                    print(f'Profile written to {filename}')
+            if memory is not None:
+                memory.write(args.memory)
+                print(f'Memory report written to {args.memory}')
@@ -0,0 +1,198 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  memory.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Measures the memory allocated by the shop operations with
+#               tracemalloc snapshots and flags the ones that keep growing.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import collections
+import functools
+import json
+import linecache
+import os
+import tracemalloc
+
+# Third party
+import icontract
+
+
+# ------------------------------- Named Constant ------------------------------
+MEMORY_FILE = 'database/memory.txt'
+
+# Allocations of these files are never counted.
+IGNORED_FILES = (tracemalloc.__file__, __file__, '<unknown>')
+
+
+# ------------------------------ Class Definition -----------------------------
+class MemoryTracker:
+    """Net bytes allocated by each measured operation, where they were
+    allocated, and the size of the objects loaded per object.
+
+    An operation is measured by a tracemalloc snapshot before and after
+    it; what it allocated and did not free is its net growth.
+    """
+
+    @icontract.require(lambda frames: frames >= 1)
+    @icontract.require(lambda min_growth: min_growth >= 0)
+    def __init__(self, frames=1, min_growth=512):
+        """Initialise MemoryTracker object.
+
+        frames is the depth of the tracebacks kept by tracemalloc; an
+        operation whose every repeat grows by at least min_growth bytes is
+        flagged by leaks().
+        """
+        self.__frames = frames
+        self.__min_growth = min_growth
+        # Label -> net bytes of each call.
+        self.__growth = collections.defaultdict(list)
+        # Label -> Counter of net bytes, keyed by (filename, line number).
+        self.__sites = collections.defaultdict(collections.Counter)
+        # Kind of object -> (bytes, count).
+        self.__objects = {}
+
+    @property
+    def growth(self):
+        """Return the growth attribute (net bytes per call, by label)."""
+        return self.__growth
+
+    def start(self):
+        """Start tracing the allocations, if not traced yet."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.__frames)
+
+    def stop(self):
+        """Stop tracing the allocations and forget every trace."""
+        tracemalloc.stop()
+
+    @staticmethod
+    def __snapshot():
+        """Return a snapshot without the allocations of the tracker."""
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, filename)
+             for filename in IGNORED_FILES])
+
+    def measure(self, label, function, *args, **kwargs):
+        """Call function with args and kwargs, record the memory it kept
+        under label, and return its result.
+        """
+        self.start()
+        before = self.__snapshot()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            after = self.__snapshot()
+            sites = self.__sites[label]
+            total = 0
+            for stat in after.compare_to(before, 'lineno'):
+                if not stat.size_diff:
+                    continue
+                frame = stat.traceback[0]
+                sites[frame.filename, frame.lineno] += stat.size_diff
+                total += stat.size_diff
+            self.__growth[label].append(total)
+
+    def tracked(self, label, function, only_for=None):
+        """Return function wrapped so that each call is measured.
+
+        With only_for (a class), only calls whose first argument is exactly
+        of that class are measured.
+        """
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if only_for is not None and type(args[0]) is not only_for:
+                return function(*args, **kwargs)
+            return self.measure(label, function, *args, **kwargs)
+        return wrapper
+
+    @icontract.require(lambda count: count >= 0)
+    def per_object(self, kind, label, count):
+        """Record the last growth of label as count objects of kind."""
+        self.__objects[kind] = (self.__growth[label][-1], count)
+
+    def bytes_per_object(self):
+        """Return a dictionary of bytes per object, keyed by kind."""
+        return {kind: size / count if count else 0.0
+                for kind, (size, count) in self.__objects.items()}
+
+    def top_sites(self, label, n=10):
+        """Return the n ((filename, line number), net bytes) of label
+        that kept the most.
+        """
+        return self.__sites[label].most_common(n)
+
+    def leaks(self, repeats=3):
+        """Return a dictionary of the labels called at least repeats times
+        whose every call but the first grew by min_growth bytes or more,
+        with their growth per call.
+
+        The first call is left out, as it may fill caches on purpose.
+        """
+        return {label: growth for label, growth in self.__growth.items()
+                if len(growth) >= repeats
+                and min(growth[1:]) >= self.__min_growth}
+
+    def report(self, top=10):
+        """Return a dictionary of every measurement, JSON-friendly."""
+        return {
+            'operations': {
+                label: {
+                    'calls': len(growth),
+                    'net_bytes': sum(growth),
+                    'top_sites': [
+                        {'site': f'{os.path.basename(filename)}:{lineno}',
+                         'bytes': size,
+                         'line': linecache.getline(filename, lineno).strip()}
+                        for (filename, lineno), size
+                        in self.top_sites(label, top)
+                    ],
+                }
+                for label, growth in self.__growth.items()
+            },
+            'bytes_per_object': self.bytes_per_object(),
+            'leaks': self.leaks(),
+        }
+
+    def format_report(self, top=10):
+        """Return the report as text."""
+        report = self.report(top)
+        lines = ['Bytes per object']
+        for kind, size in sorted(report['bytes_per_object'].items()):
+            lines.append(f'  {kind:<20} {size:>12,.0f}')
+        lines.append('')
+        lines.append('Possible leaks (net bytes per call)')
+        for label, growth in sorted(report['leaks'].items()):
+            lines.append(f'  {label:<20} {growth}')
+        if not report['leaks']:
+            lines.append('  None')
+        for label, operation in report['operations'].items():
+            lines.append('')
+            lines.append(f'{label}: {operation["calls"]} call(s), '
+                         f'{operation["net_bytes"]:,} bytes kept')
+            for site in operation['top_sites']:
+                lines.append(f'  {site["bytes"]:>12,}  {site["site"]:<28} '
+                             f'{site["line"]}')
+        return '\n'.join(lines) + '\n'
+
+    @icontract.require(
+        lambda filename: isinstance(filename, str) & (filename != ''))
+    @icontract.ensure(lambda result: result is None)
+    def write(self, filename=MEMORY_FILE, top=10):
+        """Write the report to a file, as JSON if its name ends with .json
+        and as text otherwise.
+        """
+        if filename.endswith('.json'):
+            text = json.dumps(self.report(top), indent=2)
+        else:
+            text = self.format_report(top)
+        with open(filename, mode='w', encoding='UTF8') as outfile:
+            outfile.write(text)
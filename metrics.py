@@ -0,0 +1,242 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  metrics.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Counts calls, errors and latencies of the shop operations
+#               and exports them to a Prometheus-text or JSON file.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import atexit
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+
+# Third party
+import icontract
+
+
+# ------------------------------- Named Constant ------------------------------
+METRICS_FILE = 'database/metrics.prom'
+
+# Upper bounds (seconds) of the latency histogram buckets, +Inf excluded.
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+# ------------------------------ Class Definition -----------------------------
+class Metrics:
+    """Counters, error counts and fixed-bucket latency histograms, keyed by
+    operation name.
+
+    Nothing is measured until methods are wrapped with instrument(), so
+    the shop pays nothing when metrics are disabled.
+
+    A call only appends its seconds to a list of its operation, which the
+    timed function keeps: one list.append(), atomic under the GIL, and no
+    lock or dictionary lookup. The calls appended so far are counted into
+    the totals under a lock whenever the metrics are read, e.g. by the
+    exporter thread; until then each one keeps a float.
+    """
+
+    def __init__(self):
+        """Initialise Metrics object."""
+        # Operation name -> [calls, errors, sum of seconds, count per
+        # bucket (+Inf last), seconds of each call not counted yet, one
+        # None per failed call not counted yet].
+        self.__stats = {}
+        self.__lock = threading.Lock()
+        self.__stop_exporter = None
+
+    @property
+    def calls(self):
+        """Return a dictionary of the number of calls per operation."""
+        return self.snapshot()['calls']
+
+    @property
+    def errors(self):
+        """Return a dictionary of the number of errors per operation."""
+        return self.snapshot()['errors']
+
+    def __stats_of(self, name):
+        """Return the stats list of an operation, made on first use."""
+        with self.__lock:
+            stats = self.__stats.get(name)
+            if stats is None:
+                stats = self.__stats[name] = [0, 0, 0.0,
+                                              [0] * (len(BUCKETS) + 1),
+                                              [], []]
+        return stats
+
+    @staticmethod
+    def __count(stats):
+        """Count the calls appended to a stats list into its totals. The
+        caller holds the lock.
+        """
+        latencies, failures = stats[4], stats[5]
+        # Calls appended meanwhile are left for the next count.
+        calls, errors = len(latencies), len(failures)
+        batch = latencies[:calls]
+        del latencies[:calls]
+        del failures[:errors]
+        counts = stats[3]
+        for seconds in batch:
+            counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        stats[0] += calls
+        stats[1] += errors
+        stats[2] += sum(batch)
+
+    def observe(self, name, seconds, failed=False):
+        """Record one call of an operation that took seconds."""
+        stats = self.__stats_of(name)
+        stats[4].append(seconds)
+        if failed:
+            stats[5].append(None)
+
+    def timed(self, name, function, only_for=None):
+        """Return function wrapped with a monotonic timer.
+
+        With only_for (a class), calls are only recorded when the first
+        argument is exactly of that class, so a subclass calling
+        super().__init__() is not counted twice.
+        """
+        latencies, failures = self.__stats_of(name)[4:]
+        clock = time.perf_counter
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if only_for is not None and type(args[0]) is not only_for:
+                return function(*args, **kwargs)
+            start = clock()
+            try:
+                result = function(*args, **kwargs)
+            except BaseException:
+                latencies.append(clock() - start)
+                failures.append(None)
+                raise
+            latencies.append(clock() - start)
+            return result
+
+        wrapper.__wrapped_by_metrics__ = True
+        return wrapper
+
+    def instrument(self, cls, method_names, prefix=None):
+        """Replace methods of cls by timed versions of themselves.
+
+        Operations are named '<prefix>.<method>' (prefix defaults to the
+        class name); a wrapped __init__ is named after the class alone.
+        """
+        prefix = prefix or cls.__name__
+        for method_name in method_names:
+            function = cls.__dict__.get(method_name)
+            if function is None or hasattr(function,
+                                           '__wrapped_by_metrics__'):
+                continue
+            if method_name == '__init__':
+                setattr(cls, method_name,
+                        self.timed(prefix, function, only_for=cls))
+            else:
+                setattr(cls, method_name,
+                        self.timed(f'{prefix}.{method_name}', function))
+
+    def snapshot(self):
+        """Return a copy of every metric as a JSON-friendly dictionary."""
+        with self.__lock:
+            for stats in self.__stats.values():
+                self.__count(stats)
+            copied = {name: (stats[0], stats[1], stats[2], list(stats[3]))
+                      for name, stats in self.__stats.items()}
+        bounds = [str(bound) for bound in BUCKETS] + ['+Inf']
+        # An operation wrapped but never called yet is left out.
+        return {
+            'calls': {name: stats[0] for name, stats in copied.items()
+                      if stats[0]},
+            'errors': {name: stats[1] for name, stats in copied.items()
+                       if stats[1]},
+            'latency_seconds': {
+                name: {
+                    'buckets': dict(zip(bounds, counts)),
+                    'sum': seconds,
+                    'count': sum(counts),
+                }
+                for name, (calls, _, seconds, counts) in copied.items()
+                if calls
+            },
+        }
+
+    def to_prometheus(self):
+        """Return every metric in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = ['# TYPE shop_calls_total counter']
+        for name, count in sorted(snapshot['calls'].items()):
+            lines.append(f'shop_calls_total{{operation="{name}"}} {count}')
+        lines.append('# TYPE shop_errors_total counter')
+        for name, count in sorted(snapshot['errors'].items()):
+            lines.append(f'shop_errors_total{{operation="{name}"}} {count}')
+        lines.append('# TYPE shop_latency_seconds histogram')
+        for name, histogram in sorted(snapshot['latency_seconds'].items()):
+            cumulative = 0
+            for bound, count in histogram['buckets'].items():
+                cumulative += count
+                lines.append(f'shop_latency_seconds_bucket{{operation="{name}"'
+                             f',le="{bound}"}} {cumulative}')
+            lines.append(f'shop_latency_seconds_sum{{operation="{name}"}} '
+                         f'{histogram["sum"]}')
+            lines.append(f'shop_latency_seconds_count{{operation="{name}"}} '
+                         f'{histogram["count"]}')
+        return '\n'.join(lines) + '\n'
+
+    @icontract.require(
+        lambda filename: isinstance(filename, str) & (filename != ''))
+    @icontract.ensure(lambda result: result is None)
+    def write(self, filename=METRICS_FILE):
+        """Write every metric to a file, as JSON if its name ends with
+        .json and as Prometheus text otherwise.
+        """
+        if filename.endswith('.json'):
+            text = json.dumps(self.snapshot(), indent=2)
+        else:
+            text = self.to_prometheus()
+        temporary = filename + '.tmp'
+        with open(temporary, mode='w', encoding='UTF8') as outfile:
+            outfile.write(text)
+        os.replace(temporary, filename)
+
+    @icontract.require(lambda interval: interval > 0)
+    def start_exporter(self, filename=METRICS_FILE, interval=10.0):
+        """Write the metrics file every interval seconds in a background
+        thread, and once more when the program exits.
+        """
+        stopped = threading.Event()
+
+        def export():
+            while not stopped.wait(interval):
+                self.write(filename)
+
+        threading.Thread(target=export, daemon=True).start()
+        self.__stop_exporter = (stopped, filename)
+        atexit.register(self.stop_exporter)
+
+    @icontract.ensure(lambda result: result is None)
+    def stop_exporter(self):
+        """Stop the background exporter and write the metrics file a last
+        time. Nothing happens if no exporter is running.
+        """
+        if self.__stop_exporter is None:
+            return
+        stopped, filename = self.__stop_exporter
+        self.__stop_exporter = None
+        stopped.set()
+        atexit.unregister(self.stop_exporter)
+        self.write(filename)
@@ -0,0 +1,162 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  output.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Writes what the shop prints through rich, imported only when
+#               first needed, or as plain text.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import atexit
+import importlib.util
+import sys
+
+
+# ------------------------------- Named Constant ------------------------------
+# Characters a BufferedOutput holds at most before writing them.
+BUFFER_SIZE = 1 << 16
+
+
+# ------------------------------ Class Definition -----------------------------
+class RichOutput:
+    """Write through a rich Console, created on the first print."""
+
+    def __init__(self):
+        """Initialise RichOutput object. rich is not imported yet."""
+        self.__console = None
+
+    @property
+    def console(self):
+        """Return the rich Console, importing rich the first time."""
+        if self.__console is None:
+            from rich.console import Console
+            self.__console = Console()
+        return self.__console
+
+    def print(self, *objects, sep=' ', end='\n', style=None):
+        """Print objects like rich.print, in style (e.g. 'red') if given."""
+        self.console.print(*objects, sep=sep, end=end, style=style)
+
+    def flush(self):
+        """Nothing to do: rich writes every print at once."""
+
+
+class PlainOutput:
+    """Write plain text to sys.stdout, without styles and markup."""
+
+    def print(self, *objects, sep=' ', end='\n', style=None):
+        """Print objects like the built-in print; style is ignored."""
+        sys.stdout.write(
+            strip_markup(sep.join(str(item) for item in objects) + end))
+
+    def flush(self):
+        """Nothing to do: every print is written at once."""
+
+
+class BufferedOutput(PlainOutput):
+    """Plain text, held in memory until flush() writes it in one go.
+
+    The shop flushes before reading any input, so a command's output is
+    written once, right before the next prompt. It is also written when
+    more than BUFFER_SIZE characters are held, and when the program exits.
+    """
+
+    def __init__(self):
+        """Initialise BufferedOutput object with an empty buffer."""
+        self.__buffer = []
+        self.__size = 0
+        atexit.register(self.flush)
+
+    def print(self, *objects, sep=' ', end='\n', style=None):
+        """Add objects to the buffer; style is ignored."""
+        text = strip_markup(sep.join(str(item) for item in objects) + end)
+        self.__buffer.append(text)
+        self.__size += len(text)
+        if self.__size > BUFFER_SIZE:
+            self.flush()
+
+    def flush(self):
+        """Write the buffer to sys.stdout and empty it."""
+        if self.__buffer:
+            text = ''.join(self.__buffer)
+            self.__buffer = []
+            self.__size = 0
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+
+# Output backends, by name.
+BACKENDS = {
+    'rich': RichOutput,
+    'plain': PlainOutput,
+    'buffered': BufferedOutput,
+}
+
+
+class Output:
+    """What the shop prints, written through one of the BACKENDS.
+
+    'auto' picks rich when standard output is a terminal and rich is
+    installed, and plain text otherwise (pipes, batch runs and tests).
+    """
+
+    def __init__(self, backend='auto'):
+        """Initialise Output object with the backend named backend."""
+        self.__backend = None
+        self.use(backend)
+
+    @property
+    def backend(self):
+        """Return the name of the backend in use."""
+        return self.__name
+
+    def use(self, backend):
+        """Write through the backend named backend from now on."""
+        if backend == 'auto':
+            backend = 'rich' if sys.stdout.isatty() and has_rich() \
+                else 'plain'
+        if backend not in BACKENDS:
+            raise ValueError(f'Unknown output backend {backend}!')
+        if self.__backend is not None:
+            self.__backend.flush()
+        self.__name = backend
+        self.__backend = BACKENDS[backend]()
+
+    def print(self, *objects, sep=' ', end='\n', style=None):
+        """Print objects through the backend in use."""
+        self.__backend.print(*objects, sep=sep, end=end, style=style)
+
+    def flush(self):
+        """Write what the backend holds, if anything."""
+        self.__backend.flush()
+
+
+# ---------------------------- Function Definitions ---------------------------
+def has_rich():
+    """Return True if rich can be imported, without importing it."""
+    return importlib.util.find_spec('rich') is not None
+
+
+def strip_markup(text):
+    """Return text without its rich markup, parsed the way rich parses
+    it: '[italic]Welcome[/]' gives 'Welcome', but '[1] CPU' is kept.
+
+    rich is only imported for a text holding a '['. A text that rich
+    cannot parse is returned as it is.
+    """
+    if '[' not in text:
+        return text
+    from rich.errors import MarkupError
+    from rich.text import Text
+    try:
+        return Text.from_markup(text).plain
+    except MarkupError:
+        return text
@@ -0,0 +1,365 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  price_history.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Keeps the price history of every part as a compact, delta
+#               encoded time series, thinned out once it gets old.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import argparse
+import array
+import bisect
+import csv
+import datetime
+import itertools
+import os
+import struct
+import sys
+
+# Third party
+import icontract
+
+# Local application/library specific imports
+from file_lock import FileLock
+
+
+# ------------------------------- Named Constant ------------------------------
+HISTORY_FILE = 'database/prices.bin'
+
+# Days kept at full resolution; older changes are thinned to the last one
+# of each week.
+FULL_DAYS = 365
+
+# The days are counted from this one, which is also the day of a price
+# whose start is unknown.
+FIRST_DAY = '1970-01-01'
+EPOCH = datetime.date.fromisoformat(FIRST_DAY).toordinal()
+
+# A price change of the log: part number, day and price in cents.
+CHANGE = struct.Struct('<IIq')
+
+# The header of the snapshot: its generation, one more than the one it
+# replaced, so a rewrite is noticed even if the file reuses an inode.
+GENERATION = struct.Struct('<Q')
+
+# A series of the snapshot: part number and number of points, followed by
+# the day deltas ('H') and then the price deltas in cents ('i').
+SERIES = struct.Struct('<II')
+
+
+# ------------------------------ Class Definition -----------------------------
+class PriceHistory:
+    """The prices of every part over time, one point per day at most.
+
+    A series is two arrays: the days since the previous point (2 bytes)
+    and the change of price in cents (4 bytes), so a part changing price
+    every day costs 6 bytes a day. A query decodes the series with
+    running sums and bisects it.
+
+    Each change is appended to <filename>.log; save() thins the points
+    older than FULL_DAYS to one per week, writes every series to
+    <filename> and empties the log. <filename>.names holds the part name
+    of each part number. Nothing is read until the history is first used.
+
+    Several processes may share the files. Changes and saves are made
+    under the lock of <filename>.lock, and every use first reads the names
+    and changes the other processes added; a save by another process is
+    noticed by the generation of the snapshot, which is then read again.
+    """
+
+    @icontract.require(
+        lambda filename: isinstance(filename, str) & (filename != ''))
+    def __init__(self, filename=HISTORY_FILE):
+        """Initialise PriceHistory object. Nothing is read yet."""
+        self.__filename = filename
+        self.__names = None
+
+    @property
+    def filename(self):
+        """Return the filename attribute."""
+        return self.__filename
+
+    @property
+    def names(self):
+        """Return the part names, loading the history on first access."""
+        with self.__locked(shared=True):
+            self.__refresh()
+        return self.__names
+
+    def __locked(self, shared=False):
+        """Return the lock of the history files."""
+        return FileLock(self.__filename + '.lock', shared)
+
+    def __refresh(self):
+        """Read the names and changes other processes added since the last
+        refresh, and the whole history if the snapshot was rewritten. The
+        caller holds the lock.
+        """
+        if self.__names is None:
+            self.__names = []
+            self.__numbers = {}
+            self.__names_size = 0
+            # The generation of the snapshot the series were read from.
+            self.__generation = -1
+        try:
+            with open(self.__filename + '.names', 'rb') as infile:
+                infile.seek(self.__names_size)
+                data = infile.read()
+        except FileNotFoundError:
+            data = b''
+        # Only whole lines; a name is written with its newline.
+        data = data[:data.rfind(b'\n') + 1]
+        self.__names_size += len(data)
+        for part_name in data.decode('UTF8').splitlines():
+            self.__numbers[part_name] = len(self.__names)
+            self.__names.append(part_name)
+
+        try:
+            with open(self.__filename, 'rb') as infile:
+                header = infile.read(GENERATION.size)
+                # No snapshot yet is generation 0.
+                generation = (GENERATION.unpack(header)[0] if header
+                              else 0)
+                if generation != self.__generation:
+                    self.__generation = generation
+                    self.__read_snapshot(infile.read())
+        except FileNotFoundError:
+            if self.__generation != 0:
+                self.__generation = 0
+                self.__read_snapshot(b'')
+        try:
+            with open(self.__filename + '.log', 'rb') as infile:
+                infile.seek(self.__log_size)
+                data = infile.read()
+        except FileNotFoundError:
+            data = b''
+        # A torn last change (e.g. after a crash) is left for later.
+        data = data[:len(data) - len(data) % CHANGE.size]
+        self.__log_size += len(data)
+        for number, day, cents in CHANGE.iter_unpack(data):
+            self.__append(number, day, cents)
+
+    def __read_snapshot(self, data):
+        """Read every series of data, the snapshot after its header; the
+        log is read again.
+        """
+        self.__days = {}
+        self.__cents = {}
+        # The last (day, cents) of every series, to append in O(1).
+        self.__last = {}
+        self.__log_size = 0
+        position = 0
+        while position < len(data):
+            number, count = SERIES.unpack_from(data, position)
+            position += SERIES.size
+            days = array.array('H', data[position:position + 2 * count])
+            position += 2 * count
+            cents = array.array('i', data[position:position + 4 * count])
+            position += 4 * count
+            self.__days[number], self.__cents[number] = days, cents
+            self.__last[number] = (sum(days), sum(cents))
+
+    def __number(self, part_name):
+        """Return the number of part_name, given to it if it has none.
+
+        The caller holds the lock and has refreshed the names.
+        """
+        number = self.__numbers.get(part_name)
+        if number is None:
+            with open(self.__filename + '.names', 'ab') as outfile:
+                outfile.write((part_name + '\n').encode('UTF8'))
+            self.__refresh()
+            number = self.__numbers[part_name]
+        return number
+
+    def __append(self, number, day, cents):
+        """Add a point to the series of part number. Return False if the
+        price did not change, and nothing was added.
+        """
+        last_day, last_cents = self.__last.get(number, (0, 0))
+        days = self.__days.setdefault(number, array.array('H'))
+        prices = self.__cents.setdefault(number, array.array('i'))
+        if days and last_cents == cents:
+            return False
+        if days and day <= last_day:
+            # A second change of the same day replaces the first one.
+            prices[-1] += cents - last_cents
+        else:
+            days.append(day - last_day)
+            prices.append(cents - last_cents)
+        self.__last[number] = (max(day, last_day), cents)
+        return True
+
+    @icontract.require(lambda part_name: isinstance(part_name, str))
+    @icontract.require(lambda price: price >= 0)
+    def record(self, part_name, price, day=None):
+        """Record the price of part_name on day (default: today), as
+        'YYYY-MM-DD', if it is not its current price already.
+        """
+        day = to_day(day)
+        cents = round(price * 100)
+        with self.__locked():
+            self.__refresh()
+            number = self.__number(part_name)
+            if self.__append(number, day, cents):
+                with open(self.__filename + '.log', 'ab') as outfile:
+                    # A torn last change (e.g. after a crash) is dropped.
+                    outfile.truncate(self.__log_size)
+                    outfile.write(CHANGE.pack(number, day, cents))
+                self.__log_size += CHANGE.size
+
+    def __series(self, part_name):
+        """Return the (days, cents) lists of part_name, decoded."""
+        with self.__locked(shared=True):
+            self.__refresh()
+        number = self.__numbers.get(part_name)
+        if number is None or number not in self.__days:
+            return [], []
+        return (list(itertools.accumulate(self.__days[number])),
+                list(itertools.accumulate(self.__cents[number])))
+
+    def price_at(self, part_name, day=None):
+        """Return the price of part_name on day (default: today), or None
+        if it had no price yet.
+        """
+        days, cents = self.__series(part_name)
+        index = bisect.bisect_right(days, to_day(day)) - 1
+        return cents[index] / 100 if index >= 0 else None
+
+    def prices(self, part_name, start=None, end=None):
+        """Return the (date, price) of every change of price of part_name
+        from start to end (default: the first and the last), both
+        'YYYY-MM-DD'. The price in effect on start comes first.
+        """
+        days, cents = self.__series(part_name)
+        first = 0 if start is None else max(
+            bisect.bisect_right(days, to_day(start)) - 1, 0)
+        last = len(days) if end is None else bisect.bisect_right(
+            days, to_day(end))
+        points = [(to_date(day), price / 100) for day, price in
+                  zip(days[first:last], cents[first:last])]
+        if start is not None and points and points[0][0] < start:
+            points[0] = (start, points[0][1])
+        return points
+
+    def last(self, part_name, days):
+        """Return the prices of part_name over the last days days."""
+        start = datetime.date.today() - datetime.timedelta(days=days)
+        return self.prices(part_name, start.isoformat())
+
+    @icontract.ensure(lambda result: result is None)
+    def save(self, today=None):
+        """Thin the points older than FULL_DAYS before today, write every
+        series to the snapshot, replacing it atomically, and empty the log.
+
+        Nothing is written if the history was not used.
+        """
+        if self.__names is None:
+            return
+        horizon = to_day(today) - FULL_DAYS
+        temporary = self.__filename + '.tmp'
+        with self.__locked():
+            self.__refresh()
+            generation = self.__generation + 1
+            with open(temporary, 'wb') as outfile:
+                outfile.write(GENERATION.pack(generation))
+                for number in sorted(self.__days):
+                    self.__thin(number, horizon)
+                    days, cents = self.__days[number], self.__cents[number]
+                    outfile.write(SERIES.pack(number, len(days)))
+                    outfile.write(days.tobytes())
+                    outfile.write(cents.tobytes())
+            os.replace(temporary, self.__filename)
+            with open(self.__filename + '.log', 'wb'):
+                pass
+            self.__generation = generation
+            self.__log_size = 0
+
+    def __thin(self, number, horizon):
+        """Keep one point per week of the points of part number before the
+        day horizon: the last one of the week.
+        """
+        days = list(itertools.accumulate(self.__days[number]))
+        cents = list(itertools.accumulate(self.__cents[number]))
+        old = bisect.bisect_left(days, horizon)
+        weeks = [day // 7 for day in days[:old]]
+        kept = [index for index in range(old)
+                if index + 1 == old or weeks[index] != weeks[index + 1]]
+        if len(kept) == old:
+            return
+        kept.extend(range(old, len(days)))
+        self.__days[number] = delta_encode('H', (days[i] for i in kept))
+        self.__cents[number] = delta_encode('i', (cents[i] for i in kept))
+
+    def export(self, outfile):
+        """Write every price change of every part to outfile as csv rows:
+        'part name,YYYY-MM-DD,price'.
+        """
+        writer = csv.writer(outfile)
+        for part_name in self.names:
+            writer.writerows((part_name, day, f'{price:.2f}')
+                             for day, price in self.prices(part_name))
+
+
+# ---------------------------- Function Definitions ---------------------------
+def delta_encode(typecode, values):
+    """Return an array of typecode holding the differences between each
+    of values and the one before it (0 for the first).
+    """
+    encoded = array.array(typecode)
+    previous = 0
+    for value in values:
+        encoded.append(value - previous)
+        previous = value
+    return encoded
+
+
+def to_day(day=None):
+    """Return the days since 1970-01-01 of a 'YYYY-MM-DD' day (default:
+    today).
+    """
+    if day is None:
+        return datetime.date.today().toordinal() - EPOCH
+    return datetime.date.fromisoformat(day).toordinal() - EPOCH
+
+
+def to_date(day):
+    """Return the 'YYYY-MM-DD' of a number of days since 1970-01-01."""
+    return datetime.date.fromordinal(day + EPOCH).isoformat()
+
+
+# ---------------------------------- Program ----------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Query, export or compact the price history.')
+    parser.add_argument('--file', default=HISTORY_FILE, help='history file')
+    parser.add_argument('--part', help='part name to query')
+    parser.add_argument('--days', type=int, default=90,
+                        help='days of the history of --part (default 90)')
+    parser.add_argument('--export', metavar='CSV',
+                        help="write every price change to CSV ('-' for "
+                             'standard output)')
+    parser.add_argument('--save', action='store_true',
+                        help='thin the old changes and empty the log')
+    args = parser.parse_args()
+
+    history = PriceHistory(args.file)
+    if args.part:
+        for day, price in history.last(args.part, args.days):
+            print(f'{day}: ${price:.2f}')
+    if args.export == '-':
+        history.export(sys.stdout)
+    elif args.export:
+        with open(args.export, 'w', encoding='UTF8', newline='') as outfile:
+            history.export(outfile)
+    if args.save:
+        history.save()
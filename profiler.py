@@ -0,0 +1,134 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  profiler.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Profiles a shop session, or only some of its commands, and
+#               writes a pstats file and flamegraph collapsed stacks.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import collections
+import cProfile
+import functools
+import os
+import sys
+import threading
+import time
+
+# Third party
+import icontract
+
+
+# ------------------------------- Named Constant ------------------------------
+PROFILE_PREFIX = 'database/profile'
+
+
+# ------------------------------ Class Definition -----------------------------
+class SessionProfiler:
+    """cProfile plus a stack sampler thread, switched on and off together.
+
+    cProfile gives exact call counts and times (the pstats file); the
+    sampler records the full stack of the profiled thread every interval
+    seconds, which gives the collapsed stacks of a flamegraph.
+    """
+
+    @icontract.require(lambda interval: interval > 0)
+    def __init__(self, interval=0.005):
+        """Initialise SessionProfiler object. Nothing is profiled yet."""
+        self.__interval = interval
+        self.__profile = cProfile.Profile()
+        self.__stacks = collections.Counter()
+        # Number of nested start() calls not stopped yet.
+        self.__depth = 0
+        self.__thread_id = None
+        self.__active = threading.Event()
+        self.__sampler = None
+
+    @property
+    def stacks(self):
+        """Return the stacks attribute (count, keyed by collapsed stack)."""
+        return self.__stacks
+
+    def start(self):
+        """Start (or keep) profiling the current thread."""
+        self.__depth += 1
+        if self.__depth > 1:
+            return
+        self.__thread_id = threading.get_ident()
+        if self.__sampler is None:
+            self.__sampler = threading.Thread(target=self.__sample,
+                                              daemon=True)
+            self.__sampler.start()
+        self.__active.set()
+        self.__profile.enable()
+
+    def stop(self):
+        """Stop profiling once every start() has been stopped."""
+        if self.__depth == 0:
+            return
+        self.__depth -= 1
+        if self.__depth == 0:
+            self.__profile.disable()
+            self.__active.clear()
+
+    def __sample(self):
+        """Record the stack of the profiled thread while it is profiled."""
+        while True:
+            self.__active.wait()
+            frame = sys._current_frames().get(self.__thread_id)
+            if frame is not None:
+                self.__stacks[self.__collapse(frame)] += 1
+            time.sleep(self.__interval)
+
+    @staticmethod
+    def __collapse(frame):
+        """Return a stack as 'file:function;...' from the root down."""
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f'{os.path.basename(code.co_filename)}:'
+                         f'{getattr(code, "co_qualname", code.co_name)}')
+            frame = frame.f_back
+        return ';'.join(reversed(names))
+
+    def scoped(self, function, only_for=None):
+        """Return function wrapped so that only its calls are profiled.
+
+        With only_for (a class), only calls whose first argument is exactly
+        of that class are profiled.
+        """
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if only_for is not None and type(args[0]) is not only_for:
+                return function(*args, **kwargs)
+            self.start()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.stop()
+        return wrapper
+
+    @icontract.require(
+        lambda prefix: isinstance(prefix, str) & (prefix != ''))
+    def write(self, prefix=PROFILE_PREFIX):
+        """Write <prefix>.pstats and <prefix>.collapsed; return their names.
+
+        The collapsed file has one 'frame;frame;... count' line per stack,
+        the input of flamegraph.pl and speedscope.
+        """
+        pstats_file = prefix + '.pstats'
+        collapsed_file = prefix + '.collapsed'
+        self.__profile.create_stats()
+        self.__profile.dump_stats(pstats_file)
+        with open(collapsed_file, mode='w', encoding='UTF8') as outfile:
+            for stack, count in sorted(list(self.__stacks.items())):
+                outfile.write(f'{stack} {count}\n')
+        return pstats_file, collapsed_file
@@ -0,0 +1,251 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  reorder.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Keeps the parts ordered by how close they are to running out,
+#               and raises an alert when one falls to its reorder threshold.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import collections
+import csv
+import heapq
+
+# Third party
+import icontract
+
+
+# ------------------------------- Named Constant ------------------------------
+THRESHOLDS_FILE = 'database/thresholds.csv'
+
+# The reorder threshold of the parts thresholds.csv does not list.
+DEFAULT_THRESHOLD = 5
+
+# Alerts kept for the admin command.
+ALERTS_KEPT = 100
+
+# A part reaching its threshold (low is True) or rising above it again.
+Alert = collections.namedtuple(
+    'Alert', ['part_name', 'stock', 'threshold', 'low'])
+
+# A reorder candidate.
+Candidate = collections.namedtuple(
+    'Candidate', ['part_name', 'stock', 'threshold'])
+
+
+# ------------------------------ Class Definitions ----------------------------
+class IndexedHeap:
+    """A binary min-heap of keys that knows the position of every key, so
+    that the priority of any key is changed or removed in O(log n).
+    """
+
+    def __init__(self, priorities=()):
+        """Initialise IndexedHeap object from (key, priority) pairs, in
+        O(n).
+        """
+        self.__priority = dict(priorities)
+        self.__heap = list(self.__priority)
+        self.__position = {}
+        for index in reversed(range(len(self.__heap) // 2)):
+            self.__sift_down(index)
+        self.__position = {key: index
+                           for index, key in enumerate(self.__heap)}
+
+    def __len__(self):
+        return len(self.__heap)
+
+    def __contains__(self, key):
+        return key in self.__priority
+
+    def priority(self, key):
+        """Return the priority of key."""
+        return self.__priority[key]
+
+    def __swap(self, i, j):
+        heap = self.__heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self.__position[heap[i]] = i
+        self.__position[heap[j]] = j
+
+    def __less(self, i, j):
+        return (self.__priority[self.__heap[i]] <
+                self.__priority[self.__heap[j]])
+
+    def __sift_up(self, index):
+        while index > 0:
+            parent = (index - 1) // 2
+            if not self.__less(index, parent):
+                return
+            self.__swap(index, parent)
+            index = parent
+
+    def __sift_down(self, index):
+        size = len(self.__heap)
+        while True:
+            smallest = index
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < size and self.__less(child, smallest):
+                    smallest = child
+            if smallest == index:
+                return
+            self.__swap(index, smallest)
+            index = smallest
+
+    def set(self, key, priority):
+        """Add key, or change its priority."""
+        if key in self.__priority:
+            old = self.__priority[key]
+            self.__priority[key] = priority
+            if priority < old:
+                self.__sift_up(self.__position[key])
+            else:
+                self.__sift_down(self.__position[key])
+        else:
+            self.__priority[key] = priority
+            self.__heap.append(key)
+            self.__position[key] = len(self.__heap) - 1
+            self.__sift_up(len(self.__heap) - 1)
+
+    def remove(self, key):
+        """Remove key, if it is in the heap."""
+        if key not in self.__priority:
+            return
+        index = self.__position.pop(key)
+        last = self.__heap.pop()
+        del self.__priority[key]
+        if index < len(self.__heap):
+            self.__heap[index] = last
+            self.__position[last] = index
+            self.__sift_up(index)
+            self.__sift_down(self.__position[last])
+
+    def smallest(self, k):
+        """Return the k keys of lowest priority, lowest first, in
+        O(k log k) and without changing the heap.
+        """
+        result = []
+        frontier = [(self.__priority[self.__heap[0]], 0)] if self else []
+        while frontier and len(result) < k:
+            _, index = heapq.heappop(frontier)
+            result.append(self.__heap[index])
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(self.__heap):
+                    heapq.heappush(frontier, (
+                        self.__priority[self.__heap[child]], child))
+        return result
+
+
+class ReorderQueue:
+    """The parts of a Partlist by urgency: their stock divided by their
+    reorder threshold, lowest first.
+
+    It listens to the Partlist, so every change of stock costs O(log n),
+    and urgent(k) costs O(k log k). Crossing a threshold, in either
+    direction, makes an Alert for each listener.
+
+    A listener only hears the changes of this process. If the stock is
+    shared with other processes (e.g. a SharedStock), urgent() first
+    reads all of it again, in O(n), and the Alerts of their changes are
+    made then.
+    """
+
+    def __init__(self, thresholds=None, default=DEFAULT_THRESHOLD):
+        """Initialise ReorderQueue object with a dictionary of thresholds
+        by part name (default: read_thresholds()).
+        """
+        if thresholds is None:
+            thresholds = read_thresholds()
+        self.__thresholds = thresholds
+        self.__default = default
+        self.__heap = IndexedHeap()
+        self.__stock = {}
+        # The stock of the Partlist tracked, if other processes change it.
+        self.__shared = None
+        self.__listeners = []
+        self.__alerts = collections.deque(maxlen=ALERTS_KEPT)
+
+    @property
+    def alerts(self):
+        """Return the latest Alert objects, oldest first."""
+        return self.__alerts
+
+    def threshold(self, part_name):
+        """Return the reorder threshold of part_name."""
+        return self.__thresholds.get(part_name, self.__default)
+
+    def __urgency(self, part_name, stock):
+        return (stock / max(self.threshold(part_name), 1), part_name)
+
+    def track(self, partlist):
+        """Order every part of partlist and follow its stock changes."""
+        self.__stock = dict(partlist.stock)
+        self.__heap = IndexedHeap(
+            (part_name, self.__urgency(part_name, stock))
+            for part_name, stock in self.__stock.items())
+        partlist.add_listener(self.update)
+        if partlist.shares_stock:
+            self.__shared = partlist.stock
+
+    def add_listener(self, function):
+        """Call function with every Alert from now on."""
+        self.__listeners.append(function)
+
+    def update(self, part_name, stock):
+        """Record the new stock of part_name (None once it is removed)."""
+        if stock is None:
+            self.__heap.remove(part_name)
+            self.__stock.pop(part_name, None)
+            return
+        threshold = self.threshold(part_name)
+        old = self.__stock.get(part_name)
+        self.__stock[part_name] = stock
+        self.__heap.set(part_name, self.__urgency(part_name, stock))
+        if old is not None and (old <= threshold) != (stock <= threshold):
+            alert = Alert(part_name, stock, threshold, stock <= threshold)
+            self.__alerts.append(alert)
+            for function in self.__listeners:
+                function(alert)
+
+    def refresh(self):
+        """Read the shared stock of the Partlist tracked again, to follow
+        the changes of the other processes. Nothing is read if its stock
+        is not shared.
+        """
+        if self.__shared is None:
+            return
+        stock = dict(self.__shared)
+        for part_name in [part_name for part_name in self.__stock
+                          if part_name not in stock]:
+            self.update(part_name, None)
+        for part_name, quantity in stock.items():
+            if self.__stock.get(part_name) != quantity:
+                self.update(part_name, quantity)
+
+    @icontract.require(lambda k: k >= 0)
+    def urgent(self, k):
+        """Return the Candidate objects of the k most urgent parts."""
+        self.refresh()
+        return [Candidate(part_name, self.__stock[part_name],
+                          self.threshold(part_name))
+                for part_name in self.__heap.smallest(k)]
+
+
+# ---------------------------- Function Definitions ---------------------------
+def read_thresholds(filename=THRESHOLDS_FILE):
+    """Return the reorder thresholds of a 'part name,threshold' csv file,
+    or an empty dictionary if there is no such file.
+    """
+    try:
+        with open(filename, encoding='UTF8', newline='') as infile:
+            return {row[0]: int(row[1]) for row in csv.reader(infile)
+                    if len(row) == 2 and row[1].isdigit()}
+    except FileNotFoundError:
+        return {}
@@ -0,0 +1,255 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  shared_stock.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Keeps the stock of every part in shared memory, so that all
+#               the shop processes of a host see the same counts at once.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import argparse
+import collections.abc
+import fcntl
+import os
+import struct
+import sys
+import tempfile
+import threading
+from multiprocessing import resource_tracker, shared_memory
+
+
+# ------------------------------- Named Constant ------------------------------
+SHARED_NAME = 'computer_shop_stock'
+
+# Parts the shared memory has room for, and bytes of UTF-8 per part name.
+SLOTS = 4096
+NAME_SIZE = 64
+
+# The header holds the number of slots used and the number of slots.
+HEADER = struct.Struct('qq')
+
+# The counter of a part that was removed.
+DELETED = -2 ** 63
+
+
+# ------------------------------ Class Definition -----------------------------
+class SharedStock(collections.abc.MutableMapping):
+    """A stock dictionary kept in shared memory.
+
+    The block holds a header, an array of 64-bit counters and a table of
+    the part name of each slot. Names are given a slot once and keep it;
+    each process caches the slots of the names it has seen. Changes lock
+    their own slot, using a byte-range lock of a lock file, so that
+    processes changing different parts never wait for each other. The
+    first process creates the block; it lasts until unlink() is called.
+    """
+
+    def __init__(self, name=SHARED_NAME, slots=SLOTS):
+        """Initialise SharedStock object, creating the shared memory named
+        name with room for slots parts if no process has created it yet.
+        """
+        self.__name = name
+        self.__lock_file = open(
+            os.path.join(tempfile.gettempdir(), f'{name}.lock'), 'a+b')
+        # fcntl locks belong to the process; this one orders its threads.
+        self.__thread_lock = threading.RLock()
+        self.__slots = {}
+        with self.__locked(-1):
+            try:
+                self.__memory = attach(
+                    name, True, HEADER.size + slots * (8 + NAME_SIZE))
+            except FileExistsError:
+                self.__memory = attach(name)
+            else:
+                HEADER.pack_into(self.__memory.buf, 0, 0, slots)
+            self.__size = HEADER.unpack_from(self.__memory.buf, 0)[1]
+        self.__counters = self.__memory.buf[
+            HEADER.size:HEADER.size + 8 * self.__size].cast('q')
+        self.__names = self.__memory.buf[HEADER.size + 8 * self.__size:]
+
+    @property
+    def name(self):
+        """Return the name attribute."""
+        return self.__name
+
+    def __locked(self, slot):
+        """Return a context manager locking slot (-1 for the name table)."""
+        return SlotLock(self.__lock_file.fileno(), slot + 1,
+                        self.__thread_lock)
+
+    def __refresh(self):
+        """Read the names given a slot by other processes."""
+        used = HEADER.unpack_from(self.__memory.buf, 0)[0]
+        for slot in range(len(self.__slots), used):
+            start = slot * NAME_SIZE
+            raw = bytes(self.__names[start:start + NAME_SIZE])
+            self.__slots[raw.rstrip(b'\0').decode('UTF8')] = slot
+
+    def slot(self, part_name):
+        """Return the slot of part_name, or None."""
+        slot = self.__slots.get(part_name)
+        if slot is None:
+            self.__refresh()
+            slot = self.__slots.get(part_name)
+        return slot
+
+    def __allocate(self, part_name):
+        """Return the slot of part_name, giving it one if it has none.
+
+        The caller holds the lock of the name table.
+        """
+        slot = self.slot(part_name)
+        if slot is None:
+            raw = part_name.encode('UTF8')
+            if len(raw) >= NAME_SIZE:
+                raise ValueError(f'{part_name} is too long to be shared.')
+            slot = len(self.__slots)
+            if slot == self.__size:
+                raise MemoryError(f'The {self.__size} slots of '
+                                  f'{self.__name} are all used.')
+            self.__names[slot * NAME_SIZE:slot * NAME_SIZE + len(raw)] = raw
+            self.__counters[slot] = DELETED
+            HEADER.pack_into(self.__memory.buf, 0, slot + 1, self.__size)
+            self.__slots[part_name] = slot
+        return slot
+
+    def __getitem__(self, part_name):
+        slot = self.slot(part_name)
+        # Read once: another process may delete the part meanwhile.
+        stock = DELETED if slot is None else self.__counters[slot]
+        if stock == DELETED:
+            raise KeyError(part_name)
+        return stock
+
+    def __setitem__(self, part_name, stock):
+        with self.__locked(-1):
+            slot = self.__allocate(part_name)
+        with self.__locked(slot):
+            self.__counters[slot] = stock
+
+    def __delitem__(self, part_name):
+        slot = self.slot(part_name)
+        if slot is None:
+            raise KeyError(part_name)
+        with self.__locked(slot):
+            if self.__counters[slot] == DELETED:
+                raise KeyError(part_name)
+            self.__counters[slot] = DELETED
+
+    def __iter__(self):
+        self.__refresh()
+        return (part_name for part_name, slot in list(self.__slots.items())
+                if self.__counters[slot] != DELETED)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def setdefault(self, part_name, stock=0):
+        """Return the stock of part_name, setting it to stock first if no
+        process has set it.
+        """
+        with self.__locked(-1):
+            slot = self.__allocate(part_name)
+            with self.__locked(slot):
+                if self.__counters[slot] == DELETED:
+                    self.__counters[slot] = stock
+                return self.__counters[slot]
+
+    def adjust(self, part_name, delta):
+        """Add delta (negative to take) to the stock of part_name and
+        return the new stock, atomically for every process.
+
+        Raise ValueError if that would leave less than nothing in stock.
+        """
+        slot = self.slot(part_name)
+        if slot is None:
+            raise KeyError(part_name)
+        with self.__locked(slot):
+            stock = self.__counters[slot]
+            if stock == DELETED:
+                raise KeyError(part_name)
+            if stock + delta < 0:
+                raise ValueError(f'Not enough of {part_name} in stock!')
+            self.__counters[slot] = stock + delta
+        return stock + delta
+
+    def close(self):
+        """Detach this process from the shared memory."""
+        if not self.__lock_file.closed:
+            self.__counters.release()
+            self.__names.release()
+            self.__memory.close()
+            self.__lock_file.close()
+
+    def __del__(self):
+        # The memoryviews must be released before the shared memory is.
+        self.close()
+
+    def unlink(self):
+        """Destroy the shared memory once every process has closed it."""
+        if sys.version_info < (3, 13):
+            # unlink() unregisters it from the resource tracker again.
+            resource_tracker.register(self.__memory._name, 'shared_memory')
+        self.__memory.unlink()
+
+
+class SlotLock:
+    """Locks one byte of a lock file, and a thread lock, while in use."""
+
+    def __init__(self, fd, offset, thread_lock):
+        """Initialise SlotLock object."""
+        self.__fd = fd
+        self.__offset = offset
+        self.__thread_lock = thread_lock
+
+    def __enter__(self):
+        self.__thread_lock.acquire()
+        fcntl.lockf(self.__fd, fcntl.LOCK_EX, 1, self.__offset)
+
+    def __exit__(self, *exc_info):
+        fcntl.lockf(self.__fd, fcntl.LOCK_UN, 1, self.__offset)
+        self.__thread_lock.release()
+
+
+# ---------------------------- Function Definitions ---------------------------
+def attach(name, create=False, size=0):
+    """Return the SharedMemory named name, created if create is True.
+
+    It is not tracked: the shared memory must outlive the process that
+    created it, until unlink() is called.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, create, size, track=False)
+    # Before Python 3.13, every process would unlink it at exit.
+    memory = shared_memory.SharedMemory(name, create, size)
+    resource_tracker.unregister(memory._name, 'shared_memory')
+    return memory
+
+
+# ---------------------------------- Program ----------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Show or remove the shared stock of the shop.')
+    parser.add_argument('--name', default=SHARED_NAME,
+                        help=f'shared memory name (default {SHARED_NAME})')
+    parser.add_argument('--unlink', action='store_true',
+                        help='remove the shared memory; the next shop '
+                             'process reads the stock from its csv again')
+    args = parser.parse_args()
+
+    stock = SharedStock(args.name)
+    if args.unlink:
+        stock.unlink()
+        print(f'Removed {args.name}.')
+    else:
+        for part_name, quantity in stock.items():
+            print(f'{part_name}: {quantity}')
+    stock.close()
@@ -0,0 +1,381 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  stock_ledger.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Records every stock movement as an event of a binary ledger
+#               with checkpoints, to answer the stock of a part at any time.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import argparse
+import bisect
+import collections
+import datetime
+import os
+import struct
+import time
+
+# Third party
+import icontract
+
+# Local application/library specific imports
+from file_lock import FileLock
+
+
+# ------------------------------- Named Constant ------------------------------
+LEDGER_FILE = 'database/stock.ledger'
+
+# Kinds of event, and the change each makes to the stock. COUNT sets the
+# stock (e.g. when a part is first seen) and REMOVE takes the part away.
+COUNT, RESTOCK, HOLD, RELEASE, PURCHASE, REMOVE = range(6)
+KINDS = ('count', 'restock', 'hold', 'release', 'purchase', 'remove')
+SIGNS = {RESTOCK: 1, HOLD: -1, RELEASE: 1, PURCHASE: 0}
+
+# An event: nanoseconds since the epoch, kind, part number and quantity.
+EVENT = struct.Struct('<qBIi')
+
+# The header of the checkpoints file: its generation, one more than the
+# one a compaction replaced, so a compaction is noticed even if the new
+# files reuse an inode.
+GENERATION = struct.Struct('<Q')
+
+# A checkpoint: time, ledger offset and number of parts, followed by the
+# (part number, stock) of each part.
+CHECKPOINT = struct.Struct('<qQI')
+PART_STOCK = struct.Struct('<Ii')
+
+# Events between two checkpoints; a query replays at most that many.
+CHECKPOINT_EVERY = 1000
+
+Event = collections.namedtuple(
+    'Event', ['time', 'kind', 'part_name', 'quantity'])
+
+
+# ------------------------------ Class Definition -----------------------------
+class StockLedger:
+    """An append-only ledger of stock movements.
+
+    <filename> holds fixed-size events, <filename>.names the part name of
+    each part number and <filename>.checkpoints the whole stock every
+    checkpoint_every events. The stock at a time is the last checkpoint
+    before it, plus the replay of the events after that checkpoint, which
+    are at most checkpoint_every. Only the checkpoint headers and the
+    events since the last checkpoint are read when the ledger is opened.
+
+    Several processes may share the files. Every change is made under the
+    lock of <filename>.lock, after reading the names, checkpoints and
+    events the other processes added, so part numbers are given once and
+    checkpoints hold every process's events. A compaction by another
+    process is noticed by the generation of the checkpoints file, and the
+    files are then read again.
+    """
+
+    @icontract.require(
+        lambda filename: isinstance(filename, str) & (filename != ''))
+    @icontract.require(lambda checkpoint_every: checkpoint_every >= 1)
+    def __init__(self, filename=LEDGER_FILE,
+                 checkpoint_every=CHECKPOINT_EVERY):
+        """Initialise StockLedger object, creating its files if needed."""
+        self.__filename = filename
+        self.__checkpoint_every = checkpoint_every
+        self.__names = []
+        self.__numbers = {}
+        self.__names_size = 0
+        # The generation of the files the state below was read from.
+        self.__generation = None
+        with self.__locked():
+            for suffix in ('', '.names'):
+                open(filename + suffix, 'ab').close()
+            with open(filename + '.checkpoints', 'ab') as outfile:
+                if not outfile.tell():
+                    outfile.write(GENERATION.pack(0))
+            self.__refresh()
+
+    @property
+    def filename(self):
+        """Return the filename attribute."""
+        return self.__filename
+
+    def __locked(self, shared=False):
+        """Return the lock of the ledger files."""
+        return FileLock(self.__filename + '.lock', shared)
+
+    def __refresh(self):
+        """Read what other processes added to the files since the last
+        refresh. The caller holds the lock.
+        """
+        with open(self.__filename + '.names', 'rb') as infile:
+            infile.seek(self.__names_size)
+            data = infile.read()
+        # Only whole lines; a name is written with its newline.
+        data = data[:data.rfind(b'\n') + 1]
+        self.__names_size += len(data)
+        for part_name in data.decode('UTF8').splitlines():
+            self.__numbers[part_name] = len(self.__names)
+            self.__names.append(part_name)
+
+        with open(self.__filename + '.checkpoints', 'rb') as infile:
+            generation = GENERATION.unpack(infile.read(GENERATION.size))[0]
+        if generation != self.__generation:
+            # New, or compacted: start again from the last checkpoint.
+            self.__generation = generation
+            # Time, file position and ledger offset of every checkpoint.
+            self.__times = []
+            self.__positions = []
+            self.__offsets = []
+            self.__checkpoints_size = GENERATION.size
+            self.__read_checkpoints()
+            index = len(self.__times) - 1
+            self.__stock = self.__checkpoint(index)
+            self.__offset = self.__offsets[index] if index >= 0 else 0
+        else:
+            self.__read_checkpoints()
+        for event in self.__events(self.__offset):
+            apply(self.__stock, *event[1:])
+            self.__offset += EVENT.size
+
+    def __read_checkpoints(self):
+        """Read the headers of the checkpoints written since the last
+        read.
+        """
+        with open(self.__filename + '.checkpoints', 'rb') as infile:
+            infile.seek(self.__checkpoints_size)
+            header = infile.read(CHECKPOINT.size)
+            while len(header) == CHECKPOINT.size:
+                at, offset, parts = CHECKPOINT.unpack(header)
+                self.__times.append(at)
+                self.__positions.append(infile.tell() - CHECKPOINT.size)
+                self.__offsets.append(offset)
+                infile.seek(parts * PART_STOCK.size, os.SEEK_CUR)
+                self.__checkpoints_size = infile.tell()
+                header = infile.read(CHECKPOINT.size)
+
+    def __since_checkpoint(self):
+        """Return the number of events after the last checkpoint."""
+        last = self.__offsets[-1] if self.__offsets else 0
+        return (self.__offset - last) // EVENT.size
+
+    def __number(self, part_name):
+        """Return the number of part_name, given to it if it has none.
+
+        The caller holds the lock and has refreshed the names.
+        """
+        number = self.__numbers.get(part_name)
+        if number is None:
+            with open(self.__filename + '.names', 'ab') as outfile:
+                outfile.write((part_name + '\n').encode('UTF8'))
+            self.__refresh()
+            number = self.__numbers[part_name]
+        return number
+
+    def __checkpoint(self, index):
+        """Return the stock by part number of checkpoint index."""
+        if index < 0:
+            return {}
+        with open(self.__filename + '.checkpoints', 'rb') as infile:
+            infile.seek(self.__positions[index])
+            parts = CHECKPOINT.unpack(infile.read(CHECKPOINT.size))[2]
+            body = infile.read(parts * PART_STOCK.size)
+        return dict(PART_STOCK.iter_unpack(body))
+
+    def __events(self, start=0, end=None):
+        """Yield the events between the ledger offsets start and end
+        (default: the end of the ledger).
+        """
+        with open(self.__filename, 'rb') as infile:
+            infile.seek(start)
+            data = infile.read(-1 if end is None else end - start)
+        # A torn last event (e.g. after a crash) is ignored.
+        data = data[:len(data) - len(data) % EVENT.size]
+        yield from EVENT.iter_unpack(data)
+
+    def __state(self, index, until=None):
+        """Return the stock by part number at checkpoint index, replayed up
+        to the time until (default: every event).
+        """
+        stock = self.__checkpoint(index)
+        start = self.__offsets[index] if index >= 0 else 0
+        end = (self.__offsets[index + 1] if index + 1 < len(self.__offsets)
+               else None)
+        for at, kind, number, quantity in self.__events(start, end):
+            if until is not None and at > until:
+                break
+            apply(stock, kind, number, quantity)
+        return stock
+
+    def record(self, kind, part_name, quantity, at=None):
+        """Append an event of kind (e.g. HOLD) for quantity units of
+        part_name, at the time at in nanoseconds (default: now).
+        """
+        with self.__locked():
+            # Taken under the lock, so that the events of every process
+            # are appended in time order.
+            at = time.time_ns() if at is None else at
+            self.__refresh()
+            number = self.__number(part_name)
+            with open(self.__filename, 'r+b') as outfile:
+                # A torn last event (e.g. after a crash) is written over.
+                outfile.seek(self.__offset)
+                outfile.write(EVENT.pack(at, kind, number, quantity))
+                outfile.truncate()
+            self.__offset += EVENT.size
+            apply(self.__stock, kind, number, quantity)
+            if self.__since_checkpoint() >= self.__checkpoint_every:
+                self.__write_checkpoint(at)
+
+    def checkpoint(self, at=None):
+        """Write the whole stock as a checkpoint at the time at."""
+        with self.__locked():
+            self.__refresh()
+            self.__write_checkpoint(time.time_ns() if at is None else at)
+
+    def __write_checkpoint(self, at):
+        """Write a checkpoint; the caller holds the lock."""
+        with open(self.__filename + '.checkpoints', 'ab') as outfile:
+            position = outfile.tell()
+            outfile.write(CHECKPOINT.pack(at, self.__offset,
+                                          len(self.__stock)))
+            outfile.write(b''.join(PART_STOCK.pack(number, stock)
+                                   for number, stock in self.__stock.items()))
+            self.__checkpoints_size = outfile.tell()
+        self.__times.append(at)
+        self.__positions.append(position)
+        self.__offsets.append(self.__offset)
+
+    def sync(self, stock, at=None):
+        """Record a COUNT for every part whose stock in the dictionary
+        stock differs from the one of the ledger.
+        """
+        for part_name, quantity in stock.items():
+            if self.stock(part_name) != quantity:
+                self.record(COUNT, part_name, quantity, at)
+
+    def stock(self, part_name):
+        """Return the current stock of part_name, or None if unknown."""
+        with self.__locked(shared=True):
+            self.__refresh()
+        number = self.__numbers.get(part_name)
+        return None if number is None else self.__stock.get(number)
+
+    def stock_at(self, part_name, at):
+        """Return the stock of part_name at the time at (a datetime or
+        nanoseconds), or None if the part was unknown then.
+
+        Only the last checkpoint before at and the events after it are
+        read.
+        """
+        if isinstance(at, datetime.datetime):
+            at = int(at.timestamp() * 1e9)
+        with self.__locked(shared=True):
+            self.__refresh()
+            number = self.__numbers.get(part_name)
+            if number is None:
+                return None
+            index = bisect.bisect_right(self.__times, at) - 1
+            return self.__state(index, at).get(number)
+
+    def history(self, part_name):
+        """Return every Event of part_name still in the ledger."""
+        with self.__locked(shared=True):
+            self.__refresh()
+            number = self.__numbers.get(part_name)
+            if number is None:
+                return []
+            return [Event(at, KINDS[kind], part_name, quantity)
+                    for at, kind, event_number, quantity in self.__events()
+                    if event_number == number]
+
+    def compact(self, before):
+        """Drop the events before the time before (nanoseconds), keeping a
+        checkpoint of the stock at that time, and rewrite the checkpoints
+        so that no replay is longer than checkpoint_every events.
+
+        The stock of an earlier time is no longer known. Return the number
+        of events dropped.
+        """
+        with self.__locked():
+            self.__refresh()
+            stock = self.__state(
+                bisect.bisect_right(self.__times, before) - 1, before)
+            events = list(self.__events())
+            kept = [event for event in events if event[0] > before]
+
+            ledger_tmp = self.__filename + '.tmp'
+            checkpoints_tmp = self.__filename + '.checkpoints.tmp'
+            with open(ledger_tmp, 'wb') as ledger, \
+                    open(checkpoints_tmp, 'wb') as checkpoints:
+                checkpoints.write(GENERATION.pack(self.__generation + 1))
+                for index in range(len(kept) + 1):
+                    if index % self.__checkpoint_every == 0:
+                        at = before if index == 0 else kept[index - 1][0]
+                        checkpoints.write(CHECKPOINT.pack(at, ledger.tell(),
+                                                          len(stock)))
+                        checkpoints.write(b''.join(
+                            PART_STOCK.pack(number, quantity)
+                            for number, quantity in stock.items()))
+                    if index < len(kept):
+                        ledger.write(EVENT.pack(*kept[index]))
+                        apply(stock, *kept[index][1:])
+            os.replace(checkpoints_tmp, self.__filename + '.checkpoints')
+            os.replace(ledger_tmp, self.__filename)
+            self.__refresh()
+        return len(events) - len(kept)
+
+    def close(self):
+        """Close the ledger; every change is already written."""
+
+
+# ---------------------------- Function Definitions ---------------------------
+def apply(stock, kind, number, quantity):
+    """Apply an event to a dictionary of stock by part number."""
+    if kind == COUNT:
+        stock[number] = quantity
+    elif kind == REMOVE:
+        stock.pop(number, None)
+    else:
+        stock[number] = stock.get(number, 0) + SIGNS[kind] * quantity
+
+
+def parse_time(text):
+    """Return the nanoseconds of a local 'YYYY-MM-DD[ HH:MM[:SS]]' time."""
+    return int(datetime.datetime.fromisoformat(text).timestamp() * 1e9)
+
+
+# ---------------------------------- Program ----------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Query or compact the stock ledger.')
+    parser.add_argument('--file', default=LEDGER_FILE, help='ledger file')
+    parser.add_argument('--part', help='part name to query')
+    parser.add_argument('--at', help="local time 'YYYY-MM-DD[ HH:MM]' of "
+                                     'the stock of --part (default: now)')
+    parser.add_argument('--history', action='store_true',
+                        help='list every movement of --part')
+    parser.add_argument('--compact', metavar='DAYS', type=float,
+                        help='drop the events older than DAYS days')
+    args = parser.parse_args()
+
+    ledger = StockLedger(args.file)
+    if args.part and args.history:
+        for event in ledger.history(args.part):
+            moment = datetime.datetime.fromtimestamp(event.time / 1e9)
+            print(f'{moment:%Y-%m-%d %H:%M:%S} {event.kind:>8} '
+                  f'{event.quantity}')
+    elif args.part:
+        if args.at:
+            stock = ledger.stock_at(args.part, parse_time(args.at))
+        else:
+            stock = ledger.stock(args.part)
+        print(f'{args.part}: {"unknown" if stock is None else stock}')
+    if args.compact is not None:
+        before = time.time_ns() - int(args.compact * 86400e9)
+        print(f'Dropped {ledger.compact(before)} events.')
+    ledger.close()
@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  test_aggregates.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  A pytest for the SalesAggregates class.
+#
+# =============================================================================
+
+# ------------------------------- Module Imports ------------------------------
+# Stdlib
+import datetime
+
+# Third party
+import pytest
+
+# Local application/library specific imports
+from aggregates import SalesAggregates
+
+
+# ---------------------------- Function Definitions ---------------------------
+@pytest.fixture()
+def aggregates(tmp_path):
+    return SalesAggregates(str(tmp_path / 'aggregates.json'))
+
+
+def test_record_order(aggregates):
+    aggregates.record_order('gary', [
+        ('AMD Ryzen 5', 'CPU', 119.99, 2),
+        ('Toshiba P300', 'Storage', 115.0, 1),
+    ], day='2026-10-19')
+
+    assert aggregates.part_units('AMD Ryzen 5') == 2
+    assert aggregates.part_revenue('AMD Ryzen 5') == pytest.approx(239.98)
+    assert aggregates.type_units('Storage') == 1
+    assert aggregates.daily_total('2026-10-19') == (3, pytest.approx(354.98))
+    assert aggregates.customer_spend('gary') == pytest.approx(354.98)
+    assert aggregates.customer_spend('susan') == 0
+
+
+def test_load_lazily(aggregates):
+    aggregates.record_order('gary', [('AMD Ryzen 5', 'CPU', 119.99, 1)])
+
+    reloaded = SalesAggregates(aggregates.filename)
+    assert reloaded.part_units('AMD Ryzen 5') == 1
+    assert reloaded.customer_spend('gary') == pytest.approx(119.99)
+
+
+def test_shared_by_processes(aggregates):
+    # Two processes loaded the totals before either recorded an order.
+    other = SalesAggregates(aggregates.filename)
+    assert aggregates.part_units('AMD Ryzen 5') == other.part_units(
+        'AMD Ryzen 5') == 0
+    aggregates.record_order('gary', [('AMD Ryzen 5', 'CPU', 119.99, 1)])
+    other.record_order('susan', [('AMD Ryzen 5', 'CPU', 119.99, 2)])
+
+    reloaded = SalesAggregates(aggregates.filename)
+    assert reloaded.part_units('AMD Ryzen 5') == 3
+    assert reloaded.customer_spend('gary') == pytest.approx(119.99)
+
+
+def test_check(aggregates, tmp_path):
+    receipts = tmp_path / 'receipts'
+    receipts.mkdir()
+    (receipts / 'gary.csv').write_text('CPU,AMD Ryzen 5,119.99,4,3.2,x2\n')
+    aggregates.record_order('gary', [('AMD Ryzen 5', 'CPU', 119.99, 2)],
+                            day=datetime.date.today().isoformat())
+    assert aggregates.check(str(receipts)) == {}
+
+    aggregates.record_order('gary', [('AMD Ryzen 5', 'CPU', 119.99, 1)])
+    assert ('part_units', 'AMD Ryzen 5') in aggregates.check(str(receipts))
@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  test_analytics.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  A pytest for the sales analytics.
+#
+# =============================================================================
+
+# ------------------------------- Module Imports ------------------------------
+# Third party
+import pytest
+
+# Local application/library specific imports
+import analytics
+
+
+# ---------------------------- Function Definitions ---------------------------
+@pytest.fixture()
+def receipts_dir(tmp_path):
+    (tmp_path / 'gary.csv').write_text(
+        'CPU,AMD Ryzen 5,119.99,4,3.2,x1\n'
+        'Storage,Toshiba P300,115.0,3000,HDD,x2\n'
+    )
+    (tmp_path / 'susan.csv').write_text(
+        'CPU,AMD Ryzen 5,119.99,4,3.2,x3\n'
+        'Unknown,Not a part,1.0,x1\n'
+    )
+    return str(tmp_path)
+
+
+def test_analyse(receipts_dir):
+    summary = analytics.analyse(receipts_dir, workers=1)
+    assert summary.units == {'AMD Ryzen 5': 4, 'Toshiba P300': 2}
+    assert summary.top_sellers(1) == [('AMD Ryzen 5', 4)]
+    assert summary.type_revenue['Storage'] == pytest.approx(230.0)
+    assert summary.type_revenue['CPU'] == pytest.approx(479.96)
+
+
+def test_analyse_in_parallel(receipts_dir):
+    sequential = analytics.analyse(receipts_dir, workers=1)
+    parallel = analytics.analyse(receipts_dir, workers=2)
+    assert parallel.units == sequential.units
+    assert parallel.revenue == sequential.revenue
@@ -0,0 +1,109 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  test_authenticator.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  A pytest for the password records of the Authenticator.
+#
+# =============================================================================
+
+# ------------------------------- Module Imports ------------------------------
+# Third party
+import pytest
+
+# Local application/library specific imports
+import authenticator
+from authenticator import Authenticator, legacy_digest
+from exceptions import (EmailAlreadyExists, InvalidPassword, InvalidUsername,
+                        UsernameAlreadyExists)
+
+
+# ---------------------------- Function Definitions ---------------------------
+@pytest.fixture()
+def cheap_kdf():
+    # Low costs keep the test fast; the records work the same way.
+    kdf = authenticator.KDF
+    authenticator.set_kdf('pbkdf2_sha256', 1000)
+    yield
+    authenticator.KDF = kdf
+
+
+def test_upgrade_on_login(tmp_path, cheap_kdf):
+    users_file = tmp_path / 'users.csv'
+    users_file.write_text('Username,Email,Password (encoded)\n'
+                          'gary,gary@gmail.com,'
+                          f'{legacy_digest("gary", "garypassword")}\n')
+
+    auth = Authenticator(str(users_file))
+    with pytest.raises(InvalidPassword):
+        auth.login('gary', 'wrong password')
+    auth.login('gary', 'garypassword')
+    auth.store.flush()
+
+    # The legacy digest was replaced by a salted record, which is loaded.
+    record = Authenticator(str(users_file)).users['gary'].password.password
+    assert record.startswith('pbkdf2_sha256$1000$')
+    assert not Authenticator(str(users_file)).login('gary', 'garypassword')
+
+    # A record of another KDF is still accepted, then upgraded.
+    authenticator.set_kdf('scrypt', 2**10, 8, 1)
+    auth = Authenticator(str(users_file))
+    auth.login('gary', 'garypassword')
+    assert auth.users['gary'].password.password.startswith('scrypt$1024$8$1$')
+
+
+def test_async(tmp_path, cheap_kdf):
+    users_file = tmp_path / 'users.csv'
+    users_file.write_text('Username,Email,Password (encoded)\n')
+    auth = Authenticator(str(users_file))
+    signups = [auth.add_user_async(f'user{number}',
+                                   f'user{number}@gmail.com', 'password')
+               for number in range(4)]
+    assert [future.result() for future in signups] == [None] * 4
+    assert auth.verify_async('user0', 'password').result()
+    assert not auth.verify_async('user0', 'wrong password').result()
+    assert not auth.verify_async('nobody', 'password').result()
+
+    # The logins wait together; each one ends with its own outcome.
+    logins = [auth.login_async(f'user{number}', 'password')
+              for number in range(4)]
+    failed = auth.login_async('user0', 'wrong password')
+    unknown = auth.login_async('nobody', 'password')
+    assert [future.result() for future in logins] == [None] * 4
+    assert all(auth.is_logged_in(f'user{number}') for number in range(4))
+    with pytest.raises(InvalidPassword):
+        failed.result()
+    with pytest.raises(InvalidUsername):
+        unknown.result()
+
+
+@pytest.mark.parametrize('filename', ['users.csv', 'users.db'])
+def test_concurrent_signups(tmp_path, cheap_kdf, filename):
+    users_file = tmp_path / filename
+    if filename.endswith('.csv'):
+        users_file.write_text('Username,Email,Password (encoded)\n')
+    auth = Authenticator(str(users_file))
+    signups = [auth.add_user_async('bob', f'bob{number}@gmail.com',
+                                   'password') for number in range(4)]
+    signups.append(auth.add_user_async('rob', 'bob0@gmail.com', 'password'))
+    errors = [future.exception() for future in signups]
+    # The first signup reserves the username and the email at once.
+    assert errors[0] is None
+    assert all(isinstance(error, UsernameAlreadyExists)
+               for error in errors[1:4])
+    assert isinstance(errors[4], EmailAlreadyExists)
+    assert auth.users['bob'].email == 'bob0@gmail.com'
+
+    # A refused signup leaves its username free.
+    auth.add_user('rob', 'rob@gmail.com', 'password')
+
+
+def test_set_kdf():
+    with pytest.raises(ValueError):
+        authenticator.set_kdf('md5', 1)
+    with pytest.raises(ValueError):
+        authenticator.set_kdf('scrypt', 2**10)
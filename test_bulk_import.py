@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  test_bulk_import.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  A pytest for the bulk import of customers.
+#
+# =============================================================================
+
+# ------------------------------- Module Imports ------------------------------
+# Stdlib
+import shutil
+
+# Third party
+import pytest
+
+# Local application/library specific imports
+from authenticator import Authenticator
+from bulk_import import import_users
+
+
+# ---------------------------- Function Definitions ---------------------------
+@pytest.mark.parametrize('workers', [1, 2])
+def test_import_users(tmp_path, workers):
+    shutil.copy('database/users.csv', tmp_path / 'users.csv')
+    users_file = str(tmp_path / 'users.csv')
+    records = [(f'partner{number}', f'partner{number}@gmail.com',
+                f'password{number}') for number in range(25)]
+    records += [
+        ('henry', 'henry@gmail.com', 'password'),
+        ('partner0', 'again@gmail.com', 'password'),
+        ('short', 'short@gmail.com', 'pw'),
+        ('bad', 'not an email', 'password'),
+    ]
+
+    imported, rejected = import_users(Authenticator(users_file), records,
+                                      workers=workers, chunksize=4)
+    assert imported == 25
+    assert [reason for _, reason in rejected] == [
+        'UsernameAlreadyExists', 'UsernameAlreadyExists',
+        'PasswordTooShort', 'InappropriateEmail',
+    ]
+
+    # Stored in order, and able to log in once read back.
+    authenticator = Authenticator(users_file)
+    assert list(authenticator.users)[-25:] == [
+        f'partner{number}' for number in range(25)]
+    authenticator.login('partner7', 'password7')
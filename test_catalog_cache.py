@@ -0,0 +1,40 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  test_catalog_cache.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  A pytest for the catalog cache.
+#
+# =============================================================================
+
+# ------------------------------- Module Imports ------------------------------
+# Stdlib
+import shutil
+
+# Local application/library specific imports
+import main
+
+
+# ---------------------------- Function Definitions ---------------------------
+def test_read_cached(tmp_path):
+    shutil.copy('database/database.csv', tmp_path / 'database.csv')
+    directory = str(tmp_path)
+
+    parsed = main.Partlist.read_cached(directory=directory)
+    assert (tmp_path / 'database.cache').exists()
+    cached = main.Partlist.read_cached(directory=directory)
+    assert str(cached) == str(parsed)
+    assert cached.stock == parsed.stock
+    assert [type(item) for item in cached.items] \
+        == [type(item) for item in parsed.items]
+
+    # A changed csv file is parsed again.
+    with open(tmp_path / 'database.csv', mode='a', encoding='UTF8') as file:
+        file.write('CPU,Intel i9,599.0,8,3.6,x2\n')
+    changed = main.Partlist.read_cached(directory=directory)
+    assert changed.stock['Intel i9'] == 2
+    assert len(changed) == len(parsed) + 1
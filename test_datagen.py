@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  test_datagen.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  A pytest for the synthetic database of the benchmarks.
+#
+# =============================================================================
+
+# ------------------------------- Module Imports ------------------------------
+# Stdlib
+import collections
+import csv
+import os
+
+# Local application/library specific imports
+import main
+from benchmarks import datagen
+
+
+# ---------------------------- Function Definitions ---------------------------
+def read_tree(directory):
+    """Return the contents of every file under directory, by path."""
+    contents = {}
+    for root, _, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(root, name)
+            with open(path, 'rb') as infile:
+                contents[os.path.relpath(path, directory)] = infile.read()
+    return contents
+
+
+def test_same_seed_same_files(tmp_path):
+    for name, seed in (('first', 7), ('second', 7), ('other', 8)):
+        datagen.generate(str(tmp_path / name), parts=2000, users=200,
+                         receipts=300, receipt_files=10, seed=seed)
+    first = read_tree(tmp_path / 'first')
+    assert len(first) == 2 + 10
+    assert first == read_tree(tmp_path / 'second')
+    assert first != read_tree(tmp_path / 'other')
+
+
+def test_catalog_coverage(tmp_path):
+    directory = str(tmp_path)
+    datagen.generate(directory, parts=2000, users=0, receipts=0)
+    with open(os.path.join(directory, 'database.csv'), encoding='UTF8',
+              newline='') as infile:
+        rows = list(csv.reader(infile))
+    assert {row[0] for row in rows} == set(datagen.PART_TYPES)
+    assert any(row[-1] == 'OUT OF STOCK' for row in rows)
+    rows_of = collections.defaultdict(list)
+    for row in rows:
+        rows_of[row[1]].append(row)
+    duplicates = [name for name in rows_of if len(rows_of[name]) > 1]
+    assert duplicates
+
+    # A duplicate adds one unit to the stock of its first row.
+    stock = main.Partlist.read_from_csv(directory=directory).stock
+    for name in duplicates:
+        first = rows_of[name][0][-1]
+        first = 0 if first == 'OUT OF STOCK' else int(first[1:])
+        assert stock[name] == first + len(rows_of[name]) - 1
+
+
+def test_malformed_rows_skipped(tmp_path):
+    directory = str(tmp_path)
+    datagen.generate(directory, parts=2000, users=0, receipts=0,
+                     duplicate_rate=0.0, malformed_rate=0.05)
+    with open(os.path.join(directory, 'database.csv'), encoding='UTF8',
+              newline='') as infile:
+        rows = [row for row in csv.reader(infile) if row]
+    partlist = main.Partlist.read_from_csv(directory=directory)
+    assert partlist.skipped_rows > 0
+    assert len(partlist.items) + partlist.skipped_rows == len(rows)
@@ -0,0 +1,30 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  test_file_lock.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  A pytest for the FileLock class.
+#
+# =============================================================================
+
+# ------------------------------- Module Imports ------------------------------
+# Local application/library specific imports
+import file_lock
+from forecast import DemandForecast
+
+
+# ---------------------------- Function Definitions ---------------------------
+def test_without_fcntl(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_lock, 'fcntl', None)
+    with file_lock.FileLock(str(tmp_path / 'files.lock')):
+        pass
+    assert not (tmp_path / 'files.lock').exists()
+
+    # The files are still written, by one process at a time.
+    forecast = DemandForecast(str(tmp_path / 'forecast.bin'))
+    forecast.record_order([('AMD Ryzen 5', 2)], '2026-10-19')
+    assert DemandForecast(forecast.filename).names == ['AMD Ryzen 5']
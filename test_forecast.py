@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  test_forecast.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  A pytest for the DemandForecast class.
+#
+# =============================================================================
+
+# ------------------------------- Module Imports ------------------------------
+# Stdlib
+import datetime
+import math
+
+# Third party
+import pytest
+
+# Local application/library specific imports
+from forecast import RECORD, DemandForecast
+
+
+# ---------------------------- Function Definitions ---------------------------
+@pytest.fixture()
+def forecast(tmp_path):
+    return DemandForecast(str(tmp_path / 'forecast.bin'))
+
+
+def sell(forecast, days, start=datetime.date(2026, 10, 5)):
+    """Sell 2 'AMD Ryzen 5' a day, 6 on Saturdays, and 1 'Intel Core i3'."""
+    for offset in range(days):
+        day = start + datetime.timedelta(days=offset)
+        forecast.record_order(
+            [('AMD Ryzen 5', 6 if day.weekday() == 5 else 2),
+             ('Intel Core i3', 1)], day.isoformat())
+
+
+def test_steady_demand(forecast):
+    sell(forecast, 28)
+    # The last day is pending; it counts as if it were over.
+    units = forecast.daily_units('2026-11-01')
+    assert units['Intel Core i3'] == pytest.approx(1)
+    days = forecast.days_until_stockout(
+        {'Intel Core i3': 3, 'AMD Ryzen 5': 0, 'Kingston HyperX': 4},
+        '2026-11-01')
+    assert days == {'Intel Core i3': pytest.approx(3),
+                    'AMD Ryzen 5': 0, 'Kingston HyperX': math.inf}
+
+
+def test_seasonality(forecast):
+    sell(forecast, 28)
+    saturday = forecast.daily_units('2026-10-31')['AMD Ryzen 5']
+    monday = forecast.daily_units('2026-11-02')['AMD Ryzen 5']
+    assert saturday > 1.5 * monday
+    # A week of demand is about 18 units: 6 on Saturday and 2 otherwise.
+    days = forecast.days_until_stockout({'AMD Ryzen 5': 36}, '2026-11-01')
+    assert days['AMD Ryzen 5'] == pytest.approx(14, abs=1)
+
+
+def test_no_sales_decay(forecast):
+    sell(forecast, 7)
+    before = forecast.daily_units('2026-10-11')['Intel Core i3']
+    after = forecast.daily_units('2026-10-31')['Intel Core i3']
+    assert after < before / 10
+
+
+def test_persist(forecast):
+    sell(forecast, 10)
+    expected = forecast.days_until_stockout({'AMD Ryzen 5': 30}, '2026-10-20')
+    reloaded = DemandForecast(forecast.filename)
+    assert reloaded.names == ['AMD Ryzen 5', 'Intel Core i3']
+    assert reloaded.days_until_stockout(
+        {'AMD Ryzen 5': 30}, '2026-10-20') == expected
+    with open(forecast.filename, 'rb') as infile:
+        assert len(infile.read()) == 2 * RECORD.size
+
+
+def test_shared_by_processes(forecast):
+    # Two processes loaded the forecast before either recorded an order.
+    other = DemandForecast(forecast.filename)
+    assert forecast.names == other.names == []
+    forecast.record_order([('AMD Ryzen 5', 3)], '2026-10-19')
+    other.record_order([('Intel Core i3', 2)], '2026-10-19')
+    other.record_order([('AMD Ryzen 5', 1)], '2026-10-19')
+    assert forecast.daily_units('2026-10-19') == {
+        'AMD Ryzen 5': pytest.approx(4), 'Intel Core i3': pytest.approx(2)}
@@ -0,0 +1,51 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  test_memory.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  A pytest for the MemoryTracker class.
+#
+# =============================================================================
+
+# ------------------------------- Module Imports ------------------------------
+# Stdlib
+import json
+
+# Local application/library specific imports
+from memory import MemoryTracker
+
+
+# ---------------------------- Function Definitions ---------------------------
+kept = []
+
+
+def leak():
+    kept.append(bytearray(4096))
+
+
+def no_leak():
+    bytearray(4096)
+
+
+def test_leaks(tmp_path):
+    tracker = MemoryTracker()
+    leaking = tracker.tracked('leak', leak)
+    for _ in range(3):
+        leaking()
+        tracker.measure('no_leak', no_leak)
+    tracker.stop()
+
+    assert list(tracker.leaks()) == ['leak']
+    assert min(tracker.growth['leak']) >= 4096
+    (filename, lineno), size = tracker.top_sites('leak', 1)[0]
+    assert filename.endswith('test_memory.py') and size >= 3 * 4096
+
+    tracker.per_object('bytearray', 'leak', 1)
+    tracker.write(str(tmp_path / 'memory.json'))
+    report = json.loads((tmp_path / 'memory.json').read_text())
+    assert report['bytes_per_object']['bytearray'] >= 4096
+    assert report['operations']['no_leak']['calls'] == 3
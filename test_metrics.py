@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  test_metrics.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  A pytest for the Metrics class.
+#
+# =============================================================================
+
+# ------------------------------- Module Imports ------------------------------
+# Stdlib
+import json
+import threading
+
+# Third party
+import pytest
+
+# Local application/library specific imports
+from metrics import Metrics
+
+
+# ---------------------------- Function Definitions ---------------------------
+class Command:
+    def __init__(self, fail=False):
+        if fail:
+            raise ValueError('Failed.')
+
+
+class SubCommand(Command):
+    def __init__(self):
+        super().__init__()
+
+
+def test_instrument():
+    metrics = Metrics()
+    metrics.instrument(Command, ['__init__'])
+    metrics.instrument(SubCommand, ['__init__'])
+
+    Command()
+    SubCommand()
+    with pytest.raises(ValueError):
+        Command(fail=True)
+
+    # SubCommand calling super().__init__() is not counted as a Command.
+    assert metrics.calls == {'Command': 2, 'SubCommand': 1}
+    assert metrics.errors == {'Command': 1}
+
+
+def test_write(tmp_path):
+    metrics = Metrics()
+    metrics.observe('login', 0.002)
+    metrics.observe('login', 20.0, failed=True)
+
+    metrics.write(str(tmp_path / 'metrics.prom'))
+    text = (tmp_path / 'metrics.prom').read_text()
+    assert 'shop_calls_total{operation="login"} 2' in text
+    assert 'shop_latency_seconds_bucket{operation="login",le="0.0025"} 1' \
+        in text
+    assert 'shop_latency_seconds_bucket{operation="login",le="+Inf"} 2' \
+        in text
+
+    metrics.write(str(tmp_path / 'metrics.json'))
+    snapshot = json.loads((tmp_path / 'metrics.json').read_text())
+    assert snapshot['errors'] == {'login': 1}
+    assert snapshot['latency_seconds']['login']['count'] == 2
+
+
+def test_read_while_timed():
+    metrics = Metrics()
+    command = metrics.timed('command', lambda: None)
+    calls = []
+    stopped = threading.Event()
+
+    def read():
+        while not stopped.is_set():
+            calls.append(metrics.calls.get('command', 0))
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for _ in range(20000):
+        command()
+    stopped.set()
+    reader.join()
+    # Every call is counted once, whenever the metrics were read.
+    assert calls == sorted(calls)
+    assert metrics.calls == {'command': 20000}
+    assert metrics.snapshot()['latency_seconds']['command']['count'] == 20000
@@ -0,0 +1,46 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  test_output.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  A pytest for the Output class.
+#
+# =============================================================================
+
+# ------------------------------- Module Imports ------------------------------
+# Third party
+import pytest
+
+# Local application/library specific imports
+from output import Output
+
+
+# ---------------------------- Function Definitions ---------------------------
+def test_plain(capsys):
+    output = Output('plain')
+    output.print('~~ [italic]Welcome[/] ~~', style='bold')
+    output.print('Added', 'CPU', sep=' - ', end='!\n')
+    assert capsys.readouterr().out == '~~ Welcome ~~\nAdded - CPU!\n'
+
+    # Only the tags rich reads are removed, not any bracketed text.
+    output.print('[1] Add [i]CPU[/i]', 'Ryzen [5 600X]', r'\[tag]')
+    assert capsys.readouterr().out == '[1] Add CPU Ryzen [5 600X] [tag]\n'
+
+    # Captured standard output is not a terminal.
+    assert Output().backend == 'plain'
+    with pytest.raises(ValueError):
+        output.use('html')
+
+
+def test_buffered(capsys):
+    output = Output('buffered')
+    output.print('---- Partlist ----')
+    output.print('Added [bold]CPU[/]', style='green')
+    assert capsys.readouterr().out == ''
+
+    output.flush()
+    assert capsys.readouterr().out == '---- Partlist ----\nAdded CPU\n'
@@ -0,0 +1,113 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  test_price_history.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  A pytest for the PriceHistory class.
+#
+# =============================================================================
+
+# ------------------------------- Module Imports ------------------------------
+# Stdlib
+import datetime
+import io
+import os
+
+# Third party
+import pytest
+
+# Local application/library specific imports
+from price_history import CHANGE, GENERATION, PriceHistory
+
+
+# ---------------------------- Function Definitions ---------------------------
+@pytest.fixture()
+def history(tmp_path):
+    return PriceHistory(str(tmp_path / 'prices.bin'))
+
+
+def change_daily(history, days, start=datetime.date(2025, 1, 1)):
+    """Change the price of 'NVIDIA TITAN Xp' every day, by a dollar."""
+    for offset in range(days):
+        day = start + datetime.timedelta(days=offset)
+        history.record('NVIDIA TITAN Xp', 1000 + offset % 30, day.isoformat())
+
+
+def test_range_query(history):
+    change_daily(history, 40)
+    history.record('NVIDIA TITAN Xp', 1029, '2025-02-09')
+    assert history.prices('NVIDIA TITAN Xp', '2025-01-10', '2025-01-12') == [
+        ('2025-01-10', 1009), ('2025-01-11', 1010), ('2025-01-12', 1011)]
+    # The price in effect on the start day is given for the start day.
+    assert history.prices('NVIDIA TITAN Xp', '2025-03-01') == [
+        ('2025-03-01', 1029)]
+    assert history.price_at('NVIDIA TITAN Xp', '2024-12-31') is None
+    assert history.price_at('NVIDIA TITAN Xp', '2025-02-09') == 1029
+    # An unchanged price is not recorded again.
+    history.record('NVIDIA TITAN Xp', 1029, '2025-02-10')
+    assert len(history.prices('NVIDIA TITAN Xp')) == 40
+
+
+def test_save_and_thin(history):
+    change_daily(history, 400)
+    before = history.prices('NVIDIA TITAN Xp', '2026-01-01')
+    assert os.path.getsize(history.filename + '.log') == 400 * CHANGE.size
+
+    history.save('2026-02-04')
+    assert os.path.getsize(history.filename + '.log') == 0
+    reloaded = PriceHistory(history.filename)
+    # The changes since 2025-02-04 are whole; the 34 before are thinned to
+    # the last of each week.
+    assert reloaded.prices('NVIDIA TITAN Xp', '2026-01-01') == before
+    assert len(reloaded.prices('NVIDIA TITAN Xp')) == 366 + 6
+    assert os.path.getsize(history.filename) == GENERATION.size + 8 + 372 * 6
+
+
+def test_export(history):
+    history.record('AMD Ryzen 5', 119.99, '2026-10-18')
+    history.record('AMD Ryzen 5', 109.99, '2026-10-19')
+    outfile = io.StringIO()
+    PriceHistory(history.filename).export(outfile)
+    assert outfile.getvalue().splitlines() == [
+        'AMD Ryzen 5,2026-10-18,119.99', 'AMD Ryzen 5,2026-10-19,109.99']
+
+
+def test_shared_by_processes(history):
+    # Two processes loaded the history before either recorded a price.
+    other = PriceHistory(history.filename)
+    assert history.names == other.names == []
+    history.record('AMD Ryzen 5', 119.99, '2026-10-18')
+    other.record('Intel Core i3', 20.0, '2026-10-18')
+    assert history.price_at('Intel Core i3') == 20.0
+    assert history.price_at('AMD Ryzen 5') == other.price_at(
+        'AMD Ryzen 5') == 119.99
+
+    # A save keeps the changes of every process.
+    other.record('Intel Core i3', 25.0, '2026-10-19')
+    history.save('2026-10-19')
+    history.record('AMD Ryzen 5', 109.99, '2026-10-19')
+    assert [price for _, price in other.prices('Intel Core i3')] == [20, 25]
+    assert PriceHistory(history.filename).price_at('AMD Ryzen 5') == 109.99
+
+
+def test_snapshot_reusing_inode(history):
+    history.record('AMD Ryzen 5', 119.99, '2026-10-18')
+    history.save('2026-10-19')
+    other = PriceHistory(history.filename)
+    assert other.price_at('AMD Ryzen 5') == 119.99
+
+    # The next snapshot ends up with the inode of the one other read.
+    kept = history.filename + '.kept'
+    os.link(history.filename, kept)
+    history.record('AMD Ryzen 5', 109.99, '2026-10-18')
+    history.save('2026-10-19')
+    with open(history.filename, 'rb') as infile:
+        snapshot = infile.read()
+    with open(kept, 'r+b') as outfile:
+        outfile.write(snapshot)
+    os.replace(kept, history.filename)
+    assert other.price_at('AMD Ryzen 5') == 109.99
@@ -0,0 +1,45 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  test_profiler.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  A pytest for the SessionProfiler class.
+#
+# =============================================================================
+
+# ------------------------------- Module Imports ------------------------------
+# Stdlib
+import pstats
+import time
+
+# Local application/library specific imports
+from profiler import SessionProfiler
+
+
+# ---------------------------- Function Definitions ---------------------------
+def busy():
+    end = time.perf_counter() + 0.05
+    while time.perf_counter() < end:
+        pass
+
+
+def idle():
+    pass
+
+
+def test_scoped(tmp_path):
+    profiler = SessionProfiler(interval=0.001)
+    profiled = profiler.scoped(busy)
+    profiled()
+    idle()
+
+    pstats_file, collapsed_file = profiler.write(str(tmp_path / 'profile'))
+    functions = {name for _, _, name in pstats.Stats(pstats_file).stats}
+    assert 'busy' in functions
+    assert 'idle' not in functions
+    lines = open(collapsed_file, encoding='UTF8').read().splitlines()
+    assert any('test_profiler.py:busy ' in line for line in lines)
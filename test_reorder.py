@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  test_reorder.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  A pytest for the IndexedHeap and ReorderQueue classes.
+#
+# =============================================================================
+
+# ------------------------------- Module Imports ------------------------------
+# Stdlib
+import os
+import random
+
+# Local application/library specific imports
+import main
+from reorder import IndexedHeap, ReorderQueue
+from shared_stock import SharedStock
+
+
+# ---------------------------- Function Definitions ---------------------------
+def test_indexed_heap():
+    rng = random.Random(0)
+    priorities = {key: rng.random() for key in range(200)}
+    heap = IndexedHeap(priorities.items())
+    for _ in range(1000):
+        key = rng.randrange(250)
+        if rng.random() < 0.2:
+            heap.remove(key)
+            priorities.pop(key, None)
+        else:
+            priorities[key] = rng.random()
+            heap.set(key, priorities[key])
+        assert heap.smallest(5) == sorted(priorities,
+                                          key=priorities.get)[:5]
+    assert len(heap) == len(priorities)
+
+
+def test_reorder_queue():
+    partlist = main.Partlist.read_from_csv()
+    reorder = ReorderQueue({'Intel Core i9': 10})
+    reorder.track(partlist)
+    alerts = []
+    reorder.add_listener(alerts.append)
+
+    urgencies = [candidate.stock / candidate.threshold
+                 for candidate in reorder.urgent(30)]
+    assert len(urgencies) == len(partlist)
+    assert urgencies == sorted(urgencies)
+    assert ('Intel Core i9', 6, 10) in reorder.urgent(10)
+
+    partlist.adjust_stock('Intel Core i7', -29)
+    assert alerts[-1] == ('Intel Core i7', 5, 5, True)
+    partlist.adjust_stock('Intel Core i7', 1)
+    assert alerts[-1] == ('Intel Core i7', 6, 5, False)
+
+    partlist.pop_part('Intel Core i9')
+    assert 'Intel Core i9' not in [candidate.part_name
+                                   for candidate in reorder.urgent(30)]
+
+
+def test_shared_stock():
+    name = f'test_reorder_{os.getpid()}'
+    partlist = main.Partlist.read_from_csv()
+    partlist.use_stock(SharedStock(name))
+    try:
+        reorder = ReorderQueue({})
+        reorder.track(partlist)
+        alerts = []
+        reorder.add_listener(alerts.append)
+
+        # Another process takes stock; the queue hears of it when used.
+        other = SharedStock(name)
+        other.adjust('Intel Core i7', -29)
+        other.pop('Intel Core i9')
+        other.close()
+        candidates = reorder.urgent(30)
+        assert ('Intel Core i7', 5, 5) in candidates
+        assert 'Intel Core i9' not in [candidate.part_name
+                                       for candidate in candidates]
+        assert alerts == [('Intel Core i7', 5, 5, True)]
+    finally:
+        stock = SharedStock(name)
+        stock.unlink()
+        stock.close()
@@ -0,0 +1,223 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  test_service.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  A pytest for the ShopService class.
+#
+# =============================================================================
+
+# ------------------------------- Module Imports ------------------------------
+# Stdlib
+import os
+
+# Third party
+import pytest
+
+# Local application/library specific imports
+import main
+from aggregates import SalesAggregates
+from forecast import DemandForecast
+from price_history import PriceHistory
+from shared_stock import SharedStock
+from wishlist_store import WishlistStore
+
+
+# ---------------------------- Function Definitions ---------------------------
+@pytest.fixture()
+def service(tmp_path):
+    return main.ShopService(
+        main.Partlist.read_from_csv(),
+        aggregates=SalesAggregates(str(tmp_path / 'aggregates.json')),
+        forecast=DemandForecast(str(tmp_path / 'forecast.bin')),
+        prices=PriceHistory(str(tmp_path / 'prices.bin')),
+        wishlists=WishlistStore(str(tmp_path / 'wishlists.db')))
+
+
+def test_catalog(service):
+    assert len(service.list_parts()) == 24
+    assert service.find_part('AMD Ryzen 5').quantity == 21
+
+    with pytest.raises(LookupError):
+        service.find_part('Toshiba')
+
+    added = service.add_part(main.CPU('AMD Ryzen 5', 119.99, 4, 3.2))
+    assert added.quantity == 22
+
+    with pytest.raises(ValueError):
+        service.add_part(main.CPU('AMD Ryzen 5', 1.0, 4, 3.2))
+
+
+def test_wishlist(service):
+    wishlist = service.open_wishlist('gary')
+    assert service.add_to_wishlist(wishlist, 'AMD Ryzen 5').quantity == 1
+    assert service.add_to_wishlist(wishlist, 'AMD Ryzen 5').quantity == 2
+    assert service.find_part('AMD Ryzen 5').quantity == 19
+
+    with pytest.raises(ValueError):
+        service.add_to_wishlist(wishlist, 'AMD Ryzen 3')
+
+    removed = service.remove_from_wishlist(wishlist, 'AMD Ryzen 5')
+    assert removed.quantity == 2
+    assert service.find_part('AMD Ryzen 5').quantity == 21
+
+    with pytest.raises(LookupError):
+        service.remove_from_wishlist(wishlist, 'AMD Ryzen 5')
+
+    service.add_to_wishlist(wishlist, 'Toshiba P300')
+    service.close_wishlist(wishlist)
+    assert len(wishlist) == 0
+    assert service.find_part('Toshiba P300').quantity == 30
+
+
+def test_resume_wishlist(service, tmp_path):
+    wishlist = service.open_wishlist('gary')
+    service.add_to_wishlist(wishlist, 'AMD Ryzen 5')
+    service.add_to_wishlist(wishlist, 'AMD Ryzen 5')
+    service.add_to_wishlist(wishlist, 'Toshiba P300')
+    assert service.open_wishlist('gary') is wishlist
+    assert service.wishlists.get('gary') == {
+        'AMD Ryzen 5': 2, 'Toshiba P300': 1}
+
+    # The process quits; a new one holds the parts again for gary.
+    resumed = main.ShopService(
+        main.Partlist.read_from_csv(),
+        aggregates=SalesAggregates(str(tmp_path / 'aggregates.json')),
+        forecast=service.forecast, prices=service.prices,
+        wishlists=service.wishlists)
+    wishlist = resumed.open_wishlist('gary')
+    assert wishlist.stock == {'AMD Ryzen 5': 2, 'Toshiba P300': 1}
+    assert resumed.find_part('AMD Ryzen 5').quantity == 19
+
+    resumed.remove_from_wishlist(wishlist, 'Toshiba P300')
+    assert resumed.wishlists.get('gary') == {'AMD Ryzen 5': 2}
+    resumed.close_wishlist(wishlist)
+    assert resumed.wishlists.get('gary') == {}
+    assert len(resumed.open_wishlist('gary')) == 0
+
+
+def test_resume_shared_wishlist(tmp_path):
+    name = f'test_service_{os.getpid()}'
+    services = []
+    for _ in range(2):
+        partlist = main.Partlist.read_from_csv()
+        partlist.use_stock(SharedStock(name))
+        services.append(main.ShopService(
+            partlist,
+            aggregates=SalesAggregates(str(tmp_path / 'aggregates.json')),
+            forecast=DemandForecast(str(tmp_path / 'forecast.bin')),
+            prices=PriceHistory(str(tmp_path / 'prices.bin')),
+            wishlists=WishlistStore(str(tmp_path / 'wishlists.db'))))
+    service, resumed = services
+    try:
+        wishlist = service.open_wishlist('gary')
+        service.add_to_wishlist(wishlist, 'AMD Ryzen 5')
+        service.add_to_wishlist(wishlist, 'AMD Ryzen 5')
+
+        # The holds are in the shared stock already; none is taken again.
+        wishlist = resumed.open_wishlist('gary')
+        assert wishlist.stock == {'AMD Ryzen 5': 2}
+        assert resumed.find_part('AMD Ryzen 5').quantity == 19
+        resumed.close_wishlist(wishlist)
+        assert service.find_part('AMD Ryzen 5').quantity == 21
+    finally:
+        stock = SharedStock(name)
+        stock.unlink()
+        stock.close()
+
+
+def test_update_price(service):
+    assert service.update_price('AMD Ryzen 5', 109.99).part.price == 109.99
+    service.update_price('AMD Ryzen 5', 99.99)
+    assert service.find_part('AMD Ryzen 5').part.price == 99.99
+    # The price it had before is kept, and one change per day.
+    assert [price for _, price in service.prices.prices('AMD Ryzen 5')] == [
+        119.99, 99.99]
+    with pytest.raises(LookupError):
+        service.update_price('Toshiba', 1.0)
+
+    service.add_part(main.CPU('Intel Core i3', 129.0, 4, 3.6))
+    assert service.prices.price_at('Intel Core i3') == 129.0
+
+
+def test_warehouses(tmp_path):
+    directory = str(tmp_path / 'warehouses')
+    main.ShardedPartlist.split(main.Partlist.read_from_csv(),
+                               ['adelaide', 'sydney'], directory)
+    partlist = main.ShardedPartlist.read_shards(directory, workers=2)
+    service = main.ShopService(
+        partlist, aggregates=SalesAggregates(str(tmp_path / 'sales.json')),
+        prices=PriceHistory(str(tmp_path / 'prices.bin')),
+        wishlists=WishlistStore(str(tmp_path / 'wishlists.db')))
+    assert len(service.list_parts()) == 24
+    assert service.find_part('AMD Ryzen 5').quantity == 21
+    assert partlist.stock_by_warehouse('AMD Ryzen 5') == {
+        'adelaide': 11, 'sydney': 10}
+
+    # Stock runs out in the first warehouse, then comes from the second.
+    wishlist = service.open_wishlist('gary')
+    for _ in range(12):
+        service.add_to_wishlist(wishlist, 'AMD Ryzen 5')
+    assert partlist.stock_by_warehouse('AMD Ryzen 5') == {
+        'adelaide': 0, 'sydney': 9}
+    service.close_wishlist(wishlist)
+    assert service.find_part('AMD Ryzen 5').quantity == 21
+
+    service.add_part(main.CPU('Intel Core i3', 129.0, 4, 3.6))
+    service.update_price('AMD Ryzen 5', 109.99)
+    service.save_catalog()
+    partlist = main.ShardedPartlist.read_shards(directory)
+    assert len(partlist.items) == 25
+    assert {shard.get('AMD Ryzen 5').price
+            for shard in partlist.shards.values()} == {109.99}
+
+    # Processes write the same files as a single one.
+    copy = str(tmp_path / 'copy')
+    os.makedirs(copy)
+    partlist.save_to_csv(directory=copy, workers=2)
+    for warehouse in ['adelaide', 'sydney']:
+        with open(f'{directory}/{warehouse}.csv') as saved, \
+                open(f'{copy}/{warehouse}.csv') as copied:
+            assert saved.read() == copied.read()
+
+
+def test_partitions(tmp_path):
+    directory = str(tmp_path / 'partitions')
+    main.PartitionedPartlist.split(main.Partlist.read_from_csv(), directory)
+    partlist = main.PartitionedPartlist(directory)
+    service = main.ShopService(
+        partlist, aggregates=SalesAggregates(str(tmp_path / 'sales.json')),
+        prices=PriceHistory(str(tmp_path / 'prices.bin')),
+        wishlists=WishlistStore(str(tmp_path / 'wishlists.db')))
+    assert partlist.loaded == set()
+
+    # A lookup reads the partition of that part alone.
+    assert service.find_part('AMD Ryzen 5').quantity == 21
+    assert partlist.loaded == {'CPU'}
+    with pytest.raises(LookupError):
+        service.find_part('Toshiba')
+    assert partlist.loaded == {'CPU'}
+    # Setting the stock of a part not read yet reads its partition first.
+    partlist.stock['Toshiba P300'] = 99
+    assert partlist.loaded == {'CPU', 'Storage'}
+    assert service.find_part('Toshiba P300').quantity == 99
+
+    service.add_part(main.Memory('Kingston Fury', 89.0, 16, 3200, 4))
+    service.save_catalog()
+    assert partlist.loaded == {'CPU', 'Memory', 'Storage'}
+
+    partlist = main.PartitionedPartlist(directory)
+    service = main.ShopService(partlist)
+    assert service.find_part('Kingston Fury').quantity == 1
+    assert partlist.loaded == {'Memory'}
+    assert len(service.list_parts()) == 25
+
+    # The stock given to use_stock() is the one followed from then on.
+    stock = {}
+    partlist.use_stock(stock)
+    partlist.stock['AMD Ryzen 5'] = 99
+    assert stock['AMD Ryzen 5'] == partlist.stock['AMD Ryzen 5'] == 99
@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  test_shared_stock.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  A pytest for the SharedStock class.
+#
+# =============================================================================
+
+# ------------------------------- Module Imports ------------------------------
+# Stdlib
+import multiprocessing
+import os
+
+# Third party
+import pytest
+
+# Local application/library specific imports
+import main
+from shared_stock import SharedStock
+
+
+# ---------------------------- Function Definitions ---------------------------
+@pytest.fixture()
+def name():
+    name = f'test_stock_{os.getpid()}'
+    yield name
+    stock = SharedStock(name)
+    stock.unlink()
+    stock.close()
+
+
+def take(name, part_name, times):
+    stock = SharedStock(name)
+    for _ in range(times):
+        stock.adjust(part_name, -1)
+    stock.close()
+
+
+def test_processes_share_stock(name):
+    first = main.Partlist.read_from_csv()
+    first.use_stock(SharedStock(name))
+    second = main.Partlist.read_from_csv()
+    second.stock['AMD Ryzen 5'] = 1000
+    # The stock already shared is kept, not the one of the csv file.
+    second.use_stock(SharedStock(name))
+    assert second.stock['AMD Ryzen 5'] == 21
+
+    first.adjust_stock('AMD Ryzen 5', -1)
+    assert second.stock['AMD Ryzen 5'] == 20
+    with pytest.raises(ValueError):
+        second.adjust_stock('AMD Ryzen 3', -1)
+
+    first.pop_part('AMD Ryzen 5')
+    assert 'AMD Ryzen 5' not in second.stock
+
+    second.stock['Toshiba P300'] = 400
+    processes = [multiprocessing.Process(target=take,
+                                         args=(name, 'Toshiba P300', 100))
+                 for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert first.stock['Toshiba P300'] == 0
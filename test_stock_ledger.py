@@ -0,0 +1,115 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  test_stock_ledger.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  A pytest for the StockLedger class.
+#
+# =============================================================================
+
+# ------------------------------- Module Imports ------------------------------
+# Stdlib
+import os
+
+# Local application/library specific imports
+import main
+from aggregates import SalesAggregates
+from stock_ledger import COUNT, HOLD, RELEASE, RESTOCK, StockLedger
+from wishlist_store import WishlistStore
+
+
+# ---------------------------- Function Definitions ---------------------------
+def test_stock_at(tmp_path):
+    filename = str(tmp_path / 'stock.ledger')
+    ledger = StockLedger(filename, checkpoint_every=10)
+    ledger.record(COUNT, 'Intel Core i9', 6, at=0)
+    for at in range(1, 100):
+        ledger.record(HOLD if at % 3 else RESTOCK, 'Intel Core i9', 1, at)
+    ledger.record(COUNT, 'Toshiba P300', 30, at=100)
+    ledger.close()
+
+    # Reopened, the current stock is the last checkpoint plus a replay.
+    ledger = StockLedger(filename, checkpoint_every=10)
+    assert ledger.stock('Intel Core i9') == 6 - 66 + 33
+    assert ledger.stock_at('Intel Core i9', 0) == 6
+    assert ledger.stock_at('Intel Core i9', 45) == 6 - 30 + 15
+    assert ledger.stock_at('Toshiba P300', 99) is None
+    assert len(ledger.history('Intel Core i9')) == 100
+
+    # Compaction keeps the answers after its horizon.
+    assert ledger.compact(50) == 51
+    assert ledger.stock_at('Intel Core i9', 45) is None
+    assert ledger.stock_at('Intel Core i9', 50) == 6 - 34 + 16
+    assert ledger.stock_at('Intel Core i9', 75) == 6 - 50 + 25
+    ledger.record(RELEASE, 'Intel Core i9', 2, at=101)
+    assert StockLedger(filename).stock('Intel Core i9') == -27 + 2
+
+
+def test_shared_by_processes(tmp_path):
+    filename = str(tmp_path / 'stock.ledger')
+    first = StockLedger(filename, checkpoint_every=4)
+    second = StockLedger(filename, checkpoint_every=4)
+    first.record(COUNT, 'Intel Core i9', 7, at=1)
+    second.record(COUNT, 'Toshiba P300', 30, at=2)
+    for at in range(3, 9):
+        (first if at % 2 else second).record(HOLD, 'Toshiba P300', 1, at)
+    assert first.stock('Intel Core i9') == second.stock('Intel Core i9') == 7
+    assert first.stock('Toshiba P300') == 24
+    # The checkpoints hold the events of both.
+    assert StockLedger(filename).stock_at('Toshiba P300', 6) == 26
+    assert second.stock_at('Intel Core i9', 8) == 7
+
+    assert second.compact(5) == 5
+    first.record(RESTOCK, 'Toshiba P300', 4, at=9)
+    assert second.stock('Toshiba P300') == 28
+    assert first.stock_at('Toshiba P300', 7) == 25
+
+
+def test_service_records(tmp_path):
+    ledger = StockLedger(str(tmp_path / 'stock.ledger'))
+    service = main.ShopService(
+        main.Partlist.read_from_csv(),
+        aggregates=SalesAggregates(str(tmp_path / 'sales.json')),
+        ledger=ledger,
+        wishlists=WishlistStore(str(tmp_path / 'wishlists.db')))
+    assert ledger.stock('AMD Ryzen 5') == 21
+
+    wishlist = service.open_wishlist('gary')
+    service.add_to_wishlist(wishlist, 'AMD Ryzen 5')
+    service.add_to_wishlist(wishlist, 'AMD Ryzen 5')
+    service.remove_from_wishlist(wishlist, 'AMD Ryzen 5')
+    service.add_part(main.CPU('AMD Ryzen 5', 119.99, 4, 3.2))
+    assert [event.kind for event in ledger.history('AMD Ryzen 5')] == [
+        'count', 'hold', 'hold', 'release', 'restock']
+    assert ledger.stock('AMD Ryzen 5') == service.find_part(
+        'AMD Ryzen 5').quantity == 22
+
+
+def test_compaction_reusing_inodes(tmp_path):
+    filename = str(tmp_path / 'stock.ledger')
+    first = StockLedger(filename, checkpoint_every=2)
+    second = StockLedger(filename, checkpoint_every=2)
+    for at in range(1, 6):
+        first.record(RESTOCK, 'Toshiba P300', 1, at)
+    assert second.stock('Toshiba P300') == 5
+
+    # The compacted files end up with the inodes second read from.
+    kept = {}
+    for suffix in ('', '.checkpoints'):
+        kept[suffix] = filename + suffix + '.kept'
+        os.link(filename + suffix, kept[suffix])
+    assert first.compact(3) == 3
+    for suffix, path in kept.items():
+        with open(filename + suffix, 'rb') as infile:
+            data = infile.read()
+        with open(path, 'r+b') as outfile:
+            outfile.write(data)
+            outfile.truncate()
+        os.replace(path, filename + suffix)
+    first.record(RESTOCK, 'Toshiba P300', 1, at=6)
+    assert second.stock('Toshiba P300') == 6
+    assert second.stock_at('Toshiba P300', 4) == 4
@@ -0,0 +1,108 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  test_throttle.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  A pytest for the LoginThrottle class.
+#
+# =============================================================================
+
+# ------------------------------- Module Imports ------------------------------
+# Third party
+import pytest
+
+# Local application/library specific imports
+from authenticator import Authenticator, encrypt_password
+from exceptions import InvalidPassword, TooManyAttempts
+from throttle import LoginThrottle
+
+
+# ---------------------------- Function Definitions ---------------------------
+class Clock:
+    """A clock moved by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lockout_doubles():
+    clock = Clock()
+    throttle = LoginThrottle(user_limit=3, window=60, lockout=10,
+                             clock=clock)
+    for _ in range(3):
+        throttle.check('gary')
+        throttle.failure('gary')
+    with pytest.raises(TooManyAttempts) as error:
+        throttle.check('gary')
+    assert error.value.retry_after == 10
+
+    clock.now = 10
+    for _ in range(3):
+        throttle.check('gary')
+        throttle.failure('gary')
+    with pytest.raises(TooManyAttempts) as error:
+        throttle.check('gary')
+    assert error.value.retry_after == 20
+
+    # A login forgets the username, but not the source.
+    throttle.success('gary')
+    throttle.check('gary')
+
+
+def test_bounded_and_expired():
+    clock = Clock()
+    throttle = LoginThrottle(window=60, max_keys=100, clock=clock)
+    for number in range(1000):
+        throttle.failure(f'user{number}', '10.0.0.1')
+    assert len(throttle) == 100
+    with pytest.raises(TooManyAttempts):
+        throttle.check('someone', '10.0.0.1')
+
+    clock.now = 10000
+    for _ in range(100):
+        throttle.check('anyone')
+    assert len(throttle) == 0
+
+
+def test_lockout_never_evicted():
+    clock = Clock()
+    throttle = LoginThrottle(user_limit=1, window=60, lockout=10,
+                             max_keys=3, clock=clock)
+    for number in range(3):
+        throttle.failure(f'user{number}')
+    # Every counter is locked out: a new key is not counted.
+    for number in range(3, 100):
+        throttle.failure(f'user{number}')
+        throttle.check(f'user{number}')
+    assert len(throttle) == 3
+    for number in range(3):
+        with pytest.raises(TooManyAttempts):
+            throttle.check(f'user{number}')
+
+    # Once a lockout ends, its counter makes room.
+    clock.now = 10
+    throttle.failure('gary')
+    with pytest.raises(TooManyAttempts):
+        throttle.check('gary')
+    assert len(throttle) == 3
+
+
+def test_no_hashing_when_locked(tmp_path):
+    users_file = tmp_path / 'users.csv'
+    users_file.write_text('Username,Email,Password (encoded)\n'
+                          'gary,gary@gmail.com,'
+                          f'{encrypt_password("gary", "garypassword")}\n')
+    auth = Authenticator(str(users_file), LoginThrottle(user_limit=2))
+    for _ in range(2):
+        with pytest.raises(InvalidPassword):
+            auth.login('gary', 'wrong password')
+    # Even the right password is refused until the lockout ends.
+    with pytest.raises(TooManyAttempts):
+        auth.login('gary', 'garypassword')
@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  test_user_store.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  A pytest for the SQLite user store.
+#
+# =============================================================================
+
+# ------------------------------- Module Imports ------------------------------
+# Stdlib
+import shutil
+
+# Third party
+import pytest
+
+# Local application/library specific imports
+from authenticator import Authenticator
+from exceptions import (EmailAlreadyExists, InvalidPassword,
+                        UsernameAlreadyExists)
+from user_store import SQLiteUserStore, migrate
+
+
+# ---------------------------- Function Definitions ---------------------------
+def test_migrate_and_login(tmp_path):
+    shutil.copy('database/users.csv', tmp_path / 'users.csv')
+    csv_users = Authenticator(str(tmp_path / 'users.csv')).users
+    database = str(tmp_path / 'users.db')
+
+    read, count = migrate(str(tmp_path / 'users.csv'), database)
+    # The header line is not a user.
+    assert read == count == len(csv_users) - 1
+
+    authenticator = Authenticator(database)
+    assert authenticator.user_email['henry'] == csv_users['henry'].email
+    authenticator.add_user('newcomer', 'newcomer@gmail.com', 'password')
+    authenticator.save_user('newcomer')
+    with pytest.raises(UsernameAlreadyExists):
+        authenticator.add_user('newcomer', 'other@gmail.com', 'password')
+    with pytest.raises(EmailAlreadyExists):
+        authenticator.add_user('other', 'newcomer@gmail.com', 'password')
+
+    # Another store, e.g. of another process, took the username first.
+    other = Authenticator(database)
+    authenticator.add_user('late', 'late@gmail.com', 'password')
+    authenticator.save_user('late')
+    with pytest.raises(UsernameAlreadyExists):
+        other.store.add(authenticator.users['late'])
+
+    # A new store reads the committed row back.
+    authenticator = Authenticator(database)
+    with pytest.raises(InvalidPassword):
+        authenticator.login('newcomer', 'wrong password')
+    authenticator.login('newcomer', 'password')
+    assert authenticator.is_logged_in('newcomer')
+    assert len(authenticator.users) == count + 2
+
+
+def test_bounded_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr('user_store.CACHE_SIZE', 2)
+    store = SQLiteUserStore(str(tmp_path / 'users.db'))
+    store.add_many([(f'user{number}', f'user{number}@gmail.com', 'digest')
+                    for number in range(4)])
+    store.get('user0').is_logged_in = True
+    first = store.get('user1')
+    store.get('user2')
+    store.get('user3')
+    # user1 was dropped and is read again; user0 stays logged in.
+    assert store.get('user1') is not first
+    assert store.get('user0').is_logged_in
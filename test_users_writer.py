@@ -0,0 +1,46 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  test_users_writer.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  A pytest for the group commit appender and the compaction
+#               of users.csv.
+#
+# =============================================================================
+
+# ------------------------------- Module Imports ------------------------------
+# Local application/library specific imports
+from users_writer import GroupCommitAppender, compact
+
+
+# ---------------------------- Function Definitions ---------------------------
+def test_group_commit(tmp_path):
+    users_file = tmp_path / 'users.csv'
+    users_file.write_text('Username,Email,Password (encoded)\n')
+    appender = GroupCommitAppender(str(users_file), max_rows=3,
+                                   max_delay=60)
+    for number in range(7):
+        appender.append([f'user{number}', f'user{number}@gmail.com', 'x'])
+    assert appender.groups == 2 and appender.pending == 1
+    appender.close()
+    assert appender.groups == 3 and appender.pending == 0
+    assert len(users_file.read_text().splitlines()) == 8
+
+
+def test_compact(tmp_path):
+    users_file = tmp_path / 'users.csv'
+    users_file.write_text('Username,Email,Password (encoded)\n'
+                          'john,john@gmail.com,old\n'
+                          'gary,gary@gmail.com,x\n'
+                          'malformed line\n'
+                          'john,john@gmail.com,new\n')
+    assert compact(str(users_file)) == (4, 2)
+    assert users_file.read_text().splitlines() == [
+        'Username,Email,Password (encoded)',
+        'gary,gary@gmail.com,x',
+        'john,john@gmail.com,new',
+    ]
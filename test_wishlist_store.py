@@ -0,0 +1,40 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  test_wishlist_store.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  A pytest for the WishlistStore class.
+#
+# =============================================================================
+
+# ------------------------------- Module Imports ------------------------------
+# Local application/library specific imports
+from wishlist_store import WishlistStore
+
+
+# ---------------------------- Function Definitions ---------------------------
+def test_put_and_get(tmp_path):
+    filename = str(tmp_path / 'wishlists.db')
+    store = WishlistStore(filename)
+    assert store.get('gary') == {}
+    store.put('gary', {'AMD Ryzen 5': 2})
+    store.put('susan', {'Toshiba P300': 1})
+    store.put('gary', {'AMD Ryzen 5': 2, 'NVIDIA TITAN Xp': 1},
+              {'AMD Ryzen 5': 3})
+    store.close()
+
+    # Every write is committed as it is made.
+    store = WishlistStore(filename)
+    assert store.get('gary') == {'AMD Ryzen 5': 2, 'NVIDIA TITAN Xp': 1}
+    assert sorted(store.usernames()) == ['gary', 'susan']
+    # No more units are held than are in the wishlist.
+    assert store.held('gary') == {'AMD Ryzen 5': 2, 'NVIDIA TITAN Xp': 0}
+    assert store.held('susan') == {'Toshiba P300': 0}
+    store.put('susan', {})
+    store.delete('gary')
+    assert store.usernames() == []
+    store.close()
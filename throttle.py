@@ -0,0 +1,177 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  throttle.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Throttles failed logins per username and per source with
+#               sliding window counters and an exponential lockout.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import collections
+import threading
+import time
+
+# Third party
+import icontract
+from exceptions import TooManyAttempts
+
+
+# ------------------------------- Named Constant ------------------------------
+# Failed logins allowed per window, for one username and for one source.
+USER_LIMIT = 5
+SOURCE_LIMIT = 20
+
+# Seconds of the sliding window.
+WINDOW = 60.0
+
+# Seconds of the first lockout; each further lockout doubles it.
+LOCKOUT = 30.0
+MAX_LOCKOUT = 3600.0
+
+# Counters kept at most; the least recently failed are dropped first, but
+# never one that is locked out.
+MAX_KEYS = 100000
+
+# Counters looked at to find one to drop for a new key.
+EVICT_BUDGET = 8
+
+# Indices of the fields of a counter.
+START, PREVIOUS, CURRENT, LEVEL, LOCKED_UNTIL = range(5)
+
+
+# ------------------------------ Class Definition -----------------------------
+class LoginThrottle:
+    """Counts the failed logins of each username and each source.
+
+    A counter is five numbers: the start of its current window, the
+    failures of the previous and of the current window, its lockout level
+    and the end of its lockout. The failures of the last window are
+    estimated by weighting the previous window by how much of it is still
+    inside the last WINDOW seconds. Reaching the limit locks the key out
+    for LOCKOUT * 2 ** level seconds.
+
+    Counters are ordered by their last failure. Each check drops a few
+    counters that have expired and at most max_keys are kept, so memory
+    stays bounded however many usernames and sources are tried. A new key
+    takes the place of the least recently failed counter that is not
+    locked out; if there is none among the first few, the key is not
+    counted, so that flooding new keys cannot lift a lockout.
+    """
+
+    @icontract.require(lambda user_limit, source_limit:
+                       (user_limit >= 1) & (source_limit >= 1))
+    @icontract.require(lambda window: window > 0)
+    @icontract.require(lambda max_keys: max_keys >= 1)
+    def __init__(self, user_limit=USER_LIMIT, source_limit=SOURCE_LIMIT,
+                 window=WINDOW, lockout=LOCKOUT, max_lockout=MAX_LOCKOUT,
+                 max_keys=MAX_KEYS, clock=time.monotonic):
+        """Initialise LoginThrottle object."""
+        self.__limits = {'user': user_limit, 'source': source_limit}
+        self.__window = window
+        self.__lockout = lockout
+        self.__max_lockout = max_lockout
+        self.__max_keys = max_keys
+        self.__clock = clock
+        self.__counters = collections.OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__counters)
+
+    @staticmethod
+    def keys(username, source=None):
+        """Return the counter keys of a login attempt."""
+        if source is None:
+            return (('user', username),)
+        return (('user', username), ('source', source))
+
+    def check(self, username, source=None):
+        """Raise TooManyAttempts if username or source is locked out."""
+        with self.__lock:
+            now = self.__clock()
+            self.__expire(now)
+            for key in self.keys(username, source):
+                counter = self.__counters.get(key)
+                if counter is not None and now < counter[LOCKED_UNTIL]:
+                    raise TooManyAttempts(key[1],
+                                          counter[LOCKED_UNTIL] - now)
+
+    def failure(self, username, source=None):
+        """Count a failed login of username from source."""
+        with self.__lock:
+            now = self.__clock()
+            self.__expire(now)
+            for key in self.keys(username, source):
+                counter = self.__counters.pop(key, None)
+                if counter is None:
+                    if (len(self.__counters) >= self.__max_keys
+                            and not self.__evict(now)):
+                        continue
+                    counter = [now, 0, 0, 0, 0.0]
+                self.__slide(counter, now)
+                counter[CURRENT] += 1
+                if self.__estimate(counter, now) >= self.__limits[key[0]]:
+                    duration = min(self.__lockout * 2 ** counter[LEVEL],
+                                   self.__max_lockout)
+                    counter[LOCKED_UNTIL] = now + duration
+                    counter[LEVEL] += 1
+                    counter[PREVIOUS] = counter[CURRENT] = 0
+                self.__counters[key] = counter
+
+    def success(self, username, source=None):
+        """Forget the failed logins of username after a login."""
+        with self.__lock:
+            self.__counters.pop(('user', username), None)
+
+    def __slide(self, counter, now):
+        """Move the window of counter forward to now."""
+        elapsed = now - counter[START]
+        if elapsed >= 2 * self.__window:
+            counter[PREVIOUS] = counter[CURRENT] = 0
+            counter[START] = now
+        elif elapsed >= self.__window:
+            counter[PREVIOUS] = counter[CURRENT]
+            counter[CURRENT] = 0
+            counter[START] += self.__window
+
+    def __estimate(self, counter, now):
+        """Return the estimated failures of the last window."""
+        weight = 1 - (now - counter[START]) / self.__window
+        return counter[PREVIOUS] * weight + counter[CURRENT]
+
+    def __expire(self, now, budget=2):
+        """Drop up to budget of the oldest counters that have expired.
+
+        A counter expires once it holds no failure of the last window and
+        its lockout ended a window ago; its lockout level goes with it.
+        """
+        for _ in range(budget):
+            if not self.__counters:
+                return
+            key, counter = next(iter(self.__counters.items()))
+            if (now - counter[START] < 2 * self.__window
+                    or now < counter[LOCKED_UNTIL] + self.__window):
+                return
+            del self.__counters[key]
+
+    def __evict(self, now, budget=EVICT_BUDGET):
+        """Drop the least recently failed counter that is not locked out,
+        looking at up to budget of them, and return True; return False if
+        none was dropped. The locked out counters looked at go last.
+        """
+        for _ in range(min(budget, len(self.__counters))):
+            key, counter = next(iter(self.__counters.items()))
+            if now < counter[LOCKED_UNTIL]:
+                self.__counters.move_to_end(key)
+            else:
+                del self.__counters[key]
+                return True
+        return False
@@ -0,0 +1,295 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  user_store.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Stores the users in an SQLite database indexed on username
+#               and email, and migrates users.csv into it.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import argparse
+import collections
+import collections.abc
+import csv
+import sqlite3
+import threading
+
+# Third party
+import icontract
+
+# Local application/library specific imports
+from authenticator import User
+from exceptions import EmailAlreadyExists, UsernameAlreadyExists
+
+
+# ------------------------------- Named Constant ------------------------------
+USERS_DB = 'database/users.db'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    email TEXT NOT NULL,
+    password TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS users_email ON users (email);
+'''
+
+# User objects kept after they were read, besides the logged in ones.
+CACHE_SIZE = 1024
+
+# Users inserted per transaction by migrate().
+BATCH_SIZE = 10000
+
+
+# ------------------------------ Class Definitions ----------------------------
+class UserMapping(collections.abc.Mapping):
+    """A read-only dictionary view of the users of an SQLiteUserStore.
+
+    Every lookup reads one row; nothing is loaded in advance. With
+    attribute (e.g. 'email'), values are that attribute of the User.
+    """
+
+    def __init__(self, store, attribute=None):
+        """Initialise UserMapping object."""
+        self.__store = store
+        self.__attribute = attribute
+
+    def __getitem__(self, username):
+        user = self.__store.get(username)
+        if user is None:
+            raise KeyError(username)
+        if self.__attribute is None:
+            return user
+        return getattr(user, self.__attribute)
+
+    def __contains__(self, username):
+        return self.__store.get(username) is not None
+
+    def __iter__(self):
+        return iter(self.__store.usernames())
+
+    def __len__(self):
+        return self.__store.count()
+
+
+class SQLiteUserStore:
+    """The users of an SQLite database; a login reads only its own row.
+
+    The last CACHE_SIZE User objects that were read are kept, and the
+    logged in ones as long as the store, so that their logged in state
+    lasts.
+    """
+
+    @icontract.require(
+        lambda filename: isinstance(filename, str) & (filename != ''))
+    def __init__(self, filename=USERS_DB):
+        """Initialise SQLiteUserStore object, creating the table if the
+        database is new.
+        """
+        # A login or sign up started with login_async() or add_user_async()
+        # ends in the thread that hashed the password, so the connection
+        # and the User objects are only used while holding the lock.
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(filename,
+                                            check_same_thread=False)
+        self.__connection.executescript(SCHEMA)
+        # The User objects read last, least recently used first.
+        self.__loaded = collections.OrderedDict()
+        # Logged in User objects that no longer fit in __loaded.
+        self.__logged_in = {}
+
+    @property
+    def users(self):
+        """Return a UserMapping of User objects, by username."""
+        return UserMapping(self)
+
+    @property
+    def user_email(self):
+        """Return a UserMapping of emails, by username."""
+        return UserMapping(self, 'email')
+
+    @icontract.require(lambda username: isinstance(username, str))
+    def get(self, username):
+        """Return the User object of username, or None."""
+        with self.__lock:
+            return self.__get(username)
+
+    def __get(self, username):
+        """Return the User object of username, or None; the caller holds
+        the lock.
+        """
+        user = self.__loaded.get(username)
+        if user is not None:
+            self.__loaded.move_to_end(username)
+            return user
+        user = self.__logged_in.pop(username, None)
+        if user is None:
+            row = self.__connection.execute(
+                'SELECT email, password FROM users WHERE username = ?',
+                (username,)).fetchone()
+            if row is None:
+                return None
+            user = User(username, row[0], row[1], encrypted=True)
+        self.__keep(user)
+        return user
+
+    def __keep(self, user):
+        """Keep user as the most recently used User object; the caller
+        holds the lock.
+        """
+        self.__loaded[user.username] = user
+        self.__loaded.move_to_end(user.username)
+        while len(self.__loaded) > CACHE_SIZE:
+            _, oldest = self.__loaded.popitem(last=False)
+            if oldest.is_logged_in:
+                self.__logged_in[oldest.username] = oldest
+
+    @icontract.require(lambda email: isinstance(email, str))
+    def get_by_email(self, email):
+        """Return the User object whose email is email, or None."""
+        with self.__lock:
+            return self.__get_by_email(email)
+
+    def __get_by_email(self, email):
+        """Return the User object whose email is email, or None; the caller
+        holds the lock.
+        """
+        row = self.__connection.execute(
+            'SELECT username FROM users WHERE email = ?', (email,)).fetchone()
+        return None if row is None else self.__get(row[0])
+
+    @icontract.ensure(lambda result: isinstance(result, list))
+    def usernames(self):
+        """Return a list of every username."""
+        with self.__lock:
+            return [row[0] for row in
+                    self.__connection.execute('SELECT username FROM users')]
+
+    @icontract.ensure(lambda result: result >= 0)
+    def count(self):
+        """Return the number of users."""
+        with self.__lock:
+            return self.__connection.execute(
+                'SELECT COUNT(*) FROM users').fetchone()[0]
+
+    @icontract.require(lambda user: isinstance(user, User))
+    @icontract.ensure(lambda result: result is None)
+    def add(self, user):
+        """Insert a new user; save() commits it.
+
+        Raise UsernameAlreadyExists or EmailAlreadyExists if another store
+        (e.g. of another process) took the username or the email first.
+        """
+        with self.__lock:
+            try:
+                self.__connection.execute(
+                    'INSERT INTO users VALUES (?, ?, ?)',
+                    (user.username, user.email, user.password.password))
+            except sqlite3.IntegrityError:
+                existing = self.__get(user.username)
+                if existing is not None:
+                    raise UsernameAlreadyExists(
+                        user.username, {user.username: existing}) from None
+                owner = self.__get_by_email(user.email)
+                if owner is not None:
+                    raise EmailAlreadyExists(
+                        user.email, {owner.username: owner}) from None
+                raise
+            self.__keep(user)
+
+    @icontract.require(lambda username: isinstance(username, str))
+    @icontract.ensure(lambda result: result is None)
+    def save(self, username):
+        """Commit every user added so far."""
+        with self.__lock:
+            self.__connection.commit()
+
+    @icontract.require(lambda username: isinstance(username, str))
+    @icontract.ensure(lambda result: result is None)
+    def update_password(self, username):
+        """Write the new password record of a user."""
+        with self.__lock, self.__connection:
+            self.__connection.execute(
+                'UPDATE users SET password = ? WHERE username = ?',
+                (self.__get(username).password.password, username))
+
+    @icontract.ensure(lambda result: result >= 0)
+    def add_many(self, records):
+        """Insert (username, email, password digest) records in a single
+        transaction and return how many rows were written.
+
+        A record replaces any user with the same username or email, as a
+        later line of users.csv does.
+        """
+        with self.__lock:
+            before = self.__connection.total_changes
+            with self.__connection:
+                self.__connection.executemany(
+                    'INSERT OR REPLACE INTO users VALUES (?, ?, ?)', records)
+            self.__loaded.clear()
+            self.__logged_in.clear()
+            return self.__connection.total_changes - before
+
+    def close(self):
+        """Commit and close the database."""
+        with self.__lock:
+            self.__connection.commit()
+            self.__connection.close()
+
+
+# ---------------------------- Function Definitions ---------------------------
+def iter_csv_users(filename):
+    """Yield the (username, email, password digest) records of a users.csv
+    file, skipping its header and malformed lines.
+    """
+    with open(filename, encoding='UTF8', newline='') as infile:
+        for csv_list in csv.reader(infile):
+            if len(csv_list) == 3 and csv_list[0] != 'Username':
+                yield tuple(csv_list)
+
+
+@icontract.ensure(lambda result: result[0] >= 0)
+def migrate(csv_filename, db_filename=USERS_DB, batch_size=BATCH_SIZE):
+    """Copy every user of a users.csv file into an SQLite database.
+
+    Return (lines read, users in the database).
+    """
+    store = SQLiteUserStore(db_filename)
+    read = 0
+    batch = []
+    for record in iter_csv_users(csv_filename):
+        read += 1
+        batch.append(record)
+        if len(batch) == batch_size:
+            store.add_many(batch)
+            batch = []
+    store.add_many(batch)
+    count = store.count()
+    store.close()
+    return read, count
+
+
+# ---------------------------------- Program ----------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Migrate users.csv into an SQLite user store.')
+    parser.add_argument('--from', dest='csv_file',
+                        default='database/users.csv',
+                        help='users.csv file to read')
+    parser.add_argument('--to', dest='db_file', default=USERS_DB,
+                        help='SQLite database to write (created if missing)')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                        help='users inserted per transaction')
+    args = parser.parse_args()
+
+    read, count = migrate(args.csv_file, args.db_file, args.batch_size)
+    print(f'Read {read} users from {args.csv_file}; '
+          f'{args.db_file} now holds {count}.')
@@ -0,0 +1,152 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  users_writer.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Appends the signups to users.csv in groups, and compacts
+#               users.csv by dropping duplicate and malformed lines.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import argparse
+import atexit
+import csv
+import os
+import threading
+
+# Third party
+import icontract
+
+
+# ------------------------------- Named Constant ------------------------------
+USERS_HEADER = ['Username', 'Email', 'Password (encoded)']
+
+
+# ------------------------------ Class Definition -----------------------------
+class GroupCommitAppender:
+    """Append csv rows to a file in groups.
+
+    Rows are held until max_rows are waiting or the oldest has waited
+    max_delay seconds; the whole group then costs one open, one write and
+    one fsync. Waiting rows are also written when the program exits.
+    """
+
+    @icontract.require(lambda max_rows: max_rows >= 1)
+    @icontract.require(lambda max_delay: max_delay > 0)
+    def __init__(self, filename, max_rows=64, max_delay=0.5):
+        """Initialise GroupCommitAppender object."""
+        self.__filename = filename
+        self.__max_rows = max_rows
+        self.__max_delay = max_delay
+        self.__rows = []
+        self.__groups = 0
+        self.__timer = None
+        self.__lock = threading.Lock()
+        # Registered with atexit by the first append().
+        self.__registered = False
+
+    @property
+    def pending(self):
+        """Return the number of rows not written yet."""
+        return len(self.__rows)
+
+    @property
+    def groups(self):
+        """Return the number of groups written so far."""
+        return self.__groups
+
+    @icontract.require(lambda row: isinstance(row, (list, tuple)))
+    def append(self, row):
+        """Add a row to the next group."""
+        self.extend([row])
+
+    def extend(self, rows):
+        """Add rows to the next group, in order."""
+        with self.__lock:
+            if not self.__registered:
+                atexit.register(self.close)
+                self.__registered = True
+            self.__rows.extend(rows)
+            if len(self.__rows) >= self.__max_rows:
+                self.__write()
+            elif self.__timer is None:
+                self.__timer = threading.Timer(self.__max_delay, self.flush)
+                self.__timer.daemon = True
+                self.__timer.start()
+
+    def flush(self):
+        """Write the waiting rows now."""
+        with self.__lock:
+            self.__write()
+
+    def __write(self):
+        """Write and fsync the waiting rows; the lock must be held."""
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+        if not self.__rows:
+            return
+        with open(file=self.__filename, mode='a',
+                  encoding='UTF8', newline='') as outfile:
+            csv.writer(outfile).writerows(self.__rows)
+            outfile.flush()
+            os.fsync(outfile.fileno())
+        self.__rows = []
+        self.__groups += 1
+
+    def close(self):
+        """Write the waiting rows; nothing is held after this."""
+        self.flush()
+        if self.__registered:
+            atexit.unregister(self.close)
+            self.__registered = False
+
+
+# ---------------------------- Function Definitions ---------------------------
+@icontract.ensure(lambda result: result[0] >= result[1])
+def compact(filename):
+    """Rewrite a users.csv file with one line per username.
+
+    The last line of a username wins, as it does when the file is loaded;
+    malformed lines are dropped. Return (lines before, lines after), the
+    header excluded. Run it while no shop is signing users up.
+    """
+    users = {}
+    lines = 0
+    with open(filename, encoding='UTF8', newline='') as infile:
+        for csv_list in csv.reader(infile):
+            if csv_list == USERS_HEADER:
+                continue
+            lines += 1
+            if len(csv_list) == 3:
+                # Move the username to the end, like its latest line.
+                users.pop(csv_list[0], None)
+                users[csv_list[0]] = csv_list
+    temporary = filename + '.tmp'
+    with open(temporary, mode='w', encoding='UTF8', newline='') as outfile:
+        writer = csv.writer(outfile)
+        writer.writerow(USERS_HEADER)
+        writer.writerows(users.values())
+        outfile.flush()
+        os.fsync(outfile.fileno())
+    os.replace(temporary, filename)
+    return lines, len(users)
+
+
+# ---------------------------------- Program ----------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compact users.csv (stop the shop first).')
+    parser.add_argument('--file', default='database/users.csv',
+                        help='users.csv file to compact')
+    args = parser.parse_args()
+
+    before, after = compact(args.file)
+    print(f'{args.file}: {before} lines -> {after} users')
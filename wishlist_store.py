@@ -0,0 +1,155 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+#
+#        FILE:  wishlist_store.py
+#      AUTHOR:  Tan Duc Mai
+#       EMAIL:  henryfromvietnam@gmail.com
+#     CREATED:  2026-10-19
+# DESCRIPTION:  Keeps the wishlist of every customer in an SQLite database,
+#               one record per username, so that it can be resumed.
+#
+# =============================================================================
+
+
+# ------------------------------- Module Import -------------------------------
+# Stdlib
+import argparse
+import json
+import sqlite3
+
+# Third party
+import icontract
+
+
+# ------------------------------- Named Constant ------------------------------
+WISHLISTS_DB = 'database/wishlists.db'
+
+SCHEMA = '''
+PRAGMA journal_mode = WAL;
+CREATE TABLE IF NOT EXISTS wishlists (
+    username TEXT PRIMARY KEY,
+    parts TEXT NOT NULL
+) WITHOUT ROWID;
+'''
+
+
+# ------------------------------ Class Definition -----------------------------
+class WishlistStore:
+    """The part counts of the wishlist of each customer.
+
+    A record is the username and a JSON object of the count of each part
+    name, and of how many of those units are held: already taken out of a
+    stock that outlives the process (a saved catalog or a SharedStock).
+    A record is read or written by its primary key alone. Each write is
+    its own transaction. The database is in WAL mode without a sync per
+    commit, so a write costs no disk flush and several shop processes can
+    share it. Nothing is opened until the store is first used.
+    """
+
+    @icontract.require(
+        lambda filename: isinstance(filename, str) & (filename != ''))
+    def __init__(self, filename=WISHLISTS_DB):
+        """Initialise WishlistStore object. Nothing is opened yet."""
+        self.__filename = filename
+        self.__connection = None
+
+    @property
+    def filename(self):
+        """Return the filename attribute."""
+        return self.__filename
+
+    @property
+    def connection(self):
+        """Return the database connection, opened on first access."""
+        if self.__connection is None:
+            self.__connection = sqlite3.connect(self.__filename)
+            self.__connection.executescript(SCHEMA)
+            self.__connection.execute('PRAGMA synchronous = NORMAL')
+        return self.__connection
+
+    def __parts(self, username):
+        """Return the [count, held] of each part of username."""
+        row = self.connection.execute(
+            'SELECT parts FROM wishlists WHERE username = ?',
+            (username,)).fetchone()
+        return {} if row is None else json.loads(row[0])
+
+    @icontract.require(lambda username: isinstance(username, str))
+    @icontract.ensure(lambda result: isinstance(result, dict))
+    def get(self, username):
+        """Return the dictionary of part counts of username, empty if it
+        has no wishlist.
+        """
+        return {part_name: count for part_name, (count, _)
+                in self.__parts(username).items()}
+
+    @icontract.require(lambda username: isinstance(username, str))
+    @icontract.ensure(lambda result: isinstance(result, dict))
+    def held(self, username):
+        """Return the dictionary of the held units of each part of the
+        wishlist of username.
+        """
+        return {part_name: held for part_name, (_, held)
+                in self.__parts(username).items()}
+
+    @icontract.require(lambda username: isinstance(username, str))
+    @icontract.ensure(lambda result: result is None)
+    def put(self, username, counts, held=None):
+        """Write the part counts of username, a dictionary, and how many
+        of them are held (default: none); empty counts delete its record.
+        """
+        held = held or {}
+        with self.connection:
+            if counts:
+                parts = {part_name: [count, min(held.get(part_name, 0), count)]
+                         for part_name, count in counts.items()}
+                self.connection.execute(
+                    'INSERT OR REPLACE INTO wishlists VALUES (?, ?)',
+                    (username, json.dumps(parts, separators=(',', ':'))))
+            else:
+                self.connection.execute(
+                    'DELETE FROM wishlists WHERE username = ?', (username,))
+
+    @icontract.require(lambda username: isinstance(username, str))
+    @icontract.ensure(lambda result: result is None)
+    def delete(self, username):
+        """Delete the record of username, if it has one."""
+        self.put(username, {})
+
+    @icontract.ensure(lambda result: isinstance(result, list))
+    def usernames(self):
+        """Return a list of every username with a wishlist."""
+        return [row[0] for row in
+                self.connection.execute('SELECT username FROM wishlists')]
+
+    def close(self):
+        """Close the database, if it was opened."""
+        if self.__connection is not None:
+            self.__connection.close()
+            self.__connection = None
+
+
+# ---------------------------------- Program ----------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Show or delete the saved wishlists.')
+    parser.add_argument('--file', default=WISHLISTS_DB,
+                        help=f'wishlists database (default {WISHLISTS_DB})')
+    parser.add_argument('--delete', metavar='USERNAME',
+                        help='delete the wishlist of USERNAME; its parts '
+                             'stay in the store')
+    args = parser.parse_args()
+
+    store = WishlistStore(args.file)
+    if args.delete:
+        store.delete(args.delete)
+        print(f'Deleted the wishlist of {args.delete}.')
+    else:
+        for username in store.usernames():
+            counts = store.get(username)
+            print(f'{username}: ' + ', '.join(
+                f'{part_name} (x{count})'
+                for part_name, count in counts.items()))
+    store.close()